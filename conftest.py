@@ -1,5 +1,7 @@
 import random
 
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
 from django.utils.timezone import now
 
 import pytest
@@ -58,3 +60,16 @@ def django_app_form(db, django_app):
         return form.submit()
 
     return get_and_post
+
+
+@pytest.fixture
+def keep_db_connection():
+    """
+    Stop requests handled outside the test client, by the tasks which warm the
+    page cache, closing the connection the test's transaction is using.
+    """
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    yield
+    request_started.connect(close_old_connections)
+    request_finished.connect(close_old_connections)
@@ -1,18 +1,86 @@
 import accessibleAutocomplete from 'accessible-autocomplete';
 
+const getMatches = (url, query) => (
+    fetch(`${url}?${new URLSearchParams({q: query})}`, {credentials: "same-origin"})
+        .then(response => response.json())
+        .then(data => data.results)
+);
+
+const escapeHtml = (text) => {
+    const element = document.createElement("span");
+    element.textContent = text;
+    return element.innerHTML;
+};
+
+export const initAutocompleteSelects = (root) => {
+    // Replace the selects rendered by AutocompleteSelect, which only contain the
+    // selected option, with an autocomplete fed by the endpoint. The formset
+    // templates are skipped, the copies are set up as they are added.
+    const selects = root.querySelectorAll("select[data-autocomplete-url]");
+
+    for(const select of selects) {
+        if (select.closest("[data-nsc-formset-template]")) {
+            continue;
+        }
+
+        const url = select.attributes["data-autocomplete-url"].value;
+        const selected = select.options[select.selectedIndex];
+
+        const element = document.createElement("div");
+        select.parentNode.insertBefore(element, select);
+        select.style.display = "none";
+
+        // The suggestions are the results, not their names, as names are not
+        // unique so the id of the chosen result can't be found from its name.
+        accessibleAutocomplete({
+            element,
+            id: `${select.id}_autocomplete`,
+            defaultValue: selected && selected.value ? selected.text : "",
+            source: (query, populateResults) => {
+                getMatches(url, query).then(populateResults);
+            },
+            templates: {
+                inputValue: result => result ? result.name : "",
+                suggestion: result => result ? escapeHtml(result.name) : "",
+            },
+            onConfirm: (result) => {
+                if (result === undefined) {
+                    return;
+                }
+                select.innerHTML = "";
+                select.add(new Option(result.name, result.id, true, true));
+            },
+        });
+
+        // Editing the name clears the selection until a suggestion is chosen,
+        // so a cleared input, or a name with no match, does not keep the
+        // previously selected option.
+        element.addEventListener("input", () => {
+            select.innerHTML = "";
+        });
+    }
+}
+
 export const initAutocomplete = (document) => {
     const containers = document.getElementsByClassName("autocomplete-container");
 
     for(const element of containers) {
+        const sourceUrl = element.attributes["data-source-url"];
         element.innerHTML = "";
         accessibleAutocomplete({
             element,
             id: element.attributes["data-field-id"].value,
             name: element.attributes["data-field-name"].value,
             defaultValue: element.attributes["data-default-value"].value,
-            source: JSON.parse(
+            source: sourceUrl ? (query, populateResults) => {
+                getMatches(sourceUrl.value, query).then(results => {
+                    populateResults(results.map(result => result.name));
+                });
+            } : JSON.parse(
                 document.getElementById(element.attributes["data-source-id"].value).text
             ),
         })
     }
+
+    initAutocompleteSelects(document);
 }
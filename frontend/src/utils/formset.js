@@ -2,6 +2,8 @@
  * Formset management
  */
 
+import { initAutocompleteSelects } from '../autocomplete';
+
 const defaultDataFormset = 'nsc-formset';
 const defaultDataForm = 'nsc-formset-form';
 const defaultDataTemplate = 'nsc-formset-template';
@@ -207,6 +209,7 @@ export class Formset {
       lastForm = this.forms[this.forms.length - 1].rootEl;
     }
     lastForm.parentNode.insertBefore(formRoot, lastForm.nextSibling);
+    initAutocompleteSelects(formRoot);
 
     // Register form
     let newPrefix = this.templatePrefix.replace('__prefix__', id)
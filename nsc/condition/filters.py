@@ -21,13 +21,16 @@ class SearchFilter(FilterSet):
 
     name = CharFilter(field_name="name", method="search_name")
     comments = CharFilter(method="in_consultation")
-    affects = CharFilter(field_name="ages", lookup_expr="icontains")
+    affects = CharFilter(method="search_affects")
     screen = YesNoFilter(field_name="recommendation")
     archived = BooleanFilter(method="include_archived", widget=forms.CheckboxInput)
 
     def search_name(self, queryset, name, value):
         return queryset.search(value)
 
+    def search_affects(self, queryset, name, value):
+        return queryset.affects(value)
+
     def in_consultation(self, queryset, name, value):
         if value == SearchForm.CONSULTATION.open:
             return queryset.open_for_comments()
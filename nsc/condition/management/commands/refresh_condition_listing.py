@@ -0,0 +1,8 @@
+from django.core.management import BaseCommand
+
+from ...tasks import refresh_condition_listing
+
+
+class Command(BaseCommand):
+    def handle(self, *args, **options):
+        refresh_condition_listing()
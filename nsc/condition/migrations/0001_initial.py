@@ -0,0 +1,100 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:35
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+
+def populate_listing(apps, schema_editor):
+    ConditionListing = apps.get_model("condition", "ConditionListing")
+    Policy = apps.get_model("policy", "Policy")
+    Review = apps.get_model("review", "Review")
+
+    # see ReviewQuerySet.open_for_comments and closed_for_comments
+    today = timezone.localdate()
+    in_progress = Review.objects.exclude(published=True).filter(policies=OuterRef("pk"))
+    is_open = Q(consultation_start__lte=today) & Q(consultation_end__gte=today)
+
+    ConditionListing.objects.bulk_create(
+        ConditionListing(
+            policy=policy,
+            name=policy.name,
+            slug=policy.slug,
+            keywords=policy.keywords,
+            ages=policy.ages,
+            recommendation=policy.recommendation,
+            archived=policy.archived,
+            open_for_comments=policy.has_open_review,
+            closed_for_comments=policy.has_closed_review,
+        )
+        for policy in Policy.objects.filter(is_active=True).annotate(
+            has_open_review=Exists(in_progress.filter(is_open)),
+            has_closed_review=Exists(in_progress.filter(~is_open)),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("policy", "0006_auto_20210218_1210"),
+        ("review", "0023_review_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConditionListing",
+            fields=[
+                (
+                    "policy",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="listing",
+                        serialize=False,
+                        to="policy.policy",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("slug", models.SlugField(max_length=100)),
+                ("keywords", models.TextField(blank=True, default="")),
+                (
+                    "ages",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(
+                            choices=[
+                                ("antenatal", "Antenatal"),
+                                ("newborn", "Newborn"),
+                                ("child", "Child"),
+                                ("adult", "Adult"),
+                                ("all", "All ages"),
+                            ],
+                            max_length=50,
+                        ),
+                        size=None,
+                    ),
+                ),
+                ("recommendation", models.BooleanField(null=True)),
+                ("archived", models.BooleanField(default=False)),
+                ("open_for_comments", models.BooleanField(default=False)),
+                ("closed_for_comments", models.BooleanField(default=False)),
+            ],
+            options={
+                "ordering": ("name", "pk"),
+                "indexes": [
+                    models.Index(
+                        fields=["name", "policy"], name="condition_c_name_c34c98_idx"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["ages"], name="condition_c_ages_e02aee_gin"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_listing, reverse_code=migrations.RunPython.noop),
+    ]
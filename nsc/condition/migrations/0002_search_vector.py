@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def populate_search_vector(apps, schema_editor):
+    ConditionListing = apps.get_model("condition", "ConditionListing")
+    Policy = apps.get_model("policy", "Policy")
+    ConditionListing.objects.update(
+        search_vector=Subquery(
+            Policy.objects.filter(pk=OuterRef("policy_id")).values("search_vector")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condition", "0001_initial"),
+        ("policy", "0007_search_vector"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="conditionlisting",
+            name="keywords",
+        ),
+        migrations.AddField(
+            model_name="conditionlisting",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name="conditionlisting",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="condition_c_search__074365_gin"
+            ),
+        ),
+        migrations.RunPython(
+            populate_search_vector, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,135 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef
+from django.dispatch import receiver
+
+from ..policy.models import Policy
+from ..review.models import Review
+from ..utils.search import search
+
+
+class ConditionListingQuerySet(models.QuerySet):
+    def search(self, keywords):
+        return search(self, keywords)
+
+    def affects(self, age):
+        return self.filter(ages__contains=[age])
+
+    def open_for_comments(self):
+        return self.filter(open_for_comments=True)
+
+    def closed_for_comments(self):
+        return self.filter(closed_for_comments=True)
+
+    def exclude_archived(self):
+        return self.filter(archived=False)
+
+    def refresh(self, policy_pks=None):
+        """
+        Build the listing again from the active policies, pass ``policy_pks`` to
+        only rebuild the rows for those policies.
+        """
+        policies = Policy.objects.active().annotate(
+            has_open_review=Exists(
+                Review.objects.open_for_comments().filter(policies=OuterRef("pk"))
+            ),
+            has_closed_review=Exists(
+                Review.objects.closed_for_comments().filter(policies=OuterRef("pk"))
+            ),
+        )
+        listings = self.model.objects.all()
+        if policy_pks is not None:
+            policies = policies.filter(pk__in=policy_pks)
+            listings = listings.filter(policy_id__in=policy_pks)
+
+        with transaction.atomic():
+            listings.delete()
+            self.model.objects.bulk_create(
+                self.model.from_policy(policy) for policy in policies
+            )
+
+
+class ConditionListing(models.Model):
+    """
+    The fields shown, and filtered on, in the public condition list for each
+    active policy, kept in one table so the list is a single query. The rows are
+    rebuilt when a policy or one of its reviews changes, and daily as the
+    consultation dates pass.
+    """
+
+    policy = models.OneToOneField(
+        Policy, on_delete=models.CASCADE, primary_key=True, related_name="listing"
+    )
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100)
+    ages = ArrayField(models.CharField(choices=Policy.AGE_GROUPS, max_length=50))
+    recommendation = models.BooleanField(null=True)
+    archived = models.BooleanField(default=False)
+    open_for_comments = models.BooleanField(default=False)
+    closed_for_comments = models.BooleanField(default=False)
+    search_vector = SearchVectorField(null=True)
+
+    objects = ConditionListingQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("name", "pk")
+        indexes = [
+            models.Index(fields=["name", "policy"]),
+            GinIndex(fields=["ages"]),
+            GinIndex(fields=["search_vector"]),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    # the listing is displayed in the same way as the policy
+    get_public_url = Policy.get_public_url
+    ages_display = Policy.ages_display
+    recommendation_display = Policy.recommendation_display
+
+    @classmethod
+    def from_policy(cls, policy):
+        """
+        Create the listing for a policy annotated by ``ConditionListing.refresh``.
+        """
+        return cls(
+            policy=policy,
+            name=policy.name,
+            slug=policy.slug,
+            ages=policy.ages,
+            recommendation=policy.recommendation,
+            archived=policy.archived,
+            open_for_comments=policy.has_open_review,
+            closed_for_comments=policy.has_closed_review,
+            search_vector=policy.search_vector,
+        )
+
+
+@receiver(models.signals.post_save, sender=Policy)
+def refresh_policy_listing(sender, instance, **kwargs):
+    ConditionListing.objects.refresh([instance.pk])
+
+
+@receiver(models.signals.post_save, sender=Review)
+def refresh_review_listings(sender, instance, **kwargs):
+    ConditionListing.objects.refresh(instance.policies.values_list("pk", flat=True))
+
+
+@receiver(models.signals.pre_delete, sender=Review)
+def refresh_deleted_review_listings(sender, instance, **kwargs):
+    # the policies are only known before the review is deleted, or cleared
+    policy_pks = list(instance.policies.values_list("pk", flat=True))
+    transaction.on_commit(lambda: ConditionListing.objects.refresh(policy_pks))
+
+
+@receiver(models.signals.m2m_changed, sender=Policy.reviews.through)
+def refresh_reviews_changed_listings(sender, instance, action, pk_set, **kwargs):
+    if isinstance(instance, Policy):
+        if action.startswith("post_"):
+            ConditionListing.objects.refresh([instance.pk])
+    elif action == "pre_clear":
+        refresh_deleted_review_listings(sender, instance)
+    elif action in ("post_add", "post_remove"):
+        ConditionListing.objects.refresh(pk_set)
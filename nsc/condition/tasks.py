@@ -0,0 +1,90 @@
+import io
+import logging
+import sys
+from urllib.parse import unquote_to_bytes, urlparse
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import reverse
+
+from nsc.policy.models import Policy
+
+from ..celery import app
+from ..utils.cache import get_cache_tag, invalidate_cache_tags
+from .models import ConditionListing
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_list_urls():
+    url = reverse("condition:list")
+    return [url] + [
+        f"{url}?page={page}" for page in range(2, settings.CACHE_WARM_LIST_PAGES + 1)
+    ]
+
+
+def get_environ(url, root):
+    """
+    Get the WSGI environ for a visitor's GET request for the url on the public
+    domain, ``root`` is the parsed EMAIL_ROOT_DOMAIN.
+    """
+    path, _, query = url.partition("?")
+    secure = root.scheme == "https"
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": unquote_to_bytes(path).decode("iso-8859-1"),
+        "QUERY_STRING": query,
+        "SERVER_NAME": root.hostname,
+        "SERVER_PORT": str(root.port or (443 if secure else 80)),
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": root.netloc,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "https" if secure else "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    # visitors' requests reach django through the load balancer
+    if secure and settings.SECURE_PROXY_SSL_HEADER:
+        header, value = settings.SECURE_PROXY_SSL_HEADER
+        environ[header] = value
+    return environ
+
+
+@app.task
+def warm_condition_pages(policy_pks):
+    """
+    Render the public page for each condition and the first pages of the
+    condition list so they are in the cache before visitors arrive.
+
+    The requests are handled as the server handles them, through the full
+    middleware stack with the public domain as the host, so the pages are
+    stored under the same keys as the requests from visitors.
+    """
+    root = urlparse(settings.EMAIL_ROOT_DOMAIN)
+    handler = WSGIHandler()
+
+    urls = get_list_urls() + [
+        policy.get_public_url() for policy in Policy.objects.filter(pk__in=policy_pks)
+    ]
+    for url in urls:
+        try:
+            response = handler(get_environ(url, root), lambda *args: None)
+            response.close()
+            if response.status_code != 200:
+                logger.warning(f"Failed to warm {url}, status {response.status_code}")
+        except Exception as e:
+            logger.exception(e)
+
+
+@app.task
+def refresh_condition_listing():
+    """
+    Rebuild the public condition list as the consultation dates pass.
+    """
+    ConditionListing.objects.refresh()
+    invalidate_cache_tags(get_cache_tag(Policy))
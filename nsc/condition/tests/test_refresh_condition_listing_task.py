@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from django.utils.timezone import now
+
+import pytest
+from dateutil.relativedelta import relativedelta
+from freezegun import freeze_time
+from model_bakery import baker
+
+from nsc.policy.models import Policy
+from nsc.review.models import Review
+from nsc.utils.cache import get_cache_tag
+from nsc.utils.datetime import from_today
+
+from ..models import ConditionListing
+from ..tasks import refresh_condition_listing
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def policy():
+    policy = baker.make(Policy)
+    review = baker.make(
+        Review, consultation_start=from_today(1), consultation_end=from_today(30)
+    )
+    policy.reviews.add(review)
+    return policy
+
+
+def test_consultation_opens__listing_is_open(policy):
+    """
+    Test the listing is open for comments once the consultation has started.
+    """
+    assert not ConditionListing.objects.open_for_comments().exists()
+
+    with freeze_time(now() + relativedelta(days=1)), patch(
+        "nsc.condition.tasks.invalidate_cache_tags"
+    ) as invalidate_cache_tags:
+        refresh_condition_listing()
+
+    assert list(ConditionListing.objects.open_for_comments()) == [policy.listing]
+    invalidate_cache_tags.assert_called_once_with(get_cache_tag(Policy))
+
+
+def test_consultation_closes__listing_is_closed(policy):
+    """
+    Test the listing is closed for comments once the consultation has ended.
+    """
+    with freeze_time(now() + relativedelta(days=31)):
+        refresh_condition_listing()
+
+    assert not ConditionListing.objects.open_for_comments().exists()
+    assert list(ConditionListing.objects.closed_for_comments()) == [policy.listing]
+
+
+def test_review_is_removed__listing_is_refreshed(
+    policy, django_capture_on_commit_callbacks
+):
+    """
+    Test the listing is refreshed when a policy's review is deleted.
+    """
+    with django_capture_on_commit_callbacks(execute=True):
+        policy.reviews.get().delete()
+
+    assert not ConditionListing.objects.closed_for_comments().exists()
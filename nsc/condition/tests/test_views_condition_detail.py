@@ -1,11 +1,16 @@
 from datetime import date
 
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 import pytest
 from model_bakery import baker
 
+from nsc.document.models import Document
 from nsc.policy.models import Policy
 from nsc.utils.datetime import get_date_display
 
@@ -161,3 +166,110 @@ def test_previous_documents__not_in_consultation(
     page = django_app.get(instance.get_public_url())
     assert str("Supporting documents from the 2019 review") in page
     assert str("Supporting documents from the 2018 review") in page
+
+
+@pytest.fixture
+def fragment_cache():
+    # cache the fragments but not the whole page
+    with override_settings(
+        CACHES={
+            **settings.CACHES,
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        },
+        MIDDLEWARE=[
+            m for m in settings.MIDDLEWARE if not m.startswith("nsc.utils.cache")
+        ],
+    ):
+        yield
+
+
+@pytest.fixture
+def review_document(make_review, make_document):
+    policy = baker.make(Policy)
+    review = make_review(review_end=date(2019, 2, 1), published=True, policies=[policy])
+    return make_document(
+        review=review, name="Old name", document_type=Document.TYPE.evidence_review
+    )
+
+
+def test_review_documents_are_cached(fragment_cache, review_document, django_app):
+    url = review_document.review.policies.get().get_public_url()
+    django_app.get(url)
+
+    Document.objects.filter(pk=review_document.pk).update(name="New name")
+
+    assert "Old name" in django_app.get(url)
+
+
+def test_review_document_is_saved___review_documents_are_rendered_again(
+    fragment_cache, review_document, django_app, django_capture_on_commit_callbacks
+):
+    url = review_document.review.policies.get().get_public_url()
+    django_app.get(url)
+
+    review_document.name = "New name"
+    with django_capture_on_commit_callbacks(execute=True):
+        review_document.save()
+
+    assert "New name" in django_app.get(url)
+
+
+def test_review_documents_not_scanned___documents_are_not_listed(
+    make_review, make_document, model_pdf, django_app
+):
+    """
+    Test the documents which haven't passed the virus scan aren't listed as they
+    can't be downloaded.
+    """
+    policy = baker.make(Policy)
+    review = make_review(review_end=date(2019, 2, 1), published=True, policies=[policy])
+    make_document(review=review, name="Clean", document_type=Document.TYPE.other)
+    baker.make(
+        Document,
+        review=review,
+        name="Pending",
+        upload=model_pdf,
+        document_type=Document.TYPE.evidence_review,
+    )
+    baker.make(
+        Document,
+        review=review,
+        name="Infected",
+        upload=model_pdf,
+        document_type=Document.TYPE.cover_sheet,
+    ).mark_infected()
+
+    page = django_app.get(policy.get_public_url()).text
+
+    assert "Clean" in page
+    assert "Pending" not in page
+    assert "Infected" not in page
+
+
+def test_archive_documents_not_scanned___documents_are_not_listed(
+    make_document, model_pdf, django_app
+):
+    policy = baker.make(Policy, archived=True)
+    make_document(name="Clean", document_type=Document.TYPE.archive).policies.add(
+        policy
+    )
+    baker.make(
+        Document, name="Pending", upload=model_pdf, document_type=Document.TYPE.archive
+    ).policies.add(policy)
+
+    page = django_app.get(policy.get_public_url()).text
+
+    assert "Clean" in page
+    assert "Pending" not in page
+
+
+def test_review_documents_are_cached___documents_are_not_queried(
+    fragment_cache, review_document, django_app
+):
+    url = review_document.review.policies.get().get_public_url()
+    django_app.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        django_app.get(url)
+
+    assert not [q for q in queries if "document_document" in q["sql"]]
@@ -21,15 +21,14 @@ def test_list_view(django_app):
     """
     instance = baker.make(Policy)
     response = django_app.get(condition_list_url)
-    assert instance in response.context["object_list"]
+    assert instance.listing in response.context["object_list"]
     assert not response.context["is_paginated"]
     assert response.context["paginator"].num_pages == 1
 
 
 def test_policy_is_open(django_app):
     """
-    Test a policy is annotated with the current review when it is open
-    for public comment
+    Test a policy is shown as open when a review is open for public comment
     """
     today = get_today()
     later = get_today() + relativedelta(months=+3)
@@ -40,15 +39,14 @@ def test_policy_is_open(django_app):
     response = django_app.get(condition_list_url)
     policies = response.context["object_list"]
 
-    assert policy in policies
-    assert policies.first().reviews_in_consultation[0].pk == review.pk
+    assert policy.listing in policies
+    assert policies.first().open_for_comments
     assert "OPEN" in response.content.decode()
 
 
 def test_policy_is_closed(django_app):
     """
-    Test a policy is not annotated with the current review outside of the
-    public consultation period
+    Test a policy is not shown as open outside of the public consultation period
     """
     tomorrow = get_today() + relativedelta(days=+1)
     later = get_today() + relativedelta(months=+1)
@@ -59,7 +57,7 @@ def test_policy_is_closed(django_app):
     response = django_app.get(condition_list_url)
     policies = response.context["object_list"]
 
-    assert not policies.first().reviews_in_consultation
+    assert not policies.first().open_for_comments
     assert "OPEN" not in response.content.decode()
 
 
@@ -69,7 +67,7 @@ def test_list_view_query_count(num_policies, django_app, django_assert_num_queri
     Test that fetching the list takes a fixed number of queries.
     """
     baker.make(Policy, _quantity=num_policies)
-    with django_assert_num_queries(3):
+    with django_assert_num_queries(2):
         django_app.get(condition_list_url)
 
 
@@ -105,6 +103,16 @@ def test_search_on_condition_name(django_app):
     assert not response.context["object_list"]
 
 
+def test_search_on_partial_condition_name(django_app):
+    """
+    Test the list of policies can be filtered by the start of a word in the name.
+    """
+    policy = baker.make(Policy, name="Cystic fibrosis")
+    baker.make(Policy, name="other")
+    response = django_app.get(condition_list_url, {"name": "cyst"})
+    assert list(response.context["object_list"]) == [policy.listing]
+
+
 def test_search_on_open_for_comment(django_app):
     """
     Test the list of policies can be filtered by whether the policy is
@@ -119,12 +127,51 @@ def test_search_on_open_for_comment(django_app):
     assert not response.context["object_list"]
 
 
+def test_search_on_closed_for_comment(django_app):
+    """
+    Test the list of policies can be filtered by whether the policy is under
+    review and not open for the public to comment.
+    """
+    tomorrow = get_today() + relativedelta(days=+1)
+    later = get_today() + relativedelta(months=+3)
+    policy = baker.make(Policy, name="name")
+    review = baker.make(Review, consultation_start=tomorrow, consultation_end=later)
+    policy.reviews.add(review)
+    baker.make(Policy, name="other")
+    response = django_app.get(condition_list_url, {"comments": "closed"})
+    assert list(response.context["object_list"]) == [policy.listing]
+
+
 def test_search_on_age_affected(django_app):
     """
     Test the list of policies can be filtered by the age of those affected.
     """
     baker.make(Policy, ages="{adult}")
+    policy = baker.make(Policy, ages="{antenatal,child}")
     response = django_app.get(condition_list_url, {"affects": "child"})
+    assert list(response.context["object_list"]) == [policy.listing]
+
+
+def test_policy_is_updated__list_is_updated(django_app):
+    """
+    Test the list shows the policy as it was last saved.
+    """
+    policy = baker.make(Policy, name="old name")
+    policy.name = "new name"
+    policy.save()
+    response = django_app.get(condition_list_url)
+    assert "new name" in response.content.decode()
+    assert "old name" not in response.content.decode()
+
+
+def test_policy_is_inactive__policy_is_not_listed(django_app):
+    """
+    Test inactive policies are removed from the list.
+    """
+    policy = baker.make(Policy)
+    policy.is_active = False
+    policy.save()
+    response = django_app.get(condition_list_url)
     assert not response.context["object_list"]
 
 
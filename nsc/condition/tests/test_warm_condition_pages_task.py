@@ -0,0 +1,61 @@
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.test import override_settings
+from django.urls import reverse
+
+import pytest
+
+from nsc.policy.models import Policy
+
+from ..tasks import get_environ, warm_condition_pages
+
+
+# All tests require the database, the pages are requested through the handler
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("keep_db_connection")]
+
+
+@pytest.fixture(autouse=True)
+def page_cache():
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    ):
+        yield
+
+
+@pytest.fixture
+def public_client(client):
+    client.defaults["HTTP_HOST"] = urlparse(settings.EMAIL_ROOT_DOMAIN).netloc
+    return client
+
+
+def test_condition_pages_are_cached(public_client, make_policy):
+    policy, other = make_policy(name="Old name"), make_policy(name="Other")
+
+    warm_condition_pages([policy.pk])
+    Policy.objects.update(name="New name")
+
+    response = public_client.get(policy.get_public_url())
+    assert not response.templates
+    assert "Old name" in response.content.decode()
+    assert public_client.get(other.get_public_url()).templates
+
+
+@override_settings(CACHE_WARM_LIST_PAGES=2)
+def test_first_pages_of_the_condition_list_are_cached(public_client, make_policy):
+    make_policy(_quantity=45)
+
+    warm_condition_pages([])
+
+    assert not public_client.get(reverse("condition:list")).templates
+    assert not public_client.get(reverse("condition:list") + "?page=2").templates
+    assert public_client.get(reverse("condition:list") + "?page=3").templates
+
+
+def test_pages_are_requested_as_a_visitor_on_the_public_domain():
+    root = urlparse("https://www.example.com")
+
+    request = WSGIRequest(get_environ(reverse("condition:list") + "?page=2", root))
+
+    assert request.build_absolute_uri() == "https://www.example.com/?page=2"
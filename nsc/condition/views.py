@@ -9,20 +9,22 @@ from nsc.policy.models import Policy
 from nsc.review.models import Review
 from nsc.subscription.models import Subscription
 
+from ..utils.cache import add_cache_tags, get_cache_tag
 from ..utils.urls import clean_url
 from .filters import SearchFilter
 from .forms import PublicCommentForm, SearchForm, StakeholderCommentForm
+from .models import ConditionListing
 
 
 class ConditionList(ListView):
     template_name = "policy/public/policy_list.html"
-    model = Policy
+    model = ConditionListing
     paginate_by = 20
 
     def get_queryset(self):
+        add_cache_tags(self.request, get_cache_tag(Policy))
         return SearchFilter(
-            self.request.GET,
-            queryset=Policy.objects.active().prefetch_reviews_in_consultation(),
+            self.request.GET, queryset=ConditionListing.objects.all()
         ).qs
 
     def get_context_data(self, **kwargs):
@@ -37,9 +39,11 @@ class ConditionDetail(DetailView):
     context_object_name = "policy"
 
     def get_object(self, queryset=None):
-        return super().get_object(
+        policy = super().get_object(
             queryset=self.get_queryset().prefetch_related("reviews")
         )
+        add_cache_tags(self.request, get_cache_tag(policy))
+        return policy
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data()
@@ -62,11 +66,12 @@ class ConditionDetail(DetailView):
 
 
 class ConsultationMixin:
-    @staticmethod
-    def get_condition(slug):
-        return get_object_or_404(
+    def get_condition(self, slug):
+        condition = get_object_or_404(
             Policy.objects.prefetch_related("reviews").open_for_comments(), slug=slug
         )
+        add_cache_tags(self.request, get_cache_tag(condition))
+        return condition
 
 
 class ConsultationView(ConsultationMixin, TemplateView):
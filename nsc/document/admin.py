@@ -6,5 +6,6 @@ from .models import Document
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
 
-    list_display = ("name", "review")
+    list_display = ("name", "review", "scan_status")
+    list_filter = ("scan_status",)
     search_fields = ("name", "review__name")
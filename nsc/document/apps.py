@@ -1,8 +1,13 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from nsc.signals import clear_cache
+from nsc.signals import (
+    invalidate_cache,
+    invalidate_deleted_cache,
+    schedule_document_bundle,
+    schedule_virus_scan,
+)
 
 
 class DocumentConfig(AppConfig):
@@ -11,5 +16,9 @@ class DocumentConfig(AppConfig):
     def ready(self):
         from nsc.document.models import Document
 
-        receiver(post_save, sender=Document)(clear_cache)
-        receiver(post_delete, sender=Document)(clear_cache)
+        receiver(post_save, sender=Document)(invalidate_cache)
+        receiver(pre_delete, sender=Document)(invalidate_deleted_cache)
+        receiver(m2m_changed, sender=Document.policies.through)(invalidate_cache)
+        receiver(post_save, sender=Document)(schedule_document_bundle)
+        receiver(post_save, sender=Document)(schedule_virus_scan)
+        receiver(post_delete, sender=Document)(schedule_document_bundle)
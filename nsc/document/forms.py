@@ -6,8 +6,6 @@ from django.forms import HiddenInput, modelformset_factory
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
-from nsc.document.mixins import FileVirusScanMixin
-
 from ..review.models import Review
 from .models import Document, DocumentPolicy
 
@@ -20,8 +18,7 @@ def document_formset_form_factory(
     policy=None,
     source=None,
 ):
-    class DocumentFormsetForm(FileVirusScanMixin, forms.ModelForm):
-        virus_scan_fields = ("upload",)
+    class DocumentFormsetForm(forms.ModelForm):
         document_type = _document_type
         upload = forms.FileField(
             label=_("Upload a file"),
@@ -134,8 +131,7 @@ class ExternalReviewForm(ReviewDocumentForm):
     required_error_message = _("Select the external review for upload")
 
 
-class SubmissionForm(FileVirusScanMixin, forms.ModelForm):
-    virus_scan_fields = ("upload",)
+class SubmissionForm(forms.ModelForm):
     upload = forms.FileField(
         label=_("Upload a file"),
         error_messages={"required": _("Select the response form for upload")},
@@ -160,14 +156,7 @@ class SubmissionForm(FileVirusScanMixin, forms.ModelForm):
         self.fields["review"].widget = HiddenInput()
 
 
-class ReviewDocumentsForm(FileVirusScanMixin, forms.ModelForm):
-    virus_scan_fields = (
-        "cover_sheet",
-        "evidence_review",
-        "evidence_map",
-        "cost_effective_model",
-        "systematic_review",
-    )
+class ReviewDocumentsForm(forms.ModelForm):
     cover_sheet = forms.FileField(
         label=_("Cover sheet"),
         required=False,
@@ -0,0 +1,10 @@
+from django.core.management import BaseCommand
+
+from ...models import Document
+from ...tasks import scan_document
+
+
+class Command(BaseCommand):
+    def handle(self, *args, **options):
+        for pk in Document.objects.pending_scan().values_list("pk", flat=True):
+            scan_document(pk)
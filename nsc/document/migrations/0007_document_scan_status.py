@@ -0,0 +1,68 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:58
+
+import django.core.validators
+from django.db import migrations, models
+
+import nsc.document.models
+
+
+SCAN_STATUS_CHOICES = [
+    ("pending_scan", "Pending virus scan"),
+    ("clean", "Clean"),
+    ("infected", "Infected"),
+]
+
+
+def scan_status_field(default):
+    return models.CharField(
+        choices=SCAN_STATUS_CHOICES,
+        default=default,
+        editable=False,
+        max_length=12,
+        verbose_name="virus scan status",
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("document", "0006_alter_document_uuid_alter_historicaldocument_uuid"),
+    ]
+
+    # existing documents were scanned when they were uploaded, new uploads are
+    # pending until they have been scanned
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="scan_status",
+            field=scan_status_field("clean"),
+        ),
+        migrations.AddField(
+            model_name="historicaldocument",
+            name="scan_status",
+            field=scan_status_field("clean"),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="scan_status",
+            field=scan_status_field("pending_scan"),
+        ),
+        migrations.AlterField(
+            model_name="historicaldocument",
+            name="scan_status",
+            field=scan_status_field("pending_scan"),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="upload",
+            field=models.FileField(
+                max_length=256,
+                upload_to=nsc.document.models.upload_path,
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["pdf", "odt"]
+                    )
+                ],
+                verbose_name="upload",
+            ),
+        ),
+    ]
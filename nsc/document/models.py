@@ -1,10 +1,12 @@
+import hashlib
 import os
 import uuid
 
 from django.core.validators import FileExtensionValidator
-from django.db import models
+from django.db import models, transaction
 from django.dispatch import receiver
 from django.urls import reverse
+from django.utils.http import quote_etag
 from django.utils.translation import gettext_lazy as _
 
 from django_extensions.db.models import TimeStampedModel
@@ -48,6 +50,12 @@ class DocumentQuerySet(models.QuerySet):
     def archive(self):
         return self.filter(document_type=Document.TYPE.archive)
 
+    def downloadable(self):
+        return self.filter(scan_status=Document.SCAN_STATUS.clean)
+
+    def pending_scan(self):
+        return self.filter(scan_status=Document.SCAN_STATUS.pending_scan)
+
 
 def document_path(instance, filename=None):
     from nsc.review.models import Review
@@ -71,6 +79,17 @@ def document_path(instance, filename=None):
         return path
 
 
+# Uploads are stored under this directory until they have been scanned for viruses
+QUARANTINE_DIR = "quarantine"
+
+
+def upload_path(instance, filename):
+    path = document_path(instance, filename)
+    if instance.scan_status == Document.SCAN_STATUS.pending_scan:
+        return os.path.join(QUARANTINE_DIR, path)
+    return path
+
+
 class DocumentPolicy(TimeStampedModel):
     SOURCE = Choices(
         ("review", _("Review")),
@@ -100,6 +119,11 @@ class Document(TimeStampedModel):
         ("archive", _("Archive")),
         ("other", _("Other")),
     )
+    SCAN_STATUS = Choices(
+        ("pending_scan", _("Pending virus scan")),
+        ("clean", _("Clean")),
+        ("infected", _("Infected")),
+    )
 
     name = models.CharField(verbose_name=_("name"), max_length=256)
     document_type = models.CharField(
@@ -107,10 +131,17 @@ class Document(TimeStampedModel):
     )
     upload = models.FileField(
         verbose_name=_("upload"),
-        upload_to=document_path,
+        upload_to=upload_path,
         max_length=256,
         validators=[FileExtensionValidator(allowed_extensions=["pdf", "odt"])],
     )
+    scan_status = models.CharField(
+        verbose_name=_("virus scan status"),
+        choices=SCAN_STATUS,
+        max_length=12,
+        default=SCAN_STATUS.pending_scan,
+        editable=False,
+    )
     review = models.ForeignKey(
         "review.Review",
         on_delete=models.SET_NULL,
@@ -135,9 +166,37 @@ class Document(TimeStampedModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # a new file is quarantined until it has been scanned, see scan_document
+        if self.upload and not self.upload._committed:
+            self.scan_status = self.SCAN_STATUS.pending_scan
+        super().save(*args, **kwargs)
+
+    @property
+    def is_downloadable(self):
+        return self.scan_status == self.SCAN_STATUS.clean
+
     def get_download_url(self):
         return reverse("document:download", kwargs={"uuid": str(self.uuid)})
 
+    @property
+    def etag(self):
+        """
+        The ETag for downloading the file, it changes when the file is replaced.
+        """
+        version = f"{self.uuid}:{self.upload.name}:{self.modified.isoformat()}"
+        return quote_etag(hashlib.md5(version.encode()).hexdigest())
+
+    @property
+    def last_modified(self):
+        return int(self.modified.timestamp())
+
+    def get_cache_tags(self):
+        return [
+            *(self.review.get_cache_tags() if self.review else []),
+            *(tag for policy in self.policies.all() for tag in policy.get_cache_tags()),
+        ]
+
     def exists(self):
         return Document.objects.filter(uuid=self.uuid).exists() if self.uuid else False
 
@@ -148,6 +207,64 @@ class Document(TimeStampedModel):
         if self.upload.name:
             self.upload.storage.delete(self.upload.name)
 
+    def mark_clean(self):
+        """
+        Move the file out of quarantine so it can be downloaded. The file is
+        copied before the document is locked so the lock is only held while the
+        document is updated.
+        """
+        storage = self.upload.storage
+        quarantined = self.upload.name
+
+        with storage.open(quarantined, "rb") as file:
+            released = storage.save(
+                document_path(self, os.path.basename(quarantined)), file
+            )
+
+        try:
+            updated = self.set_scan_status(
+                self.SCAN_STATUS.clean, quarantined, released
+            )
+        except Exception:
+            storage.delete(released)
+            raise
+        if not updated:
+            storage.delete(released)
+
+    def mark_infected(self):
+        self.set_scan_status(self.SCAN_STATUS.infected, self.upload.name)
+
+    def set_scan_status(self, status, quarantined, name=None):
+        """
+        Record the result of scanning the ``quarantined`` file, a clean file has
+        been copied to ``name``. The quarantined file is only deleted once the
+        change is committed so the document never points to a deleted file.
+
+        Returns False, and changes nothing, if the document was scanned or its
+        file was replaced while the file was being scanned.
+        """
+        with transaction.atomic():
+            document = (
+                Document.objects.pending_scan()
+                .select_for_update()
+                .filter(pk=self.pk, upload=quarantined)
+                .first()
+            )
+            if document is None:
+                return False
+
+            document.scan_status = status
+            document.upload.name = name or quarantined
+            document.save()
+
+            storage = self.upload.storage
+            transaction.on_commit(lambda: storage.delete(quarantined))
+
+        self.scan_status = document.scan_status
+        self.upload.name = document.upload.name
+        self.modified = document.modified
+        return True
+
 
 @receiver(models.signals.post_delete, sender=Document)
 def auto_delete_file_on_delete(sender, instance, **kwargs):
@@ -0,0 +1,61 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..celery import app
+from ..utils.virus_scanner import VirusScanError, scan_file
+from .models import Document
+
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def scan_document(document_pk):
+    """
+    Scan an uploaded document for viruses, a clean document is moved out of
+    quarantine so it can be downloaded and the file of an infected document is
+    deleted. Each upload is scanned by its own task so they run in parallel.
+
+    If the file can't be scanned, e.g. clamd is unavailable, the document stays
+    pending until the scan is queued again by ``scan_pending_documents``.
+
+    The file is scanned outside of a transaction, the document is only locked
+    while the result is recorded. If the document was scanned by another task,
+    or its file was replaced, in the meantime the result is discarded.
+    """
+    document = Document.objects.pending_scan().filter(pk=document_pk).first()
+    if document is None:
+        return
+
+    try:
+        with document.upload.open("rb") as file:
+            clean = scan_file(file)
+    except VirusScanError as e:
+        # the document stays pending so it is scanned again, see
+        # scan_pending_documents
+        logger.warning(f"Could not scan document {document.pk}: {e}")
+        return
+
+    if clean:
+        document.mark_clean()
+    else:
+        logger.warning(f"Malware detected in document {document.pk}, deleting file")
+        document.mark_infected()
+
+
+@app.task
+def scan_pending_documents():
+    """
+    Queue the scans for documents which are still pending, in case their scan
+    was lost, e.g. when a worker was restarted.
+    """
+    cutoff = timezone.now() - timedelta(minutes=settings.VIRUS_SCAN_RETRY_MINUTES)
+    for pk in (
+        Document.objects.pending_scan()
+        .filter(modified__lt=cutoff)
+        .values_list("pk", flat=True)
+    ):
+        scan_document.delay(pk)
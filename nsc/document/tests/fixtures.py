@@ -47,7 +47,9 @@ def model_pdf(minimal_pdf):
 @pytest.fixture
 def make_document(model_pdf):
     def _make_document(**kwargs):
-        return baker.make(Document, upload=model_pdf, **kwargs)
+        document = baker.make(Document, upload=model_pdf, **kwargs)
+        document.mark_clean()
+        return document
 
     return _make_document
 
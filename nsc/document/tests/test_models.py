@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from django.urls import reverse
 
 import pytest
@@ -128,19 +127,30 @@ def test_deleting_review_deletes_document(review_document):
     assert not review_document.file_exists()
 
 
-def test_document_is_saved___cache_is_cleared(make_document):
-    cache.set("foo", "bar")
+def test_document_is_saved___cache_is_invalidated(
+    make_document,
+    make_review,
+    invalidated_cache_tags,
+    django_capture_on_commit_callbacks,
+):
+    review = make_review()
 
-    make_document()
+    with django_capture_on_commit_callbacks(execute=True):
+        make_document(review=review)
 
-    assert cache.get("foo") is None
+    assert invalidated_cache_tags == set(review.get_cache_tags())
 
 
-def test_document_is_deleted___cache_is_cleared(make_document):
-    document = make_document()
+def test_document_is_deleted___cache_is_invalidated(
+    make_document,
+    make_review,
+    invalidated_cache_tags,
+    django_capture_on_commit_callbacks,
+):
+    review = make_review()
+    document = make_document(review=review)
 
-    cache.set("foo", "bar")
+    with django_capture_on_commit_callbacks(execute=True):
+        document.delete()
 
-    document.delete()
-
-    assert cache.get("foo") is None
+    assert invalidated_cache_tags == set(review.get_cache_tags())
@@ -0,0 +1,175 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from freezegun import freeze_time
+from model_bakery import baker
+
+from nsc.utils.virus_scanner import VirusScanError
+
+from ..models import QUARANTINE_DIR, Document
+from ..tasks import scan_document, scan_pending_documents
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def document(model_pdf):
+    return baker.make(Document, upload=model_pdf)
+
+
+def test_upload_is_quarantined(document):
+    """
+    Test a new upload is stored in quarantine until it has been scanned.
+    """
+    assert document.scan_status == Document.SCAN_STATUS.pending_scan
+    assert document.upload.name.startswith(f"{QUARANTINE_DIR}/")
+
+
+def test_upload_is_not_downloadable(document, django_app):
+    response = django_app.get(
+        reverse("document:download", kwargs={"uuid": document.uuid}),
+        expect_errors=True,
+    )
+
+    assert response.status == "404 Not Found"
+
+
+def test_upload_is_scanned_once_committed(document, django_capture_on_commit_callbacks):
+    """
+    Test the scan is queued once the upload has been committed.
+    """
+    with patch.object(scan_document, "delay") as delay_mock:
+        with django_capture_on_commit_callbacks(execute=True):
+            document.save()
+
+    delay_mock.assert_called_once_with(document.pk)
+
+
+def test_clean_file___document_is_released(
+    document, django_capture_on_commit_callbacks
+):
+    """
+    Test a clean file is moved out of quarantine so it can be downloaded.
+    """
+    quarantined = document.upload.name
+    contents = document.upload.read()
+
+    with patch("nsc.document.tasks.scan_file", return_value=True):
+        with django_capture_on_commit_callbacks(execute=True):
+            scan_document(document.pk)
+    document.refresh_from_db()
+
+    assert document.scan_status == Document.SCAN_STATUS.clean
+    assert not document.upload.name.startswith(f"{QUARANTINE_DIR}/")
+    assert document.upload.read() == contents
+    assert not document.upload.storage.exists(quarantined)
+    assert Document.objects.downloadable().filter(pk=document.pk).exists()
+
+
+def test_infected_file___file_is_deleted(document, django_capture_on_commit_callbacks):
+    with patch("nsc.document.tasks.scan_file", return_value=False):
+        with django_capture_on_commit_callbacks(execute=True):
+            scan_document(document.pk)
+    document.refresh_from_db()
+
+    assert document.scan_status == Document.SCAN_STATUS.infected
+    assert not document.file_exists()
+    assert not Document.objects.downloadable().filter(pk=document.pk).exists()
+
+
+def test_scan_failed___document_stays_pending(document):
+    """
+    Test a document which couldn't be scanned, e.g. clamd is unavailable, is
+    neither released nor deleted so the scan is tried again.
+    """
+    with patch("nsc.document.tasks.scan_file", side_effect=VirusScanError):
+        scan_document(document.pk)
+    document.refresh_from_db()
+
+    assert document.scan_status == Document.SCAN_STATUS.pending_scan
+    assert document.upload.name.startswith(f"{QUARANTINE_DIR}/")
+    assert document.file_exists()
+
+
+def test_document_is_only_scanned_once(document):
+    document.mark_clean()
+
+    with patch("nsc.document.tasks.scan_file") as scan_mock:
+        scan_document(document.pk)
+
+    scan_mock.assert_not_called()
+
+
+def test_not_committed___quarantined_file_is_kept(document):
+    """
+    Test the quarantined file is only deleted once the document has been
+    released, so it still exists if the change is rolled back.
+    """
+    quarantined = document.upload.name
+
+    with patch("nsc.document.tasks.scan_file", return_value=True):
+        scan_document(document.pk)
+
+    assert document.upload.storage.exists(quarantined)
+
+
+def test_file_replaced_while_scanning___result_is_discarded(document):
+    """
+    Test the result of a scan is discarded if the file was replaced while it was
+    being scanned, the copy of the scanned file is deleted.
+    """
+    storage = document.upload.storage
+
+    def replace(file):
+        Document.objects.filter(pk=document.pk).update(upload="quarantine/other.pdf")
+        return True
+
+    with patch("nsc.document.tasks.scan_file", side_effect=replace):
+        with patch.object(storage, "delete", wraps=storage.delete) as delete_mock:
+            scan_document(document.pk)
+    document.refresh_from_db()
+
+    assert document.scan_status == Document.SCAN_STATUS.pending_scan
+    assert document.upload.name == "quarantine/other.pdf"
+    released = delete_mock.call_args.args[0]
+    assert not released.startswith(f"{QUARANTINE_DIR}/")
+    assert not storage.exists(released)
+
+
+def test_file_replaced___document_is_scanned_again(document):
+    """
+    Test a replacement file is quarantined until it has been scanned.
+    """
+    document.mark_clean()
+
+    # as saved by the document forms
+    document.upload = SimpleUploadedFile("replacement.pdf", b"replacement")
+    document.save()
+
+    assert document.scan_status == Document.SCAN_STATUS.pending_scan
+    assert document.upload.name.startswith(f"{QUARANTINE_DIR}/")
+
+
+def test_scan_pending_documents(document, model_pdf):
+    """
+    Test the scans are queued again for documents which have been pending for
+    too long.
+    """
+    with freeze_time(timezone.now() - timedelta(minutes=11)):
+        stuck = baker.make(Document, upload=model_pdf)
+
+    with patch.object(scan_document, "delay") as delay_mock:
+        scan_pending_documents()
+
+    delay_mock.assert_called_once_with(stuck.pk)
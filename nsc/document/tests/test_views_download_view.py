@@ -1,3 +1,4 @@
+from django.core.files.base import ContentFile
 from django.urls import reverse
 
 import pytest
@@ -17,3 +18,145 @@ def test_view(review_document, django_app):
     assert response.status == "200 OK"
     review_document.delete()
     review_document.review.delete()
+
+
+def test_view__presigned(review_document, django_app, settings):
+    """
+    Test the download redirects to the storage rather than sending the file.
+    """
+    settings.DOCUMENT_DOWNLOAD_MODE = "presigned"
+
+    response = django_app.get(
+        reverse("document:download", kwargs={"uuid": review_document.uuid})
+    )
+
+    assert response.status == "302 Found"
+    assert response.location == f"{review_document.upload.url}#"
+
+
+def test_view__accel(review_document, django_app, settings):
+    """
+    Test the download asks nginx to send the file.
+    """
+    settings.DOCUMENT_DOWNLOAD_MODE = "accel"
+
+    response = django_app.get(
+        reverse("document:download", kwargs={"uuid": review_document.uuid})
+    )
+
+    assert response.status == "200 OK"
+    assert response.headers["Content-Type"] == "application/pdf"
+    assert response.headers["X-Accel-Redirect"] == (
+        f"/protected-media{review_document.upload.url}"
+    )
+    assert response.body == b""
+
+
+def test_view__missing_file(review_document, django_app):
+    """
+    Test a document whose file is missing is not found.
+    """
+    review_document.delete_file()
+
+    response = django_app.get(
+        reverse("document:download", kwargs={"uuid": review_document.uuid}),
+        expect_errors=True,
+    )
+
+    assert response.status == "404 Not Found"
+
+
+def test_view__etag_matches___not_modified(review_document, django_app):
+    """
+    Test the file is not sent again if the client has the current version.
+    """
+    url = reverse("document:download", kwargs={"uuid": review_document.uuid})
+    etag = django_app.get(url).headers["ETag"]
+
+    response = django_app.get(url, headers={"If-None-Match": etag})
+
+    assert response.status == "304 Not Modified"
+    assert response.headers["ETag"] == etag
+
+
+def test_view__not_modified_since___not_modified(review_document, django_app):
+    url = reverse("document:download", kwargs={"uuid": review_document.uuid})
+    last_modified = django_app.get(url).headers["Last-Modified"]
+
+    response = django_app.get(url, headers={"If-Modified-Since": last_modified})
+
+    assert response.status == "304 Not Modified"
+
+
+def test_view__file_replaced___etag_changes(review_document, django_app):
+    """
+    Test the file is sent if it has been changed since the client downloaded it.
+    """
+    url = reverse("document:download", kwargs={"uuid": review_document.uuid})
+    etag = django_app.get(url).headers["ETag"]
+
+    review_document.upload.save("other.pdf", ContentFile(b"other"))
+
+    response = django_app.get(url, headers={"If-None-Match": etag})
+
+    assert response.status == "200 OK"
+    assert response.body == b"other"
+
+
+@pytest.mark.parametrize(
+    "header,status,content_range,start,end",
+    [
+        ("bytes=0-9", "206 Partial Content", "bytes 0-9/{size}", 0, 10),
+        ("bytes=10-", "206 Partial Content", "bytes 10-{last}/{size}", 10, None),
+        ("bytes=-5", "206 Partial Content", "bytes {last5}-{last}/{size}", -5, None),
+        ("bytes=5-2", "200 OK", None, 0, None),
+        ("items=0-9", "200 OK", None, 0, None),
+    ],
+)
+def test_view__range(
+    review_document, django_app, header, status, content_range, start, end
+):
+    """
+    Test part of the file is sent when a range is requested.
+    """
+    contents = review_document.upload.read()
+    size = len(contents)
+
+    response = django_app.get(
+        reverse("document:download", kwargs={"uuid": review_document.uuid}),
+        headers={"Range": header},
+    )
+
+    assert response.status == status
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers.get("Content-Range") == (
+        content_range and content_range.format(size=size, last=size - 1, last5=size - 5)
+    )
+    assert response.body == contents[start:end]
+
+
+def test_view__range_not_satisfiable(review_document, django_app):
+    size = review_document.upload.size
+
+    response = django_app.get(
+        reverse("document:download", kwargs={"uuid": review_document.uuid}),
+        headers={"Range": f"bytes={size}-"},
+        expect_errors=True,
+    )
+
+    assert response.status == "416 Requested Range Not Satisfiable"
+    assert response.headers["Content-Range"] == f"bytes */{size}"
+
+
+def test_view__range_of_changed_file___whole_file_is_sent(review_document, django_app):
+    """
+    Test the whole file is sent if it changed since the part the client has was
+    downloaded.
+    """
+    response = django_app.get(
+        reverse("document:download", kwargs={"uuid": review_document.uuid}),
+        headers={"Range": "bytes=0-9", "If-Range": '"previous"'},
+    )
+
+    assert response.status == "200 OK"
+    assert response.body == review_document.upload.read()
@@ -1,7 +1,5 @@
-import mimetypes
-
-from django.core.cache import cache
-from django.http import FileResponse, Http404
+from django.conf import settings
+from django.http import Http404
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.views import generic
@@ -9,6 +7,7 @@ from django.views import generic
 from nsc.permissions import ReviewManagerRequiredMixin
 from nsc.review.models import Review
 
+from ..utils.files import download_response
 from ..utils.urls import clean_url
 from .forms import ExternalReviewForm, ReviewDocumentsForm, SubmissionForm
 from .models import Document
@@ -96,23 +95,24 @@ class AddReviewDocumentsView(ReviewManagerRequiredMixin, generic.UpdateView):
 
 
 class DownloadView(generic.DetailView):
-    model = Document
+    queryset = Document.objects.downloadable()
     slug_field = "uuid"
     slug_url_kwarg = "uuid"
 
     def get(self, request, *args, **kwargs):
         document = self.get_object()
-        storage = document.upload.storage
 
-        if not storage.exists(document.upload.name):
+        # a missing file is only found when it is sent from here, otherwise the
+        # storage, or nginx, responds with the error
+        if settings.DOCUMENT_DOWNLOAD_MODE == "proxy" and not document.file_exists():
             raise Http404
 
-        mime_type, encoding = mimetypes.guess_type(document.upload.url)
-
-        return FileResponse(
-            document.upload.open("rb"),
-            as_attachment=True,
-            content_type=mime_type,
+        return download_response(
+            request,
+            document.upload.storage,
+            document.upload.name,
+            etag=document.etag,
+            last_modified=document.last_modified,
         )
 
 
@@ -128,8 +128,3 @@ class DeleteView(ReviewManagerRequiredMixin, generic.DeleteView):
             [self.request.get_host()],
             self.request.is_secure(),
         )
-
-    def post(self, *args, **kwargs):
-        res = super().post(*args, **kwargs)
-        cache.clear()
-        return res
@@ -0,0 +1,22 @@
+from django.http import JsonResponse
+
+
+class AutocompleteMixin:
+    """
+    Return the names of the objects matching the ``q`` query parameter as json
+    for the autocomplete inputs. The queryset must have an ``autocomplete``
+    method, see ``nsc.utils.search.autocomplete``.
+    """
+
+    model = None
+    http_method_names = ["get"]
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def get(self, request, *args, **kwargs):
+        term = request.GET.get("q", "").strip()
+        matches = self.get_queryset().autocomplete(term) if term else []
+        return JsonResponse(
+            {"results": [{"id": obj.pk, "name": obj.name} for obj in matches]}
+        )
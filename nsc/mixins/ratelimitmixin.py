@@ -1,9 +1,11 @@
 import logging
 
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import caches
 from django.shortcuts import render
 
+from django_redis import get_redis_connection
+
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,31 @@ def get_client_ip(request):
     return ip
 
 
+def increment_hit_count(key):
+    """
+    Add a hit to the counter, returning the new count. The counter is created
+    with an expiry of RATE_LIMIT_HIT_COUNT_TTL by the first hit.
+
+    With redis the counter is created and incremented in a single transaction
+    so concurrent requests can't reset it, other caches fall back to ``add``
+    and ``incr``.
+    """
+    cache = caches[settings.RATE_LIMIT_CACHE_ALIAS]
+
+    try:
+        connection = get_redis_connection(settings.RATE_LIMIT_CACHE_ALIAS)
+    except NotImplementedError:
+        cache.add(key, 0, timeout=RATE_LIMIT_HIT_COUNT_TTL)
+        return cache.incr(key)
+
+    key = cache.make_key(key)
+    pipeline = connection.pipeline()
+    pipeline.set(key, 0, ex=RATE_LIMIT_HIT_COUNT_TTL, nx=True)
+    pipeline.incr(key)
+    _, hit_count = pipeline.execute()
+    return hit_count
+
+
 def handle_rate_limit_exceeded(request, hit_count):
     logger.info(
         f"[RateLimit Exceeded] IP={get_client_ip(request)}, path={request.path}, hits={hit_count}"
@@ -41,13 +68,7 @@ class RatelimitExceptionMixin:
     def dispatch(self, request, *args, **kwargs):
         if request.method == "POST":
             client_ip = get_client_ip(request)
-            cache_key = f"hitcount:{client_ip}:{request.path}"  # noqa
-
-            try:
-                hit_count = cache.incr(cache_key)
-            except ValueError:
-                cache.set(cache_key, 1, timeout=RATE_LIMIT_HIT_COUNT_TTL)
-                hit_count = 1
+            hit_count = increment_hit_count(f"hitcount:{client_ip}:{request.path}")
 
             # Custom rate limit threshold check
             if hit_count > RATE_LIMIT_THRESHOLD:
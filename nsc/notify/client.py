@@ -4,12 +4,19 @@ from django.conf import settings
 
 from notifications_python_client.errors import APIError
 from notifications_python_client.notifications import NotificationsAPIClient
+from requests.adapters import HTTPAdapter
+
+from .ratelimit import notify_rate_limit
 
 
 logger = logging.getLogger(__name__)
 
 if settings.NOTIFY_SERVICE_ENABLED and settings.NOTIFY_SERVICE_API_KEY:
     client = NotificationsAPIClient(settings.NOTIFY_SERVICE_API_KEY)
+
+    # share a connection pool large enough for every thread sending emails
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.NOTIFY_SEND_WORKERS)
+    client.request_session.mount("https://", adapter)
 else:
     client = None
 
@@ -28,6 +35,7 @@ def send_email(address, template, context=None, reference=None):
             "personalisation": context,
             "reference": reference,
         }
+        notify_rate_limit.acquire()
         response = client.send_email_notification(**params)
         return response
     except APIError as e:
@@ -39,7 +47,25 @@ def get_email_status(notify_id):
     if client is None:
         return
     try:
+        notify_rate_limit.acquire()
         response = client.get_notification_by_id(notify_id)
         return response
     except APIError as e:
         return e.response.json()
+
+
+def get_email_statuses(older_than=None):
+    """
+    Get a page of the emails sent by notify, newest first. Pass the id of the
+    last notification in a page as ``older_than`` to get the next page.
+    """
+    if client is None:
+        return
+    try:
+        notify_rate_limit.acquire()
+        response = client.get_all_notifications(
+            template_type="email", older_than=older_than
+        )
+        return response
+    except APIError as e:
+        return e.response.json()
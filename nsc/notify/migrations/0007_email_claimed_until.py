@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notify", "0006_auto_20210430_1225"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="email",
+            name="claimed_until",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
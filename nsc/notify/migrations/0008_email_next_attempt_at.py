@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notify", "0007_email_claimed_until"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="email",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:06
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # the email table is large, build the indexes without locking it
+    atomic = False
+
+    dependencies = [
+        ("notify", "0008_email_next_attempt_at"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="email",
+            index=models.Index(
+                condition=models.Q(
+                    (
+                        "status__in",
+                        ["pending", "technical-failure", "temporary-failure"],
+                    )
+                ),
+                fields=["id"],
+                include=("next_attempt_at", "claimed_until"),
+                name="notify_email_to_send_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="email",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["sending", "created"]),
+                    models.Q(("notify_id", ""), _negated=True),
+                ),
+                fields=["modified"],
+                name="notify_email_stale_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="email",
+            index=models.Index(
+                condition=models.Q(
+                    (
+                        "status__in",
+                        ["delivered", "permanent-failure", "too-many-attempts"],
+                    )
+                ),
+                fields=["modified"],
+                name="notify_email_done_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notify", "0009_email_queue_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedEmail",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("created", models.DateTimeField()),
+                ("modified", models.DateTimeField()),
+                ("archived", models.DateTimeField(auto_now_add=True)),
+                ("notify_id", models.CharField(blank=True, default="", max_length=50)),
+                ("address", models.EmailField(max_length=254)),
+                ("template_id", models.CharField(max_length=50)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("created", "Created"),
+                            ("sending", "Sending"),
+                            ("delivered", "Delivered"),
+                            ("permanent-failure", "Permanent Failure"),
+                            ("temporary-failure", "Temporary Failure"),
+                            ("technical-failure", "Technical Failure"),
+                            ("too-many-attempts", "Gave up after too many attempts"),
+                        ],
+                        max_length=17,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,10 +1,11 @@
 import json
 import logging
+import random
 from datetime import timedelta
 
 from django.conf import settings
-from django.db import models
-from django.db.models import JSONField
+from django.db import connection, models, transaction
+from django.db.models import JSONField, Q
 from django.utils.crypto import get_random_string
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -17,6 +18,21 @@ from .client import get_email_status, send_email
 
 logger = logging.getLogger(__name__)
 
+MAX_SEND_ATTEMPTS = 100
+
+
+def get_retry_delay(attempts):
+    """
+    Get the time to wait before retrying an email that has failed ``attempts``
+    times. The delay doubles with each attempt up to a maximum, with half of
+    it randomised so a batch of failures are not all retried at once.
+    """
+    delay = min(
+        settings.NOTIFY_RETRY_MAX_SECONDS,
+        settings.NOTIFY_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+    )
+    return timedelta(seconds=delay / 2 + random.uniform(0, delay / 2))
+
 
 class EmailQuerySet(models.QuerySet):
     def pending(self):
@@ -42,11 +58,15 @@ class EmailQuerySet(models.QuerySet):
 
     def to_send(self):
         return self.filter(
-            status__in=[
-                Email.STATUS.pending,
-                Email.STATUS.technical_failure,
-                Email.STATUS.temporary_failure,
-            ]
+            status__in=Email.STATUS_TO_SEND,
+        ).due()
+
+    def due(self):
+        """
+        Fetches all email objects that are not waiting to be retried.
+        """
+        return self.filter(
+            Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now())
         )
 
     def done(self):
@@ -69,6 +89,103 @@ class EmailQuerySet(models.QuerySet):
     def with_notify_id(self):
         return self.exclude(notify_id="")
 
+    def claimable(self):
+        """
+        Fetches all email objects that are not currently claimed by a worker, or
+        where the worker's lease has expired.
+        """
+        return self.filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=now()))
+
+    def claim(self, limit):
+        """
+        Claims up to ``limit`` emails for the current worker.
+
+        The rows are locked with ``SELECT ... FOR UPDATE SKIP LOCKED`` while the
+        lease is taken so concurrent workers will never claim the same email. If
+        the worker dies before releasing the claim the email becomes available
+        again once the lease expires.
+        """
+        with transaction.atomic():
+            pks = list(
+                self.claimable()
+                .select_for_update(skip_locked=True)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:limit]
+            )
+            Email.objects.filter(pk__in=pks).update(
+                claimed_until=now()
+                + timedelta(seconds=settings.NOTIFY_CLAIM_LEASE_SECONDS)
+            )
+
+        return list(
+            Email.objects.filter(pk__in=pks).select_related("batch").order_by("pk")
+        )
+
+    def archive(self):
+        """
+        Move the emails to the ``ArchivedEmail`` table, along with any links to
+        them from many to many relations so they can still be used to check who
+        has been notified. The context is not kept as it's only needed to send
+        the email.
+
+        Returns the number of emails archived and the bytes they used.
+        """
+        with transaction.atomic():
+            emails = list(self.select_for_update(skip_locked=True))
+            pks = [email.pk for email in emails]
+            if not pks:
+                return 0, 0
+
+            ArchivedEmail.objects.bulk_create(
+                ArchivedEmail(
+                    id=email.id,
+                    created=email.created,
+                    modified=email.modified,
+                    notify_id=email.notify_id,
+                    address=email.address,
+                    template_id=email.template_id,
+                    status=email.status,
+                    attempts=email.attempts,
+                )
+                for email in emails
+            )
+
+            for field, archived_field in ArchivedEmail.get_relations():
+                links = field.remote_field.through.objects.filter(
+                    **{f"{field.m2m_reverse_field_name()}__in": pks}
+                ).values_list(field.m2m_column_name(), field.m2m_reverse_name())
+                archived_field.remote_field.through.objects.bulk_create(
+                    archived_field.remote_field.through(
+                        **{
+                            archived_field.m2m_column_name(): owner_id,
+                            archived_field.m2m_reverse_name(): email_id,
+                        }
+                    )
+                    for owner_id, email_id in links
+                )
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT COALESCE(SUM(pg_column_size(e.*)), 0) "
+                    f"FROM {Email._meta.db_table} e WHERE id = ANY(%s)",
+                    [pks],
+                )
+                size = cursor.fetchone()[0]
+
+            Email.objects.filter(pk__in=pks).delete()
+
+        return len(pks), size
+
+
+class EmailBatch(TimeStampedModel):
+    """
+    The context shared by a group of emails, e.g. everyone notified about a
+    review, so it is stored once rather than copied on to every email. Each
+    email's own context should only hold the values specific to its recipient.
+    """
+
+    context = JSONField(default=dict)
+
 
 class Email(TimeStampedModel):
     """
@@ -94,34 +211,98 @@ class Email(TimeStampedModel):
         ),
     )
 
+    STATUS_TO_SEND = [
+        STATUS.pending,
+        STATUS.technical_failure,
+        STATUS.temporary_failure,
+    ]
+
     notify_id = models.CharField(max_length=50, default="", blank=True, editable=False)
     address = models.EmailField()
     template_id = models.CharField(max_length=50)
     context = JSONField(default=dict)
+    batch = models.ForeignKey(
+        EmailBatch,
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.PROTECT,
+        related_name="emails",
+    )
     status = models.CharField(
         choices=STATUS,
         max_length=max(len(v) for v in STATUS._db_values),
         default=STATUS.pending,
     )
     attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_until = models.DateTimeField(null=True, blank=True, editable=False)
+    next_attempt_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     objects = EmailQuerySet.as_manager()
 
-    def send(self):
-        if self.attempts > 100:
+    class Meta(TimeStampedModel.Meta):
+        # Partial indexes for the queries ran by the scheduler, so they only
+        # cover the emails in each state rather than the whole history. The
+        # conditions must match the filters used in ``EmailQuerySet``.
+        indexes = [
+            # to_send().claim()
+            models.Index(
+                fields=["id"],
+                include=["next_attempt_at", "claimed_until"],
+                condition=Q(
+                    status__in=["pending", "technical-failure", "temporary-failure"]
+                ),
+                name="notify_email_to_send_idx",
+            ),
+            # sending().stale().with_notify_id()
+            models.Index(
+                fields=["modified"],
+                condition=Q(status__in=["sending", "created"]) & ~Q(notify_id=""),
+                name="notify_email_stale_idx",
+            ),
+            # done()
+            models.Index(
+                fields=["modified"],
+                condition=Q(
+                    status__in=["delivered", "permanent-failure", "too-many-attempts"]
+                ),
+                name="notify_email_done_idx",
+            ),
+        ]
+
+    def start_attempt(self):
+        """
+        Record an attempt at sending the email.
+
+        Returns ``False`` if the email has been tried too many times, in which
+        case the status is updated and the email should not be sent.
+        """
+        if self.attempts > MAX_SEND_ATTEMPTS:
             self.status = self.STATUS.too_many_attempts
-            self.save()
-            return
-        else:
-            # Safety valve to prevent us from sending forever in case any subsequent errors cause the final self.save() to fail (or not get called)
-            self.attempts += 1
-            self.save()
+            return False
+
+        self.attempts += 1
+        return True
+
+    def get_context(self):
+        """
+        Get the context to send to notify, the email's own context is merged
+        over the context shared by its batch.
+        """
+        if self.batch_id is None:
+            return self.context
+        return {**self.batch.context, **self.context}
 
+    def send_to_notify(self):
         logger.info(f"sending email: {self.id}")
-        resp = send_email(
-            self.address, self.template_id, context=self.context, reference=str(self.id)
+        return send_email(
+            self.address,
+            self.template_id,
+            context=self.get_context(),
+            reference=str(self.id),
         )
 
+    def process_send_response(self, resp):
         if resp and "errors" not in resp:
             self.status = self.STATUS.sending
             self.notify_id = resp["id"]
@@ -130,16 +311,39 @@ class Email(TimeStampedModel):
                 f"Failed to send email {self.id}, response: {json.dumps(resp)}"
             )
 
-            if resp["errors"][0]["error"] == "ValidationError":
+            if resp and resp["errors"][0]["error"] == "ValidationError":
                 self.status = self.STATUS.permanent_failure
+            else:
+                self.schedule_retry()
+
+    def schedule_retry(self):
+        self.next_attempt_at = now() + get_retry_delay(self.attempts)
+
+    def set_status(self, status):
+        """
+        Update the status reported by notify, scheduling another attempt if
+        notify failed to deliver the email.
+        """
+        self.status = status
+        if status in self.STATUS_TO_SEND:
+            self.schedule_retry()
+
+    def send(self):
+        if not self.start_attempt():
+            self.save()
+            return
+
+        # Safety valve to prevent us from sending forever in case any subsequent errors cause the final self.save() to fail (or not get called)
+        self.save()
 
+        self.process_send_response(self.send_to_notify())
         self.save()
 
     def update_status(self):
         resp = get_email_status(self.notify_id)
 
         if resp and "status" in resp:
-            self.status = resp["status"]
+            self.set_status(resp["status"])
             self.save()
         else:
             logger.error(
@@ -147,6 +351,45 @@ class Email(TimeStampedModel):
             )
 
 
+class ArchivedEmail(models.Model):
+    """
+    An email which was sent (or given up on) long enough ago that it has been
+    moved out of the ``Email`` table by the ``archive_emails`` task.
+
+    For every many to many relation to ``Email`` there should be a matching
+    relation to ``ArchivedEmail`` named ``archived_<name>`` on the same model so
+    the links are kept when an email is archived.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    created = models.DateTimeField()
+    modified = models.DateTimeField()
+    archived = models.DateTimeField(auto_now_add=True)
+    notify_id = models.CharField(max_length=50, default="", blank=True)
+    address = models.EmailField()
+    template_id = models.CharField(max_length=50)
+    status = models.CharField(
+        choices=Email.STATUS,
+        max_length=max(len(v) for v in Email.STATUS._db_values),
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    @staticmethod
+    def get_relations():
+        """
+        Get each many to many field to ``Email`` with the matching field to
+        ``ArchivedEmail``.
+        """
+        return [
+            (
+                rel.field,
+                rel.related_model._meta.get_field(f"archived_{rel.field.name}"),
+            )
+            for rel in Email._meta.related_objects
+            if rel.many_to_many
+        ]
+
+
 def generate_token():
     return get_random_string(50)
 
@@ -0,0 +1,87 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from django_redis import get_redis_connection
+
+
+logger = logging.getLogger(__name__)
+
+
+# Refill the bucket based on the time since it was last used then take a token
+# if there is one. Returns the number of milliseconds to wait before a token is
+# available, 0 if a token was taken. The redis server clock is used so every
+# worker agrees on the time.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "timestamp")
+local tokens = tonumber(bucket[1]) or capacity
+local timestamp = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - timestamp) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "timestamp", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate) + 1000)
+return wait
+"""
+
+
+class TokenBucket:
+    """
+    A token bucket shared between every worker using the rate limit redis cache.
+
+    ``capacity`` tokens are available every ``period`` seconds, calls to
+    ``acquire`` block until a token is available. If the rate limit cache is not
+    backed by redis (e.g. in tests) no limit is applied.
+    """
+
+    def __init__(self, name, capacity, period):
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self._script = None
+
+    @property
+    def script(self):
+        if self._script is None:
+            try:
+                connection = get_redis_connection(settings.RATE_LIMIT_CACHE_ALIAS)
+            except NotImplementedError:
+                logger.warning(f"Rate limit {self.name} disabled, cache is not redis")
+                self._script = False
+            else:
+                self._script = connection.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def take(self):
+        """
+        Try to take a token, returns the number of seconds to wait before trying
+        again or 0 if a token was taken.
+        """
+        if not self.script:
+            return 0
+
+        rate = self.capacity / (self.period * 1000)
+        key = caches[settings.RATE_LIMIT_CACHE_ALIAS].make_key(self.name)
+        wait = self.script(keys=[key], args=[self.capacity, rate])
+        return int(wait) / 1000
+
+    def acquire(self):
+        wait = self.take()
+        while wait:
+            time.sleep(wait)
+            wait = self.take()
+
+
+notify_rate_limit = TokenBucket(
+    "notify:rate-limit", settings.NOTIFY_RATE_LIMIT, settings.NOTIFY_RATE_LIMIT_PERIOD
+)
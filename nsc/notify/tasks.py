@@ -1,26 +1,166 @@
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
 
 from ..celery import app
-from .models import Email
+from .client import get_email_statuses
+from .models import Email, EmailBatch
 
 
 logger = logging.getLogger(__name__)
 
 
+def _send_to_notify(email):
+    try:
+        return email.send_to_notify()
+    except Exception as e:
+        logger.exception(e)
+
+
+def send_batch(emails, executor):
+    """
+    Send a batch of emails, calling the notify service concurrently.
+
+    The attempts are recorded before any requests are made so a failure part way
+    through the batch can't result in an email being sent forever. Each stage is
+    written back to the database with a single ``bulk_update``, the last of which
+    releases the claim on the emails.
+    """
+    to_send = [email for email in emails if email.start_attempt()]
+
+    timestamp = now()
+    for email in emails:
+        email.modified = timestamp
+    Email.objects.bulk_update(emails, ["status", "attempts", "modified"])
+
+    for email, resp in zip(to_send, executor.map(_send_to_notify, to_send)):
+        email.process_send_response(resp)
+        email.modified = now()
+
+    for email in emails:
+        email.claimed_until = None
+    Email.objects.bulk_update(
+        emails,
+        ["status", "notify_id", "next_attempt_at", "modified", "claimed_until"],
+    )
+
+
 @app.task
 def send_pending_emails():
-    # limit to the first 3000 as a max of 3000 messages can be sent in a minute
-    for email in Email.objects.to_send()[:3000]:
-        try:
-            email.send()
-        except Exception as e:
-            logger.exception(e)
+    # limit to the first NOTIFY_SEND_LIMIT (3000) as that is the maximum number
+    # of messages that can be sent in a minute
+    remaining = settings.NOTIFY_SEND_LIMIT
+    last_pk = 0
+
+    with ThreadPoolExecutor(max_workers=settings.NOTIFY_SEND_WORKERS) as executor:
+        while remaining > 0:
+            # page on the primary key so emails which fail are not picked up
+            # again in the same run, emails being sent by other workers are
+            # skipped by claiming them
+            batch = (
+                Email.objects.to_send()
+                .filter(pk__gt=last_pk)
+                .claim(min(settings.NOTIFY_SEND_BATCH_SIZE, remaining))
+            )
+            if not batch:
+                break
+
+            try:
+                send_batch(batch, executor)
+            except Exception as e:
+                logger.exception(e)
+
+            remaining -= len(batch)
+            last_pk = batch[-1].pk
+
+
+def reconcile_email_statuses(emails):
+    """
+    Update the status of the emails from the list of notifications sent by
+    notify, applying the changes with a single ``bulk_update``.
+
+    Pages are fetched until every email has been found or the notifications are
+    older than the oldest email. Returns the emails which were not found.
+    """
+    remaining = {email.notify_id: email for email in emails}
+    oldest = min((email.created for email in emails), default=None)
+    updated = []
+    older_than = None
+
+    while remaining:
+        resp = get_email_statuses(older_than=older_than)
+        if not resp or "notifications" not in resp:
+            logger.error(f"Failed to get email statuses, response: {json.dumps(resp)}")
+            break
+
+        notifications = resp["notifications"]
+        for notification in notifications:
+            email = remaining.pop(notification["id"], None)
+            if email:
+                email.set_status(notification["status"])
+                email.modified = now()
+                updated.append(email)
+
+        if (
+            not notifications
+            or parse_datetime(notifications[-1]["created_at"]) < oldest
+        ):
+            break
+
+        older_than = notifications[-1]["id"]
+
+    Email.objects.bulk_update(updated, ["status", "next_attempt_at", "modified"])
+
+    return list(remaining.values())
 
 
 @app.task
 def update_stale_email_statuses():
-    for email in Email.objects.sending().stale().with_notify_id():
+    emails = list(Email.objects.sending().stale().with_notify_id())
+
+    try:
+        emails = reconcile_email_statuses(emails)
+    except Exception as e:
+        logger.exception(e)
+
+    # fall back to fetching each email that was not in the list of notifications
+    for email in emails:
         try:
             email.update_status()
         except Exception as e:
             logger.exception(e)
+
+
+@app.task
+def archive_emails():
+    """
+    Move emails which were sent (or given up on) more than NOTIFY_ARCHIVE_DAYS
+    ago out of the email table.
+    """
+    cutoff = now() - timedelta(days=settings.NOTIFY_ARCHIVE_DAYS)
+    total_count, total_size = 0, 0
+
+    while True:
+        pks = (
+            Email.objects.done()
+            .filter(modified__lt=cutoff)
+            .order_by("modified")
+            .values_list("pk", flat=True)[: settings.NOTIFY_ARCHIVE_BATCH_SIZE]
+        )
+        count, size = Email.objects.filter(pk__in=list(pks)).archive()
+        if not count:
+            break
+
+        total_count += count
+        total_size += size
+
+    # the shared context is no longer needed once all the emails are archived
+    EmailBatch.objects.filter(emails__isnull=True).delete()
+
+    logger.info(f"Archived {total_count} emails, reclaimed {total_size} bytes")
+    return total_count, total_size
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils.timezone import now
+
+import pytest
+
+from nsc.review.tasks import send_open_review_notifications
+from nsc.utils.datetime import get_today
+
+from ..models import ArchivedEmail, Email, EmailBatch
+from ..tasks import archive_emails
+
+
+# All tests require the database
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def make_old_email(make_email):
+    def _make_old_email(days, **kwargs):
+        email = make_email(**kwargs)
+        Email.objects.filter(pk=email.pk).update(modified=now() - timedelta(days=days))
+        email.refresh_from_db()
+        return email
+
+    return _make_old_email
+
+
+@override_settings(NOTIFY_ARCHIVE_DAYS=30)
+@pytest.mark.parametrize(
+    "status",
+    [
+        Email.STATUS.delivered,
+        Email.STATUS.permanent_failure,
+        Email.STATUS.too_many_attempts,
+    ],
+)
+def test_old_emails_are_done___emails_are_archived(status, make_old_email):
+    email = make_old_email(31, status=status, notify_id="notify_id", attempts=2)
+
+    count, size = archive_emails()
+
+    assert count == 1
+    assert size > 0
+    assert not Email.objects.exists()
+    archived = ArchivedEmail.objects.get()
+    assert archived.id == email.id
+    assert archived.address == email.address
+    assert archived.template_id == email.template_id
+    assert archived.status == status
+    assert archived.notify_id == "notify_id"
+    assert archived.attempts == 2
+    assert archived.modified == email.modified
+
+
+@override_settings(NOTIFY_ARCHIVE_DAYS=30)
+@pytest.mark.parametrize(
+    "status,days",
+    [
+        (Email.STATUS.delivered, 29),
+        (Email.STATUS.pending, 31),
+        (Email.STATUS.sending, 31),
+        (Email.STATUS.temporary_failure, 31),
+    ],
+)
+def test_emails_are_recent_or_not_done___emails_are_not_archived(
+    status, days, make_old_email
+):
+    make_old_email(days, status=status)
+
+    assert archive_emails() == (0, 0)
+    assert Email.objects.count() == 1
+    assert not ArchivedEmail.objects.exists()
+
+
+@override_settings(NOTIFY_ARCHIVE_DAYS=30)
+def test_all_emails_in_a_batch_are_archived___batch_is_deleted(make_old_email):
+    archived_batch, active_batch = (
+        EmailBatch.objects.create(context={"policy": "condition"}) for _ in range(2)
+    )
+    make_old_email(31, status=Email.STATUS.delivered, batch=archived_batch)
+    make_old_email(31, status=Email.STATUS.delivered, batch=active_batch)
+    make_old_email(1, status=Email.STATUS.delivered, batch=active_batch)
+
+    archive_emails()
+
+    assert list(EmailBatch.objects.all()) == [active_batch]
+
+
+@override_settings(NOTIFY_ARCHIVE_DAYS=30, NOTIFY_ARCHIVE_BATCH_SIZE=2)
+def test_emails_are_archived_in_batches(make_old_email):
+    for _ in range(5):
+        make_old_email(31, status=Email.STATUS.delivered)
+
+    count, size = archive_emails()
+
+    assert count == 5
+    assert not Email.objects.exists()
+    assert ArchivedEmail.objects.count() == 5
+
+
+@override_settings(NOTIFY_ARCHIVE_DAYS=30)
+def test_emails_are_archived___review_notifications_are_not_sent_again(
+    keep_db_connection, make_review, make_subscription, make_old_email
+):
+    review = make_review(
+        consultation_start=get_today() - timedelta(days=1),
+        dates_confirmed=True,
+        add_stakeholders=True,
+    )
+    make_subscription(policies=review.policies.all())
+
+    send_open_review_notifications()
+    sent = Email.objects.count()
+    Email.objects.update(
+        status=Email.STATUS.delivered, modified=now() - timedelta(days=31)
+    )
+
+    archive_emails()
+
+    assert not Email.objects.exists()
+    assert review.archived_open_consultation_notifications.count() == sent
+
+    send_open_review_notifications()
+    review.send_open_consultation_notifications()
+
+    assert not Email.objects.exists()
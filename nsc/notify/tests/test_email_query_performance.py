@@ -0,0 +1,103 @@
+import json
+import os
+from datetime import timedelta
+
+from django.db import connection
+from django.utils.timezone import now
+
+import pytest
+
+from ..models import Email
+
+
+# Seeding the history takes a while so these only run when asked for, e.g.
+#   NSC_BENCHMARK=1 pytest nsc/notify/tests/test_email_query_performance.py
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        not os.environ.get("NSC_BENCHMARK"),
+        reason="set NSC_BENCHMARK to run the benchmarks",
+    ),
+]
+
+HISTORY_SIZE = 1_000_000
+
+
+@pytest.fixture
+def email_history():
+    """
+    A million emails, one every minute going back in time. Almost all have been
+    delivered with a few dozen queued, sending or failed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO notify_email (
+                created, modified, notify_id, address, template_id, context,
+                status, attempts
+            )
+            SELECT
+                now() - n * interval '1 minute',
+                now() - n * interval '1 minute',
+                md5(n::text),
+                'subscriber' || n || '@example.com',
+                'template',
+                '{}',
+                CASE
+                    WHEN n %% 20000 = 0 THEN 'pending'
+                    WHEN n %% 20000 = 1 THEN 'sending'
+                    WHEN n %% 20000 = 2 THEN 'temporary-failure'
+                    WHEN n %% 20000 = 3 THEN 'permanent-failure'
+                    ELSE 'delivered'
+                END,
+                1
+            FROM generate_series(1, %s) AS n
+            """,
+            [HISTORY_SIZE],
+        )
+        cursor.execute("ANALYZE notify_email")
+
+
+def get_plan(queryset):
+    return json.loads(queryset.explain(format="json", analyze=True))[0]
+
+
+def get_index_names(node):
+    names = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        names |= get_index_names(child)
+    return names
+
+
+@pytest.mark.parametrize(
+    "get_queryset,index_name",
+    [
+        (
+            lambda: Email.objects.to_send()
+            .filter(pk__gt=0)
+            .claimable()
+            .select_for_update(skip_locked=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:100],
+            "notify_email_to_send_idx",
+        ),
+        (
+            lambda: Email.objects.sending().stale().with_notify_id(),
+            "notify_email_stale_idx",
+        ),
+        (
+            lambda: Email.objects.done()
+            .filter(modified__lt=now() - timedelta(days=30))
+            .order_by("modified")
+            .values_list("pk", flat=True)[:100],
+            "notify_email_done_idx",
+        ),
+    ],
+)
+def test_scheduler_queries_use_partial_indexes(email_history, get_queryset, index_name):
+    # the scheduler runs these every minute so measure them with a warm cache
+    get_plan(get_queryset())
+    plan = get_plan(get_queryset())
+
+    assert index_name in get_index_names(plan["Plan"])
+    assert plan["Execution Time"] < 1
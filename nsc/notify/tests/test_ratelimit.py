@@ -0,0 +1,30 @@
+from unittest.mock import Mock, patch
+
+from ..ratelimit import TokenBucket
+
+
+def test_cache_is_not_redis___tokens_are_always_available():
+    bucket = TokenBucket("test", 1, 60)
+
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+
+
+def test_token_is_not_available___acquire_waits_for_the_bucket_to_refill():
+    bucket = TokenBucket("test", 3000, 60)
+    bucket._script = Mock(side_effect=[20, 10, 0])
+
+    with patch("nsc.notify.ratelimit.time.sleep") as mock_sleep:
+        bucket.acquire()
+
+    assert [c.args for c in mock_sleep.call_args_list] == [(0.02,), (0.01,)]
+    assert bucket._script.call_count == 3
+
+
+def test_bucket_is_called_with_the_refill_rate_per_millisecond():
+    bucket = TokenBucket("test", 3000, 60)
+    bucket._script = Mock(return_value=0)
+
+    bucket.acquire()
+
+    bucket._script.assert_called_once_with(keys=[":1:test"], args=[3000, 0.05])
@@ -1,9 +1,13 @@
 import json
 import uuid
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils.timezone import now
 
 import pytest
 
-from ..models import Email
+from ..models import Email, EmailBatch, get_retry_delay
 from ..tasks import send_pending_emails
 
 
@@ -55,6 +59,24 @@ def test_emails_to_be_sent_exist_emails_are_sent_and_statuses_are_updated(
     assert email.notify_id == notify_id
 
 
+def test_email_is_part_of_a_batch___batch_context_is_merged_with_email_context(
+    notify_client_mock, make_email
+):
+    notify_client_mock.send_email_notification.return_value = {"id": "notify_id"}
+
+    batch = EmailBatch.objects.create(context={"policy": "condition", "name": "all"})
+    email = make_email(batch=batch, context={"name": "recipient"})
+
+    send_pending_emails()
+
+    notify_client_mock.send_email_notification.assert_called_once_with(
+        email_address=email.address,
+        template_id=email.template_id,
+        personalisation={"policy": "condition", "name": "recipient"},
+        reference=str(email.id),
+    )
+
+
 @pytest.mark.parametrize(
     "status",
     [
@@ -102,3 +124,166 @@ def test_done_includes_too_many_attempts():
     email.save()
     queryset = Email.objects.done()
     assert email in queryset
+
+
+@override_settings(NOTIFY_SEND_BATCH_SIZE=2)
+def test_emails_are_sent_in_batches(notify_client_mock, make_email):
+    notify_client_mock.send_email_notification.side_effect = lambda **kwargs: {
+        "id": kwargs["reference"]
+    }
+
+    emails = make_email(status=Email.STATUS.pending, _quantity=5)
+
+    send_pending_emails()
+
+    assert notify_client_mock.send_email_notification.call_count == 5
+    for email in emails:
+        email.refresh_from_db()
+        assert email.status == Email.STATUS.sending
+        assert email.attempts == 1
+        assert email.notify_id == str(email.id)
+
+
+@override_settings(NOTIFY_SEND_BATCH_SIZE=2, NOTIFY_SEND_LIMIT=3)
+def test_no_more_than_the_send_limit_are_sent(notify_client_mock, make_email):
+    notify_client_mock.send_email_notification.return_value = {"id": "notify_id"}
+
+    make_email(status=Email.STATUS.pending, _quantity=5)
+
+    send_pending_emails()
+
+    assert notify_client_mock.send_email_notification.call_count == 3
+    assert Email.objects.pending().count() == 2
+
+
+@override_settings(NOTIFY_SEND_BATCH_SIZE=1)
+def test_failed_emails_are_not_retried_in_the_same_run(notify_client_mock, make_email):
+    notify_client_mock.send_email_notification.return_value = {
+        "errors": [{"error": "Some Error"}]
+    }
+
+    email = make_email(status=Email.STATUS.pending)
+
+    send_pending_emails()
+    email.refresh_from_db()
+
+    notify_client_mock.send_email_notification.assert_called_once()
+    assert email.attempts == 1
+
+
+def test_error_sending_one_email_does_not_stop_the_batch(
+    notify_client_mock, make_email
+):
+    first, second = make_email(status=Email.STATUS.pending, _quantity=2)
+
+    def _send(**kwargs):
+        if kwargs["reference"] == str(first.id):
+            raise Exception("Connection error")
+        return {"id": "notify_id"}
+
+    notify_client_mock.send_email_notification.side_effect = _send
+
+    send_pending_emails()
+    first.refresh_from_db()
+    second.refresh_from_db()
+
+    assert first.status == Email.STATUS.pending
+    assert first.attempts == 1
+    assert second.status == Email.STATUS.sending
+    assert second.attempts == 1
+
+
+def test_emails_with_too_many_attempts_are_not_sent(notify_client_mock, make_email):
+    email = make_email(status=Email.STATUS.temporary_failure, attempts=101)
+
+    send_pending_emails()
+    email.refresh_from_db()
+
+    notify_client_mock.send_email_notification.assert_not_called()
+    assert email.status == Email.STATUS.too_many_attempts
+
+
+def test_claimed_emails_are_not_sent(notify_client_mock, make_email):
+    email = make_email(
+        status=Email.STATUS.pending, claimed_until=now() + timedelta(minutes=1)
+    )
+
+    send_pending_emails()
+    email.refresh_from_db()
+
+    notify_client_mock.send_email_notification.assert_not_called()
+    assert email.attempts == 0
+
+
+def test_emails_with_an_expired_claim_are_sent(notify_client_mock, make_email):
+    notify_client_mock.send_email_notification.return_value = {"id": "notify_id"}
+    email = make_email(
+        status=Email.STATUS.pending, claimed_until=now() - timedelta(seconds=1)
+    )
+
+    send_pending_emails()
+    email.refresh_from_db()
+
+    notify_client_mock.send_email_notification.assert_called_once()
+    assert email.status == Email.STATUS.sending
+    assert email.claimed_until is None
+
+
+@override_settings(NOTIFY_CLAIM_LEASE_SECONDS=60)
+def test_claim_takes_a_lease_on_the_emails(make_email):
+    first, second = make_email(status=Email.STATUS.pending, _quantity=2)
+
+    claimed = Email.objects.to_send().claim(1)
+
+    assert claimed == [first]
+    assert claimed[0].claimed_until == now() + timedelta(seconds=60)
+    assert Email.objects.to_send().claim(2) == [second]
+
+
+def test_failed_emails_are_scheduled_for_retry(notify_client_mock, make_email):
+    notify_client_mock.send_email_notification.return_value = {
+        "errors": [{"error": "Some Error"}]
+    }
+    email = make_email(status=Email.STATUS.pending)
+
+    send_pending_emails()
+    email.refresh_from_db()
+
+    assert email.next_attempt_at > now()
+    assert email not in Email.objects.to_send()
+
+
+def test_emails_waiting_to_be_retried_are_not_sent(notify_client_mock, make_email):
+    make_email(
+        status=Email.STATUS.temporary_failure,
+        next_attempt_at=now() + timedelta(minutes=1),
+    )
+
+    send_pending_emails()
+
+    notify_client_mock.send_email_notification.assert_not_called()
+
+
+def test_emails_due_to_be_retried_are_sent(notify_client_mock, make_email):
+    notify_client_mock.send_email_notification.return_value = {"id": "notify_id"}
+    email = make_email(
+        status=Email.STATUS.temporary_failure,
+        next_attempt_at=now() - timedelta(minutes=1),
+    )
+
+    send_pending_emails()
+    email.refresh_from_db()
+
+    notify_client_mock.send_email_notification.assert_called_once()
+    assert email.status == Email.STATUS.sending
+
+
+@override_settings(NOTIFY_RETRY_BASE_SECONDS=60, NOTIFY_RETRY_MAX_SECONDS=3600)
+@pytest.mark.parametrize(
+    "attempts,max_delay",
+    [(0, 60), (1, 60), (2, 120), (3, 240), (6, 1920), (7, 3600), (50, 3600)],
+)
+def test_retry_delay_backs_off_exponentially(attempts, max_delay):
+    for _ in range(20):
+        delay = get_retry_delay(attempts).total_seconds()
+        assert max_delay / 2 <= delay <= max_delay
@@ -121,3 +121,101 @@ def test_emails_are_stale___statuses_are_updated(
         notify_client_mock.get_notification_by_id.assert_called_once_with(
             email.notify_id
         )
+
+
+@pytest.mark.parametrize(
+    "new_status",
+    [
+        Email.STATUS.temporary_failure,
+        Email.STATUS.technical_failure,
+    ],
+)
+def test_emails_failed_to_deliver___retry_is_scheduled(
+    new_status, notify_client_mock, make_email
+):
+    email = make_email(status=Email.STATUS.sending, notify_id="notify_id", attempts=1)
+
+    with freeze_time(now() + timedelta(minutes=settings.NOTIFY_STALE_MINUTES)):
+        notify_client_mock.get_notification_by_id.return_value = {"status": new_status}
+
+        update_stale_email_statuses()
+
+        email.refresh_from_db()
+
+        assert email.status == new_status
+        assert email.next_attempt_at > now()
+
+
+def test_emails_are_stale___statuses_are_updated_from_the_list_of_notifications(
+    notify_client_mock, make_email
+):
+    delivered = make_email(status=Email.STATUS.sending, notify_id="notify_id_1")
+    failed = make_email(status=Email.STATUS.sending, notify_id="notify_id_2")
+
+    with freeze_time(now() + timedelta(minutes=settings.NOTIFY_STALE_MINUTES)):
+        created_at = now().isoformat()
+        notify_client_mock.get_all_notifications.side_effect = [
+            {
+                "notifications": [
+                    {"id": "other", "status": "delivered", "created_at": created_at},
+                    {
+                        "id": "notify_id_1",
+                        "status": Email.STATUS.delivered,
+                        "created_at": created_at,
+                    },
+                ]
+            },
+            {
+                "notifications": [
+                    {
+                        "id": "notify_id_2",
+                        "status": Email.STATUS.permanent_failure,
+                        "created_at": created_at,
+                    },
+                ]
+            },
+        ]
+
+        update_stale_email_statuses()
+
+        delivered.refresh_from_db()
+        failed.refresh_from_db()
+
+        assert delivered.status == Email.STATUS.delivered
+        assert delivered.modified == now()
+        assert failed.status == Email.STATUS.permanent_failure
+        assert [
+            c.kwargs for c in notify_client_mock.get_all_notifications.call_args_list
+        ] == [
+            {"template_type": "email", "older_than": None},
+            {"template_type": "email", "older_than": "notify_id_1"},
+        ]
+        notify_client_mock.get_notification_by_id.assert_not_called()
+
+
+def test_notifications_are_older_than_the_emails___missing_emails_are_fetched(
+    notify_client_mock, make_email
+):
+    email = make_email(status=Email.STATUS.sending, notify_id="notify_id")
+
+    with freeze_time(now() + timedelta(minutes=settings.NOTIFY_STALE_MINUTES)):
+        notify_client_mock.get_all_notifications.return_value = {
+            "notifications": [
+                {
+                    "id": "other",
+                    "status": "delivered",
+                    "created_at": (now() - timedelta(days=1)).isoformat(),
+                },
+            ]
+        }
+        notify_client_mock.get_notification_by_id.return_value = {
+            "status": Email.STATUS.delivered
+        }
+
+        update_stale_email_statuses()
+
+        email.refresh_from_db()
+
+        assert email.status == Email.STATUS.delivered
+        notify_client_mock.get_all_notifications.assert_called_once()
+        notify_client_mock.get_notification_by_id.assert_called_once_with("notify_id")
@@ -29,6 +29,8 @@ class ProcessSendReceipt(generic.View):
             return HttpResponseBadRequest()
 
         # save the status change
-        form.save()
+        email = form.save(commit=False)
+        email.set_status(form.cleaned_data["status"])
+        email.save()
 
         return HttpResponse()
@@ -1,8 +1,8 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 
-from nsc.signals import clear_cache
+from nsc.signals import invalidate_cache, invalidate_deleted_cache
 
 
 class PolicyConfig(AppConfig):
@@ -11,5 +11,5 @@ class PolicyConfig(AppConfig):
     def ready(self):
         from nsc.policy.models import Policy
 
-        receiver(post_save, sender=Policy)(clear_cache)
-        receiver(post_delete, sender=Policy)(clear_cache)
+        receiver(post_save, sender=Policy)(invalidate_cache)
+        receiver(pre_delete, sender=Policy)(invalidate_deleted_cache)
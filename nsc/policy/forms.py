@@ -13,6 +13,7 @@ from model_utils import Choices
 from nsc.document.forms import document_formset_form_factory
 from nsc.document.models import Document, DocumentPolicy
 from nsc.utils.datetime import get_today
+from nsc.utils.forms import AutocompleteSelect
 
 from .models import Policy
 
@@ -275,6 +276,7 @@ class PolicyEditForm(NextReviewToYearMixin, forms.ModelForm):
 class PolicySelectionForm(forms.Form):
     policy = forms.ModelChoiceField(
         Policy.objects.none(),
+        widget=AutocompleteSelect("policy:autocomplete"),
         error_messages={"required": _("Enter a condition")},
     )
 
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vector(apps, schema_editor):
+    # see nsc.policy.models.get_search_vector
+    Policy = apps.get_model("policy", "Policy")
+    Policy.objects.update(
+        search_vector=(
+            SearchVector("name", weight="A", config="english")
+            + SearchVector("keywords", weight="B", config="english")
+            + SearchVector("condition", weight="C", config="english")
+            + SearchVector("summary", weight="D", config="english")
+            + SearchVector("name", weight="A", config="simple")
+            + SearchVector("keywords", weight="B", config="simple")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("policy", "0006_auto_20210218_1210"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="policy",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="policy",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="policy_poli_search__710f6c_gin"
+            ),
+        ),
+        migrations.RunPython(
+            populate_search_vector, reverse_code=migrations.RunPython.noop
+        ),
+    ]
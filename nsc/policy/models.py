@@ -3,8 +3,11 @@ from urllib.parse import urljoin
 
 from django.apps import apps
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
-from django.db.models import Prefetch, Q
+from django.db.models import Prefetch, Q, Value
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.text import slugify
@@ -16,16 +19,39 @@ from model_utils import Choices
 from simple_history.models import HistoricalRecords
 
 from nsc.document.models import Document
-from nsc.notify.models import Email
 from nsc.review.models import Review
+from nsc.utils.cache import get_cache_tag
 from nsc.utils.datetime import get_today
 from nsc.utils.forms import ChoiceArrayField
 from nsc.utils.markdown import convert
+from nsc.utils.search import autocomplete, search
 
 
 logger = logging.getLogger(__name__)
 
 
+def get_search_vector(policy=None):
+    """
+    Get the expression for a policy's search vector, from the columns or from
+    the fields of ``policy`` so the vector can be saved with it. The text is
+    weighted so matches on the name rank above the keywords, condition and
+    summary. The name and keywords are also added without stemming so any word
+    in them can be matched by its first few letters.
+    """
+
+    def field(name):
+        return Value(getattr(policy, name)) if policy else name
+
+    return (
+        SearchVector(field("name"), weight="A", config="english")
+        + SearchVector(field("keywords"), weight="B", config="english")
+        + SearchVector(field("condition"), weight="C", config="english")
+        + SearchVector(field("summary"), weight="D", config="english")
+        + SearchVector(field("name"), weight="A", config="simple")
+        + SearchVector(field("keywords"), weight="B", config="simple")
+    )
+
+
 class PolicyQuerySet(models.QuerySet):
     def active(self):
         return self.filter(is_active=True)
@@ -46,9 +72,13 @@ class PolicyQuerySet(models.QuerySet):
         return self.filter(next_review__gte=today, next_review__lt=next_year)
 
     def search(self, keywords):
-        return self.filter(
-            Q(name__icontains=keywords) | Q(keywords__icontains=keywords)
-        )
+        return search(self, keywords)
+
+    def autocomplete(self, term):
+        return autocomplete(self, term)
+
+    def update_search_vector(self):
+        return self.update(search_vector=get_search_vector())
 
     def in_progress(self):
         """
@@ -147,16 +177,30 @@ class Policy(TimeStampedModel):
         "review.Review", verbose_name=_("reviews"), related_name="policies"
     )
 
-    history = HistoricalRecords()
+    # see get_search_vector, updated whenever the policy is saved
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    history = HistoricalRecords(excluded_fields=["search_vector"])
     objects = PolicyQuerySet.as_manager()
 
     class Meta:
         ordering = ("name", "pk")
         verbose_name_plural = _("policies")
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            # see nsc.utils.search.autocomplete
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="policy_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def get_cache_tags(self):
+        return [get_cache_tag(Policy), get_cache_tag(self)]
+
     def get_public_url(self):
         return reverse("condition:detail", kwargs={"slug": self.slug})
 
@@ -191,6 +235,10 @@ class Policy(TimeStampedModel):
         self.background_html = convert(self.background)
         self.archived_reason_html = convert(self.archived_reason)
 
+    def save(self, **kwargs):
+        self.search_vector = get_search_vector(self)
+        super().save(**kwargs)
+
     @cached_property
     def current_review(self):
         return self.reviews.in_progress().first()
@@ -204,6 +252,9 @@ class Policy(TimeStampedModel):
         """
         Two cycles of supporting documents are shown for public,
         once a in open consultation only one is show.
+
+        The documents aren't prefetched, they are loaded inside the cached
+        fragment which lists them so they are only read when it is rendered.
         """
         limit = 2
         if self.current_review and self.current_review.in_consultation():
@@ -213,6 +264,9 @@ class Policy(TimeStampedModel):
     def get_archive_documents(self):
         return Document.objects.for_policy(self).archive()
 
+    def get_public_archive_documents(self):
+        return self.get_archive_documents().downloadable()
+
     def get_ages_display(self):
         return ", ".join(map(lambda a: str(self.AGE_GROUPS[a]), self.ages))
 
@@ -222,47 +276,3 @@ class Policy(TimeStampedModel):
             "policy": self.name,
             **extra,
         }
-
-    def send_notifications(self, relation, template, extra_context=None):
-        email_context = self.get_email_context(**(extra_context or {}))
-
-        # find each stakeholder without a notification object and create one
-        existing_notification_emails = relation.values_list("address", flat=True)
-        relation.add(
-            *Email.objects.bulk_create(
-                Email(
-                    address=sub.email,
-                    template_id=template,
-                    context={
-                        **email_context,
-                        "manage subscription url": urljoin(
-                            settings.EMAIL_ROOT_DOMAIN, sub.management_url
-                        ),
-                        "subscribe url": urljoin(
-                            settings.EMAIL_ROOT_DOMAIN,
-                            reverse("subscription:public-start"),
-                        ),
-                    },
-                )
-                for sub in self.subscriptions.all().exclude(
-                    email__in=existing_notification_emails
-                )
-            )
-        )
-
-    def send_open_consultation_notifications(
-        self, review_notification_relation, extra_context
-    ):
-
-        self.send_notifications(
-            review_notification_relation,
-            settings.NOTIFY_TEMPLATE_SUBSCRIBER_CONSULTATION_OPEN,
-            extra_context,
-        )
-
-    def send_decision_notifications(self, review_notification_relation, extra_context):
-        self.send_notifications(
-            review_notification_relation,
-            settings.NOTIFY_TEMPLATE_SUBSCRIBER_DECISION_PUBLISHED,
-            extra_context,
-        )
@@ -0,0 +1,45 @@
+import pytest
+from bs4 import BeautifulSoup
+from model_bakery import baker
+
+from ..forms import PolicySelectionForm
+from ..models import Policy
+
+
+# All tests require the database
+pytestmark = pytest.mark.django_db
+
+
+def get_options(form):
+    select = BeautifulSoup(str(form["policy"]), "html.parser").find("select")
+    return select, [(option["value"], option.text) for option in select("option")]
+
+
+def test_only_selected_policy_is_rendered():
+    """
+    Test only the selected policy is included in the select, the others are
+    fetched from the autocomplete endpoint.
+    """
+    policy, _ = baker.make(Policy, _quantity=2)
+    form = PolicySelectionForm(data={"policy": policy.pk})
+
+    select, options = get_options(form)
+
+    assert select["data-autocomplete-url"] == "/policy/autocomplete/"
+    assert options == [("", ""), (str(policy.pk), policy.name)]
+
+
+def test_no_policy_selected():
+    baker.make(Policy, _quantity=2)
+
+    _, options = get_options(PolicySelectionForm())
+
+    assert options == [("", "")]
+
+
+def test_selected_policy_is_valid():
+    policy = baker.make(Policy)
+    form = PolicySelectionForm(data={"policy": policy.pk})
+
+    assert form.is_valid()
+    assert form.cleaned_data["policy"] == policy
@@ -1,5 +1,3 @@
-from django.core.cache import cache
-
 import pytest
 from dateutil.relativedelta import relativedelta
 from model_bakery import baker
@@ -169,6 +167,48 @@ def test_search_on_partial_keywords():
     assert expected == actual
 
 
+def test_search_uses_stemming():
+    """
+    Test the queryset search() method matches other forms of a word.
+    """
+    baker.make(Policy, name="first", keywords="screened")
+    baker.make(Policy, name="other")
+    actual = [obj.name for obj in Policy.objects.search("screening")]
+    assert actual == ["first"]
+
+
+def test_search_on_condition_and_summary():
+    """
+    Test the queryset search() method searches the condition and summary.
+    """
+    baker.make(Policy, name="first", condition="an inherited disorder")
+    baker.make(Policy, name="second", summary="a disorder of the blood")
+    baker.make(Policy, name="other")
+    actual = [obj.name for obj in Policy.objects.search("disorder")]
+    assert actual == ["first", "second"]
+
+
+def test_search_is_ordered_by_relevance():
+    """
+    Test the queryset search() method ranks matches on the name above matches
+    on the summary.
+    """
+    baker.make(Policy, name="first", summary="anaemia")
+    baker.make(Policy, name="anaemia")
+    actual = [obj.name for obj in Policy.objects.search("anaemia")]
+    assert actual == ["anaemia", "first"]
+
+
+def test_search_vector_is_updated_on_save():
+    """
+    Test the search vector is updated when the policy is saved.
+    """
+    policy = baker.make(Policy, name="first")
+    policy.keywords = "keyword"
+    policy.save()
+    assert list(Policy.objects.search("keyword")) == [policy]
+
+
 def test_slug_is_set():
     """
     Test the slug field, if not set, is generated from the name field.
@@ -288,19 +328,22 @@ def test_prefetch_reviews_in_consultation(start, end, count):
     assert len(actual.reviews_in_consultation) == count
 
 
-def test_policy_is_saved___cache_is_cleared(make_policy):
-    cache.set("foo", "bar")
+def test_policy_is_saved___cache_is_invalidated(
+    make_policy, invalidated_cache_tags, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        policy = make_policy()
 
-    make_policy()
+    assert invalidated_cache_tags == {"policy.policy", f"policy.policy:{policy.pk}"}
 
-    assert cache.get("foo") is None
 
-
-def test_policy_is_deleted___cache_is_cleared(make_policy):
+def test_policy_is_deleted___cache_is_invalidated(
+    make_policy, invalidated_cache_tags, django_capture_on_commit_callbacks
+):
     policy = make_policy()
+    pk = policy.pk
 
-    cache.set("foo", "bar")
-
-    policy.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        policy.delete()
 
-    assert cache.get("foo") is None
+    assert invalidated_cache_tags == {"policy.policy", f"policy.policy:{pk}"}
@@ -0,0 +1,80 @@
+from django.urls import reverse
+
+import pytest
+from model_bakery import baker
+
+from nsc.policy.models import Policy
+
+
+# All tests require the database
+pytestmark = pytest.mark.django_db
+
+autocomplete_url = reverse("policy:autocomplete")
+
+
+def test_autocomplete__no_user(test_access_no_user):
+    test_access_no_user(url=autocomplete_url)
+
+
+def test_autocomplete__incorrect_permission(test_access_forbidden):
+    test_access_forbidden(url=autocomplete_url)
+
+
+def test_autocomplete__matches_start_of_word(erm_user, django_app):
+    """
+    Test the policies with a word starting with the term are returned.
+    """
+    policy = baker.make(Policy, name="Cystic fibrosis")
+    baker.make(Policy, name="Sickle cell")
+
+    response = django_app.get(autocomplete_url, {"q": "fib"}, user=erm_user)
+
+    assert response.json == {"results": [{"id": policy.pk, "name": policy.name}]}
+
+
+def test_autocomplete__prefix_matches_first(erm_user, django_app):
+    """
+    Test the policies starting with the term are listed before the similar
+    matches.
+    """
+    baker.make(Policy, name="Atrial fibrillation")
+    baker.make(Policy, name="Fibrosis")
+
+    response = django_app.get(autocomplete_url, {"q": "fib"}, user=erm_user)
+
+    names = [result["name"] for result in response.json["results"]]
+    assert names == ["Fibrosis", "Atrial fibrillation"]
+
+
+def test_autocomplete__similar_matches(erm_user, django_app):
+    """
+    Test a misspelt term still finds the policy.
+    """
+    policy = baker.make(Policy, name="Haemochromatosis")
+
+    response = django_app.get(autocomplete_url, {"q": "hemochromatosis"}, user=erm_user)
+
+    assert response.json["results"] == [{"id": policy.pk, "name": policy.name}]
+
+
+def test_autocomplete__limited(erm_user, django_app, settings):
+    """
+    Test the number of results is limited.
+    """
+    settings.AUTOCOMPLETE_LIMIT = 2
+    baker.make(Policy, name="Anaemia", _quantity=3)
+
+    response = django_app.get(autocomplete_url, {"q": "anaemia"}, user=erm_user)
+
+    assert len(response.json["results"]) == 2
+
+
+def test_autocomplete__no_term(erm_user, django_app):
+    """
+    Test nothing is returned until a term is entered.
+    """
+    baker.make(Policy, name="Anaemia")
+
+    response = django_app.get(autocomplete_url, {"q": " "}, user=erm_user)
+
+    assert response.json == {"results": []}
@@ -5,6 +5,7 @@ import pytest
 from bs4 import BeautifulSoup
 from model_bakery import baker
 
+from nsc.document.models import Document
 from nsc.policy.models import Policy
 from nsc.review.models import Review
 
@@ -112,3 +113,32 @@ def test_manage_versus_create_button(erm_user, django_app):
     nodes = BeautifulSoup(response.content, "html.parser")
     assert nodes.find("a", {"id": "create-review-link-id"}) is None
     assert nodes.find("a", {"id": "manage-review-link-id"}) is not None
+
+
+def test_archive_documents_show_the_virus_scan_status(
+    erm_user, make_document, model_pdf, django_app
+):
+    """
+    Test the archive documents which haven't passed the virus scan are listed
+    with their status, rather than a link, so the user knows to upload them again.
+    """
+    policy = baker.make(Policy, archived=True)
+    make_document(name="Clean", document_type=Document.TYPE.archive).policies.add(
+        policy
+    )
+    pending = baker.make(
+        Document, name="Pending", upload=model_pdf, document_type=Document.TYPE.archive
+    )
+    infected = baker.make(
+        Document, name="Infected", upload=model_pdf, document_type=Document.TYPE.archive
+    )
+    infected.mark_infected()
+    policy.policy_documents.add(pending, infected)
+
+    response = django_app.get(policy.get_admin_url(), user=erm_user)
+
+    assert response.html.find("a", string="Clean")
+    assert not response.html.find("a", string="Pending")
+    assert not response.html.find("a", string="Infected")
+    assert "Waiting for virus scan" in response.text
+    assert "Malware detected" in response.text
@@ -48,6 +48,7 @@ urlpatterns += [
 
 urlpatterns += [
     path(r"", views.PolicyList.as_view(), name="list"),
+    path(r"autocomplete/", views.PolicyAutocomplete.as_view(), name="autocomplete"),
     path(r"<slug:slug>/", views.PolicyDetail.as_view(), name="detail"),
     path(r"<slug:slug>/edit/", views.PolicyEdit.as_view(), name="edit"),
 ]
@@ -1,10 +1,11 @@
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
 from django.urls import reverse, reverse_lazy
-from django.views.generic import CreateView, DetailView, UpdateView
+from django.views.generic import CreateView, DetailView, UpdateView, View
 
 from django_filters.views import FilterView
 
+from nsc.mixins.autocompletemixin import AutocompleteMixin
 from nsc.permissions import ReviewManagerRequiredMixin
 
 from .filters import SearchFilter
@@ -59,6 +60,10 @@ class PolicyList(ReviewManagerRequiredMixin, FilterView):
         return super().get_context_data(form=form)
 
 
+class PolicyAutocomplete(ReviewManagerRequiredMixin, AutocompleteMixin, View):
+    model = Policy
+
+
 class PolicyDetail(ReviewManagerRequiredMixin, DetailView):
     model = Policy
     lookup_field = "slug"
@@ -6,6 +6,7 @@ from .models import Review
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
 
-    list_display = ("name",)
+    list_display = ("name", "status")
+    list_filter = ("status",)
     search_fields = ("name",)
     readonly_fields = ("slug", "summary_html")
@@ -1,8 +1,8 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
 
-from nsc.signals import clear_cache
+from nsc.signals import invalidate_cache, invalidate_deleted_cache
 
 
 class ReviewConfig(AppConfig):
@@ -11,7 +11,8 @@ class ReviewConfig(AppConfig):
     def ready(self):
         from nsc.review.models import Review, ReviewRecommendation
 
-        receiver(post_save, sender=Review)(clear_cache)
-        receiver(post_delete, sender=Review)(clear_cache)
-        receiver(post_save, sender=ReviewRecommendation)(clear_cache)
-        receiver(post_delete, sender=ReviewRecommendation)(clear_cache)
+        receiver(post_save, sender=Review)(invalidate_cache)
+        receiver(pre_delete, sender=Review)(invalidate_deleted_cache)
+        receiver(m2m_changed, sender=Review.policies.through)(invalidate_cache)
+        receiver(post_save, sender=ReviewRecommendation)(invalidate_cache)
+        receiver(pre_delete, sender=ReviewRecommendation)(invalidate_deleted_cache)
@@ -0,0 +1,89 @@
+import hashlib
+import posixpath
+from contextlib import contextmanager
+from tempfile import TemporaryFile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from ..utils.files import iter_file_chunks, stream_zip
+
+
+BUNDLE_DIR = "bundles"
+
+
+def get_bundle_hash(documents):
+    """
+    Get the hash identifying the documents in a bundle, it changes when a
+    document is added, removed, renamed or its file is replaced.
+    """
+    digest = hashlib.sha256()
+    for doc in sorted(documents, key=lambda doc: doc.pk):
+        digest.update(
+            f"{doc.pk}:{doc.name}:{doc.upload.name}:{doc.modified.isoformat()}\n".encode()
+        )
+    return digest.hexdigest()
+
+
+def get_bundle_path(review_pk, doc_type, documents):
+    return posixpath.join(
+        BUNDLE_DIR, str(review_pk), get_bundle_hash(documents), f"{doc_type}.zip"
+    )
+
+
+@contextmanager
+def bundle_lock(review_pk, doc_type):
+    """
+    Take the lock to build or delete the bundles of a review's documents of a
+    type, the value is whether the lock was taken. The documents should be read
+    once the lock is held so an older set of documents never replaces the
+    bundle of a newer one.
+    """
+    key = f"bundle-lock:{review_pk}:{doc_type}"
+    locked = cache.add(key, 1, timeout=settings.DOCUMENT_BUNDLE_LOCK_SECONDS)
+    try:
+        yield locked
+    finally:
+        if locked:
+            cache.delete(key)
+
+
+def build_bundle(review_pk, doc_type, documents):
+    """
+    Store the zip of a review's documents of a type, the zip is stored under the
+    hash of the documents so it is only built once and never out of date. The
+    bundles of the previous documents are deleted. Call it while holding the
+    ``bundle_lock``.
+    """
+    path = get_bundle_path(review_pk, doc_type, documents)
+    if not default_storage.exists(path):
+        with TemporaryFile() as bundle:
+            for data in stream_zip(
+                (doc.name, iter_file_chunks(doc.upload)) for doc in documents
+            ):
+                bundle.write(data)
+            bundle.seek(0)
+            saved = default_storage.save(path, File(bundle))
+
+        # the storage doesn't overwrite files, if the bundle was stored while
+        # this one was built the copy saved under another name is removed
+        if saved != path:
+            default_storage.delete(saved)
+
+    delete_bundles(review_pk, doc_type, keep=path)
+    return path
+
+
+def delete_bundles(review_pk, doc_type, keep=None):
+    directory = posixpath.join(BUNDLE_DIR, str(review_pk))
+    try:
+        hashes, _ = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+
+    for bundle_hash in hashes:
+        path = posixpath.join(directory, bundle_hash, f"{doc_type}.zip")
+        if path != keep and default_storage.exists(path):
+            default_storage.delete(path)
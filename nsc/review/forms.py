@@ -17,6 +17,7 @@ from model_utils import Choices
 from nsc.stakeholder.models import Stakeholder
 from nsc.utils.datetime import get_today
 
+from ..condition.tasks import warm_condition_pages
 from ..document.models import Document
 from ..policy.formsets import PolicySelectionFormset
 from ..policy.models import Policy
@@ -682,6 +683,7 @@ class ReviewPublishForm(forms.ModelForm):
                 Policy.objects.filter(id=policy_id).update(
                     summary=text, summary_html=convert(text)
                 )
+            self.instance.policies.update_search_vector()
 
             # update the recommendation of each policy
             for policy_id, recommendation in recommendations:
@@ -695,4 +697,12 @@ class ReviewPublishForm(forms.ModelForm):
                 next_review=_today.replace(year=_today.year + 3)
             )
 
-            return super().save(commit=commit)
+            review = super().save(commit=commit)
+
+            # render the updated public pages once the changes are visible, the
+            # callback is registered after the save so it runs after the cached
+            # pages are invalidated
+            policy_pks = list(self.instance.policies.values_list("pk", flat=True))
+            transaction.on_commit(lambda: warm_condition_pages.delay(policy_pks))
+
+            return review
@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+from django.db.models import Count
+
+from nsc.document.models import Document
+
+from ...tasks import build_document_bundle
+
+
+class Command(BaseCommand):
+    def handle(self, *args, **options):
+        bundles = (
+            Document.objects.filter(review__isnull=False)
+            .values_list("review_id", "document_type")
+            .annotate(count=Count("pk"))
+            .filter(count__gt=1)
+            .order_by()
+        )
+        for review_pk, doc_type, _ in bundles:
+            build_document_bundle(review_pk, doc_type)
@@ -0,0 +1,8 @@
+from django.core.management import BaseCommand
+
+from ...tasks import update_review_statuses
+
+
+class Command(BaseCommand):
+    def handle(self, *args, **options):
+        update_review_statuses()
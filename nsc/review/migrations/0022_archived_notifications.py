@@ -0,0 +1,32 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notify", "0010_archivedemail"),
+        ("review", "0021_auto_20210323_1518"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="archived_decision_published_notifications",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="publish_notification_reviews",
+                to="notify.archivedemail",
+            ),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="archived_open_consultation_notifications",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="open_consultation_reviews",
+                to="notify.archivedemail",
+            ),
+        ),
+    ]
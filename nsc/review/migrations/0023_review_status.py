@@ -0,0 +1,91 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:32
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+STATUS_CHOICES = [
+    ("development", "In review"),
+    ("in_consultation", "In Open consultation"),
+    ("post_consultation", "Post-consultation"),
+    ("completed", "Review Complete"),
+]
+
+# the document needed for each type of review, see Review.has_supporting_documents
+REVIEW_TYPE_DOCUMENTS = {
+    "evidence": "evidence_review",
+    "map": "evidence_map",
+    "cost": "cost",
+    "systematic": "systematic",
+}
+
+
+def get_status(review, today):
+    required = {"cover_sheet"} | {
+        REVIEW_TYPE_DOCUMENTS[t]
+        for t in review.review_type
+        if t in REVIEW_TYPE_DOCUMENTS
+    }
+    document_types = set(review.documents.values_list("document_type", flat=True))
+    summaries = list(review.summary_drafts.values_list("updated", flat=True))
+
+    if required <= document_types and summaries and all(summaries):
+        return "completed"
+    elif (
+        review.dates_confirmed
+        and review.consultation_end
+        and review.consultation_end < today
+    ):
+        return "post_consultation"
+    elif (
+        review.dates_confirmed
+        and review.consultation_start
+        and review.consultation_start <= today
+    ):
+        return "in_consultation"
+    else:
+        return "development"
+
+
+def populate_status(apps, schema_editor):
+    Review = apps.get_model("review", "Review")
+    today = timezone.localdate()
+    for review in Review.objects.all():
+        review.status = get_status(review, today)
+        review.save(update_fields=["status"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("document", "0010_alter_document_policies"),
+        ("review", "0022_archived_notifications"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalreview",
+            name="status",
+            field=models.CharField(
+                choices=STATUS_CHOICES,
+                db_index=True,
+                default="development",
+                editable=False,
+                max_length=17,
+                verbose_name="status",
+            ),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="status",
+            field=models.CharField(
+                choices=STATUS_CHOICES,
+                db_index=True,
+                default="development",
+                editable=False,
+                max_length=17,
+                verbose_name="status",
+            ),
+        ),
+        migrations.RunPython(populate_status, reverse_code=migrations.RunPython.noop),
+    ]
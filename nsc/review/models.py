@@ -1,9 +1,13 @@
+import uuid
 from urllib.parse import urljoin
 
+from django.apps import apps
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.core.cache import cache
 from django.core.files.storage import default_storage
-from django.db import models
+from django.core.signing import Signer
+from django.db import models, transaction
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.functional import cached_property
@@ -18,9 +22,11 @@ from simple_history.models import HistoricalRecords
 
 from nsc.contact.models import Contact
 from nsc.document.models import Document
-from nsc.notify.models import Email
+from nsc.notify.models import ArchivedEmail, Email, EmailBatch
 from nsc.stakeholder.models import Stakeholder
+from nsc.utils.cache import get_cache_tag
 from nsc.utils.datetime import get_date_display, get_today
+from nsc.utils.iterators import chunked
 from nsc.utils.markdown import convert
 
 
@@ -40,6 +46,30 @@ class ReviewQuerySet(models.QuerySet):
     def in_progress(self):
         return self.exclude(published=True)
 
+    def status_outdated(self):
+        """
+        Get the reviews whose consultation has started or ended since their
+        status was last updated.
+        """
+        today = get_today()
+        return self.dates_confirmed().filter(
+            models.Q(
+                status=Review.STATUS.development,
+                consultation_start__lte=today,
+            )
+            | models.Q(
+                status__in=[Review.STATUS.development, Review.STATUS.in_consultation],
+                consultation_end__lt=today,
+            )
+        )
+
+    def with_documents(self):
+        """
+        Prefetch the documents of every review so ``Review.documents_by_type``
+        and the accessors built on it don't query for each review.
+        """
+        return self.prefetch_related("documents")
+
     def open_for_comments(self):
         today = get_today()
         return self.in_progress().filter(
@@ -117,8 +147,28 @@ class Review(TimeStampedModel):
         Email, related_name="publish_notification_reviews", blank=True
     )
 
+    # notifications which have been moved to the archive, see ArchivedEmail
+    archived_open_consultation_notifications = models.ManyToManyField(
+        ArchivedEmail, related_name="open_consultation_reviews", blank=True
+    )
+
+    archived_decision_published_notifications = models.ManyToManyField(
+        ArchivedEmail, related_name="publish_notification_reviews", blank=True
+    )
+
     published = models.BooleanField(null=True, blank=True)
 
+    # kept up to date when the review, its documents or summaries are saved and
+    # by the update_review_statuses task as the consultation dates pass
+    status = models.CharField(
+        verbose_name=_("status"),
+        choices=STATUS,
+        max_length=17,
+        default=STATUS.development,
+        editable=False,
+        db_index=True,
+    )
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.DO_NOTHING,
@@ -137,6 +187,12 @@ class Review(TimeStampedModel):
     def __str__(self):
         return self.name
 
+    def get_cache_tags(self):
+        return [
+            get_cache_tag(self),
+            *(tag for policy in self.policies.all() for tag in policy.get_cache_tags()),
+        ]
+
     def get_absolute_url(self):
         return reverse("review:detail", kwargs={"slug": self.slug})
 
@@ -145,71 +201,117 @@ class Review(TimeStampedModel):
             str(self.TYPE[getattr(self.TYPE, rt)]) for rt in self.review_type
         )
 
+    @cached_property
+    def documents_by_type(self):
+        """
+        The review's documents grouped by type. Built from a single query of
+        ``documents``, or the prefetched documents (see ``with_documents``), and
+        shared by all the document accessors below.
+        """
+        documents = {key: [] for key, label in Document.TYPE}
+        for document in self.documents.all():
+            documents[document.document_type].append(document)
+        return documents
+
+    @cached_property
+    def public_documents_by_type(self):
+        """
+        The documents shown on the public pages, grouped by type. Documents are
+        only shown once they have passed the virus scan so the links to them
+        can be downloaded.
+        """
+        return {
+            key: [document for document in documents if document.is_downloadable]
+            for key, documents in self.documents_by_type.items()
+        }
+
+    def get_first_document(self, document_type):
+        documents = self.documents_by_type[document_type]
+        return documents[0] if documents else None
+
     def get_external_reviews(self):
         return Document.objects.for_review(self).external_reviews()
 
     @cached_property
     def external_review(self):
-        return self.get_external_reviews().first()
+        return self.get_first_document(Document.TYPE.external_review)
 
     def get_submission_forms(self):
         return Document.objects.for_review(self).submission_forms()
 
     @cached_property
     def submission_form(self):
-        return self.get_submission_forms().first()
+        return self.get_first_document(Document.TYPE.submission_form)
 
     def get_cover_sheets(self):
         return Document.objects.for_review(self).cover_sheets()
 
     @cached_property
     def cover_sheet(self):
-        return self.get_cover_sheets().first()
+        return self.get_first_document(Document.TYPE.cover_sheet)
 
     def get_evidence_reviews(self):
         return Document.objects.for_review(self).evidence_reviews()
 
     @cached_property
     def evidence_review(self):
-        return self.get_evidence_reviews().first()
+        return self.get_first_document(Document.TYPE.evidence_review)
 
     def get_cost_effective_models(self):
         return Document.objects.for_review(self).cost_effective_models()
 
     @cached_property
     def cost_effective_model(self):
-        return self.get_cost_effective_models().first()
+        return self.get_first_document(Document.TYPE.cost)
 
     def get_evidence_maps(self):
         return Document.objects.for_review(self).evidence_maps()
 
     @cached_property
     def evidence_map(self):
-        return self.get_evidence_maps().first()
+        return self.get_first_document(Document.TYPE.evidence_map)
 
     def get_systematic_reviews(self):
         return Document.objects.for_review(self).systematic_reviews()
 
     @cached_property
     def systematic_review(self):
-        return self.get_systematic_reviews().first()
+        return self.get_first_document(Document.TYPE.systematic)
 
-    @cached_property
-    def get_all_type_documents(self):
+    @staticmethod
+    def get_supporting_documents(documents_by_type):
         return [
-            *self.get_evidence_reviews(),
-            *self.get_cost_effective_models(),
-            *self.get_evidence_maps(),
-            *self.get_systematic_reviews(),
-            *self.get_other_review_documents(),
+            *documents_by_type[Document.TYPE.evidence_review],
+            *documents_by_type[Document.TYPE.cost],
+            *documents_by_type[Document.TYPE.evidence_map],
+            *documents_by_type[Document.TYPE.systematic],
+            *documents_by_type[Document.TYPE.other],
         ]
 
+    @cached_property
+    def get_all_type_documents(self):
+        return self.get_supporting_documents(self.documents_by_type)
+
+    @cached_property
+    def public_supporting_documents(self):
+        return self.get_supporting_documents(self.public_documents_by_type)
+
     def get_other_review_documents(self):
         return Document.objects.for_review(self).others()
 
     @cached_property
     def other_review_documents(self):
-        return self.get_other_review_documents()
+        return self.documents_by_type[Document.TYPE.other]
+
+    @cached_property
+    def documents_version(self):
+        """
+        A version which changes whenever one of the review's documents is saved
+        or deleted, used to key the cached fragments showing the documents.
+        """
+        return cache.get_or_set(
+            get_documents_version_key(self.pk), lambda: uuid.uuid4().hex, timeout=None
+        )
 
     def policies_display(self):
         return mark_safe("<br/>".join([policy.name for policy in self.policies.all()]))
@@ -248,7 +350,7 @@ class Review(TimeStampedModel):
         return self.dates_confirmed and self.nsc_meeting_date is not None
 
     def has_external_review(self):
-        return Document.objects.for_review(self).external_reviews().exists()
+        return bool(self.documents_by_type[Document.TYPE.external_review])
 
     def has_supporting_documents(self):
         required_document_types = {
@@ -267,13 +369,10 @@ class Review(TimeStampedModel):
             ),
         }
 
-        return (
-            set(self.documents.values_list("document_type", flat=True))
-            & required_document_types
-        ) == required_document_types
+        return all(self.documents_by_type[key] for key in required_document_types)
 
     def has_submission_form(self):
-        return Document.objects.for_review(self).submission_forms().exists()
+        return bool(self.documents_by_type[Document.TYPE.submission_form])
 
     def has_summary(self):
         all_summary_drafts = list(self.summary_drafts.all())
@@ -292,9 +391,13 @@ class Review(TimeStampedModel):
             return review_recommendation.recommendation
         return False
 
-    def status(self):
+    def get_status(self):
+        # the documents may have changed since they were loaded
+        self.__dict__.pop("documents_by_type", None)
+        self.__dict__.pop("public_documents_by_type", None)
+
         today = get_today()
-        if self.has_supporting_documents() and self.has_summary():
+        if self.pk and self.has_supporting_documents() and self.has_summary():
             return self.STATUS.completed
         elif (
             self.dates_confirmed
@@ -311,17 +414,27 @@ class Review(TimeStampedModel):
         else:
             return self.STATUS.development
 
+    def update_status(self):
+        """
+        Calculate the status again from the documents, summaries and dates,
+        saving the review if it has changed.
+        """
+        status = self.get_status()
+        if status != self.status:
+            self.status = status
+            self.save(update_fields=["status"])
+
     def status_display(self):
-        return self.STATUS[self.status()]
+        return self.get_status_display()
 
     def preparing(self):
-        return self.status() == self.STATUS.development
+        return self.status == self.STATUS.development
 
     def in_consultation(self):
-        return self.status() == self.STATUS.in_consultation
+        return self.status == self.STATUS.in_consultation
 
     def post_consultation(self):
-        return self.status() == self.STATUS.post_consultation
+        return self.status == self.STATUS.post_consultation
 
     @property
     def policy_stakeholders(self):
@@ -341,6 +454,9 @@ class Review(TimeStampedModel):
         self.summary_html = convert(self.summary)
         self.background_html = convert(self.background)
 
+        if kwargs.get("update_fields") is None:
+            self.status = self.get_status()
+
         return super(Review, self).save(**kwargs)
 
     def get_email_context(self, **extra):
@@ -369,78 +485,161 @@ class Review(TimeStampedModel):
         }
 
     def send_notifications(
-        self, relation, stakeholder_template, comms_template, extra_context=None
+        self,
+        relation,
+        archived_relation,
+        stakeholder_template,
+        comms_template,
+        extra_context=None,
     ):
-        email_context = self.get_email_context(**(extra_context or {}))
-
         # find each stakeholder without a notification object and create one
         existing_notification_emails = relation.values_list("address", flat=True)
-        relation.add(
-            *Email.objects.bulk_create(
+        archived_notification_emails = archived_relation.values_list(
+            "address", flat=True
+        )
+        emails = [
+            Email(
+                address=contact.email,
+                template_id=stakeholder_template,
+                context={"recipient name": contact.name},
+            )
+            for contact in Contact.objects.with_email()
+            .filter(stakeholder__in=self.stakeholders.all())
+            .exclude(email__in=existing_notification_emails)
+            .exclude(email__in=archived_notification_emails)
+        ]
+
+        if (
+            settings.PHE_COMMUNICATIONS_EMAIL not in existing_notification_emails
+            and settings.PHE_COMMUNICATIONS_EMAIL not in archived_notification_emails
+        ):
+            emails.append(
                 Email(
-                    address=contact.email,
-                    template_id=stakeholder_template,
-                    context={"recipient name": contact.name, **email_context},
+                    address=settings.PHE_COMMUNICATIONS_EMAIL,
+                    template_id=comms_template,
+                    context={"recipient name": settings.PHE_COMMUNICATIONS_NAME},
                 )
-                for contact in Contact.objects.with_email()
-                .filter(stakeholder__in=self.stakeholders.all())
-                .exclude(email__in=existing_notification_emails)
             )
+
+        if not emails:
+            return
+
+        # the review context is shared by every email so is only stored once
+        batch = EmailBatch.objects.create(
+            context=self.get_email_context(**(extra_context or {}))
         )
+        for email in emails:
+            email.batch = batch
+        relation.add(*Email.objects.bulk_create(emails))
+
+    def send_subscriber_notifications(self, relation, archived_relation, template):
+        """
+        Create an email for every subscriber to any of the review's conditions
+        who hasn't already been notified. The subscribers are found with a single
+        query, anyone subscribed to several of the conditions gets one email
+        about the first of them.
+        """
+        subscription_model = apps.get_model("subscription", "Subscription")
+
+        extra_context = {
+            "review manager full name": self.user.get_full_name(),
+            "consultation end date": (
+                self.consultation_end.strftime("%d %B %Y")
+                if self.consultation_end
+                else ""
+            ),
+            "subscribe url": urljoin(
+                settings.EMAIL_ROOT_DOMAIN, reverse("subscription:public-start")
+            ),
+        }
+        policy_contexts = {
+            policy.pk: policy.get_email_context(**extra_context)
+            for policy in self.policies.all()
+        }
+        signer = Signer()
+
+        subscriptions = (
+            subscription_model.policies.through.objects.filter(
+                policy_id__in=policy_contexts.keys()
+            )
+            .exclude(subscription__email__in=relation.values_list("address", flat=True))
+            .exclude(
+                subscription__email__in=archived_relation.values_list(
+                    "address", flat=True
+                )
+            )
+            .order_by("subscription_id", "policy__name", "policy_id")
+            .distinct("subscription_id")
+            .values_list("subscription_id", "subscription__email", "policy_id")
+            .iterator(chunk_size=settings.NOTIFY_FAN_OUT_CHUNK_SIZE)
+        )
+        batches = {}
+        for chunk in chunked(subscriptions, settings.NOTIFY_FAN_OUT_CHUNK_SIZE):
+            # store the context for each condition once, only the management
+            # url is stored with each email
+            for policy_id in {row[2] for row in chunk} - batches.keys():
+                batches[policy_id] = EmailBatch.objects.create(
+                    context=policy_contexts[policy_id]
+                )
 
-        if settings.PHE_COMMUNICATIONS_EMAIL not in existing_notification_emails:
             relation.add(
-                Email.objects.create(
-                    address=settings.PHE_COMMUNICATIONS_EMAIL,
-                    template_id=comms_template,
-                    context={
-                        "recipient name": settings.PHE_COMMUNICATIONS_NAME,
-                        **email_context,
-                    },
+                *Email.objects.bulk_create(
+                    Email(
+                        address=email,
+                        template_id=template,
+                        batch=batches[policy_id],
+                        context={
+                            "manage subscription url": urljoin(
+                                settings.EMAIL_ROOT_DOMAIN,
+                                subscription_model(pk=pk).get_management_url(signer),
+                            ),
+                        },
+                    )
+                    for pk, email, policy_id in chunk
                 )
             )
 
+    def lock(self):
+        """
+        Lock the review until the end of the transaction so notifications can't
+        be sent by two workers at the same time.
+        """
+        Review.objects.select_for_update().get(pk=self.pk)
+
     def send_open_consultation_notifications(self):
-        self.send_notifications(
-            self.open_consultation_notifications,
-            settings.NOTIFY_TEMPLATE_CONSULTATION_OPEN,
-            settings.NOTIFY_TEMPLATE_CONSULTATION_OPEN,
-        )
+        with transaction.atomic():
+            self.lock()
+
+            self.send_notifications(
+                self.open_consultation_notifications,
+                self.archived_open_consultation_notifications,
+                settings.NOTIFY_TEMPLATE_CONSULTATION_OPEN,
+                settings.NOTIFY_TEMPLATE_CONSULTATION_OPEN,
+            )
 
-        # send notifications to all subscribers to the conditions
-        for policy in self.policies.all():
-            policy.send_open_consultation_notifications(
+            # send notifications to all subscribers to the conditions
+            self.send_subscriber_notifications(
                 self.open_consultation_notifications,
-                {
-                    "policy": policy.name if policy.name else "",
-                    "review manager full name": self.user.get_full_name(),
-                    "consultation end date": (
-                        self.consultation_end.strftime("%d %B %Y")
-                        if self.consultation_end
-                        else ""
-                    ),
-                },
+                self.archived_open_consultation_notifications,
+                settings.NOTIFY_TEMPLATE_SUBSCRIBER_CONSULTATION_OPEN,
             )
 
     def send_decision_notifications(self):
-        self.send_notifications(
-            self.decision_published_notifications,
-            settings.NOTIFY_TEMPLATE_DECISION_PUBLISHED,
-            settings.NOTIFY_TEMPLATE_DECISION_PUBLISHED,
-        )
+        with transaction.atomic():
+            self.lock()
 
-        # send notifications to all subscribers to the conditions
-        for policy in self.policies.all():
-            policy.send_decision_notifications(
+            self.send_notifications(
                 self.decision_published_notifications,
-                {
-                    "review manager full name": self.user.get_full_name(),
-                    "consultation end date": (
-                        self.consultation_end.strftime("%d %B %Y")
-                        if self.consultation_end
-                        else ""
-                    ),
-                },
+                self.archived_decision_published_notifications,
+                settings.NOTIFY_TEMPLATE_DECISION_PUBLISHED,
+                settings.NOTIFY_TEMPLATE_DECISION_PUBLISHED,
+            )
+
+            # send notifications to all subscribers to the conditions
+            self.send_subscriber_notifications(
+                self.decision_published_notifications,
+                self.archived_decision_published_notifications,
+                settings.NOTIFY_TEMPLATE_SUBSCRIBER_DECISION_PUBLISHED,
             )
 
     @property
@@ -480,6 +679,35 @@ class ReviewRecommendation(TimeStampedModel):
     def __str__(self):
         return f"Review recommendation for {self.policy} (review {self.review})."
 
+    def get_cache_tags(self):
+        return [*self.review.get_cache_tags(), *self.policy.get_cache_tags()]
+
+
+def get_documents_version_key(review_pk):
+    return f"review-documents-version:{review_pk}"
+
+
+@receiver(models.signals.post_save, sender=Document)
+@receiver(models.signals.post_delete, sender=Document)
+def update_documents_version(sender, instance, **kwargs):
+    if instance.review_id:
+        key = get_documents_version_key(instance.review_id)
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(models.signals.post_save, sender=Document)
+@receiver(models.signals.post_delete, sender=Document)
+@receiver(models.signals.post_save, sender=SummaryDraft)
+@receiver(models.signals.post_delete, sender=SummaryDraft)
+def update_review_status(sender, instance, **kwargs):
+    # the review's status doesn't matter if it is being deleted
+    if isinstance(kwargs.get("origin"), Review):
+        return
+
+    review = Review.objects.filter(pk=instance.review_id).first()
+    if review:
+        review.update_status()
+
 
 @receiver(models.signals.post_delete, sender=Review)
 def auto_delete_file_on_delete(sender, instance, **kwargs):
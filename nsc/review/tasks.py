@@ -1,35 +1,90 @@
-from django.core.cache import cache
-from django.db.models import Count
+from django.conf import settings
 
 from ..celery import app
+from ..condition.tasks import warm_condition_pages
+from ..document.models import Document
+from ..utils.cache import invalidate_cache_tags
+from .bundles import build_bundle, bundle_lock, delete_bundles
 from .models import Review
 
 
+def warm_review_pages(reviews):
+    """
+    Update the cached pages for the reviews, which have changed state, before
+    the notifications are sent so visitors following the links in the emails
+    are given a cached page.
+    """
+    if not reviews:
+        return
+
+    invalidate_cache_tags(
+        *(tag for review in reviews for tag in review.get_cache_tags())
+    )
+    warm_condition_pages(
+        [policy.pk for review in reviews for policy in review.policies.all()]
+    )
+
+
 @app.task
 def send_open_review_notifications():
     open_reviews = Review.objects.consultation_open().exclude_legacy()
-    open_reviews_without_notifications = open_reviews.annotate(
-        notifications_count=Count("open_consultation_notifications"),
-    ).filter(notifications_count=0)
+    open_reviews_without_notifications = open_reviews.exclude(
+        open_consultation_notifications__isnull=False
+    ).exclude(archived_open_consultation_notifications__isnull=False)
 
-    for review in open_reviews_without_notifications:
-        review.send_open_consultation_notifications()
+    reviews = list(open_reviews_without_notifications)
+    warm_review_pages(reviews)
 
-    # if we have sent any notifications clear the cache
-    if len(open_reviews_without_notifications) > 0:
-        cache.clear()
+    for review in reviews:
+        review.send_open_consultation_notifications()
 
 
 @app.task
 def send_published_notifications():
     published_reviews = Review.objects.published().exclude_legacy()
-    published_reviews_without_notifications = published_reviews.annotate(
-        notifications_count=Count("decision_published_notifications"),
-    ).filter(notifications_count=0)
+    published_reviews_without_notifications = published_reviews.exclude(
+        decision_published_notifications__isnull=False
+    ).exclude(archived_decision_published_notifications__isnull=False)
+
+    reviews = list(published_reviews_without_notifications)
+    warm_review_pages(reviews)
 
-    for review in published_reviews_without_notifications:
+    for review in reviews:
         review.send_decision_notifications()
 
-    # if we have sent any notifications clear the cache
-    if len(published_reviews_without_notifications) > 0:
-        cache.clear()
+
+@app.task
+def update_review_statuses():
+    """
+    Update the status of reviews whose consultation has started or ended.
+    """
+    for review in Review.objects.status_outdated():
+        review.update_status()
+
+
+@app.task
+def build_document_bundle(review_pk, doc_type):
+    """
+    Build the zip of a review's documents of a type, downloaded from the
+    review page, after the documents have changed.
+
+    Several builds can be queued at once, e.g. by a formset upload, so only one
+    runs at a time. The others are queued again to read the documents after it
+    has finished.
+    """
+    with bundle_lock(review_pk, doc_type) as locked:
+        if not locked:
+            build_document_bundle.apply_async(
+                (review_pk, doc_type), countdown=settings.DOCUMENT_BUNDLE_RETRY_SECONDS
+            )
+            return
+
+        documents = list(
+            Document.objects.downloadable().filter(
+                review_id=review_pk, document_type=doc_type
+            )
+        )
+        if len(documents) > 1:
+            build_bundle(review_pk, doc_type, documents)
+        else:
+            delete_bundles(review_pk, doc_type)
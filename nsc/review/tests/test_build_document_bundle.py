@@ -0,0 +1,136 @@
+from unittest.mock import patch
+from zipfile import ZipFile
+
+from django.core.files.storage import default_storage
+
+import pytest
+
+from nsc.document.models import Document
+
+from ..bundles import bundle_lock, get_bundle_path
+from ..tasks import build_document_bundle
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def review(make_review):
+    return make_review()
+
+
+@pytest.fixture
+def documents(review, make_document):
+    return [
+        make_document(
+            name=name, review=review, document_type=Document.TYPE.evidence_review
+        )
+        for name in ["first.pdf", "second.pdf"]
+    ]
+
+
+def get_bundle(review, documents):
+    return get_bundle_path(review.pk, Document.TYPE.evidence_review, documents)
+
+
+def test_bundle_is_built(review, documents):
+    """
+    Test the zip of the documents is stored under the hash of the documents.
+    """
+    build_document_bundle(review.pk, Document.TYPE.evidence_review)
+
+    with default_storage.open(get_bundle(review, documents)) as bundle:
+        with ZipFile(bundle) as archive:
+            assert archive.namelist() == ["first.pdf", "second.pdf"]
+            assert archive.read("first.pdf") == documents[0].upload.read()
+
+
+def test_documents_changed___previous_bundle_is_deleted(
+    review, documents, make_document
+):
+    """
+    Test the bundle for the previous documents is deleted when the bundle is
+    built again.
+    """
+    build_document_bundle(review.pk, Document.TYPE.evidence_review)
+    previous = get_bundle(review, documents)
+
+    documents.append(
+        make_document(
+            name="third.pdf",
+            review=review,
+            document_type=Document.TYPE.evidence_review,
+        )
+    )
+    build_document_bundle(review.pk, Document.TYPE.evidence_review)
+
+    assert get_bundle(review, documents) != previous
+    assert default_storage.exists(get_bundle(review, documents))
+    assert not default_storage.exists(previous)
+
+
+def test_single_document___bundle_is_deleted(review, documents):
+    """
+    Test the bundle is deleted when only one document is left, it is downloaded
+    on its own.
+    """
+    build_document_bundle(review.pk, Document.TYPE.evidence_review)
+    bundle = get_bundle(review, documents)
+
+    documents[0].delete()
+    build_document_bundle(review.pk, Document.TYPE.evidence_review)
+
+    assert not default_storage.exists(bundle)
+
+
+def test_document_saved___bundle_is_scheduled(
+    review, make_document, django_capture_on_commit_callbacks
+):
+    """
+    Test the bundle is built again after a document is saved.
+    """
+    with patch.object(build_document_bundle, "delay") as delay_mock, patch(
+        "nsc.document.tasks.scan_document.delay"
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            make_document(review=review, document_type=Document.TYPE.evidence_review)
+
+    delay_mock.assert_called_with(review.pk, Document.TYPE.evidence_review)
+
+
+def test_bundle_is_being_built___build_is_queued_again(review, documents, settings):
+    """
+    Test a build is queued again, rather than run, while another build for the
+    review's documents of the type holds the lock.
+    """
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    with bundle_lock(review.pk, Document.TYPE.evidence_review):
+        with patch.object(build_document_bundle, "apply_async") as apply_mock:
+            build_document_bundle(review.pk, Document.TYPE.evidence_review)
+
+    apply_mock.assert_called_once()
+    assert apply_mock.call_args.args[0] == (review.pk, Document.TYPE.evidence_review)
+    assert not default_storage.exists(get_bundle(review, documents))
+
+
+def test_bundle_saved_under_another_name___copy_is_deleted(review, documents):
+    """
+    Test the copy of a bundle is deleted if the storage saved it under another
+    name, as the bundle was stored while it was being built.
+    """
+    path = get_bundle(review, documents)
+    copy = path.replace(".zip", "_abc123.zip")
+
+    with patch.object(default_storage, "save", return_value=copy), patch.object(
+        default_storage, "delete"
+    ) as delete_mock:
+        build_document_bundle(review.pk, Document.TYPE.evidence_review)
+
+    delete_mock.assert_called_once_with(copy)
@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from django.urls import reverse
 
 import pytest
@@ -119,6 +118,41 @@ def test_cover_sheet_document(review_published):
     assert review_published.cover_sheet.pk == expected.pk
 
 
+def test_document_accessors_share_one_query(
+    review_published, django_assert_num_queries
+):
+    """
+    Test the documents are fetched once and shared by all the accessors.
+    """
+    with django_assert_num_queries(1):
+        assert review_published.external_review is not None
+        assert review_published.submission_form is not None
+        assert review_published.cover_sheet is not None
+        assert review_published.evidence_review is not None
+        assert review_published.evidence_map is None
+        assert review_published.other_review_documents == []
+        assert review_published.get_all_type_documents == [
+            review_published.evidence_review
+        ]
+        assert review_published.has_external_review()
+        assert review_published.has_submission_form()
+
+
+def test_with_documents(make_review, django_assert_num_queries):
+    """
+    Test the documents of every review can be prefetched.
+    """
+    for i in range(3):
+        baker.make(
+            Document, review=make_review(), document_type=Document.TYPE.cover_sheet
+        )
+
+    with django_assert_num_queries(2):
+        reviews = list(Review.objects.with_documents())
+        assert all(review.cover_sheet for review in reviews)
+        assert not any(review.has_external_review() for review in reviews)
+
+
 @pytest.mark.parametrize(
     "published,count",
     [(False, 1), (True, 0)],  # valid: review started  # valid: review completed
@@ -234,39 +268,55 @@ def test_deleting_review_deletes_folder(review_document):
     assert not review_document.upload.storage.exists(folder)
 
 
-def test_review_is_saved___cache_is_cleared(make_review):
-    cache.set("foo", "bar")
-
-    make_review()
+def test_review_is_saved___cache_is_invalidated(
+    make_review, invalidated_cache_tags, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        review = make_review()
 
-    assert cache.get("foo") is None
+    policy = review.policies.get()
+    assert invalidated_cache_tags == {
+        f"review.review:{review.pk}",
+        "policy.policy",
+        f"policy.policy:{policy.pk}",
+    }
 
 
-def test_review_is_deleted___cache_is_cleared(make_review):
+def test_review_is_deleted___cache_is_invalidated(
+    make_review, invalidated_cache_tags, django_capture_on_commit_callbacks
+):
     review = make_review()
+    expected = set(review.get_cache_tags())
 
-    cache.set("foo", "bar")
-
-    review.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        review.delete()
 
-    assert cache.get("foo") is None
+    assert invalidated_cache_tags == expected
 
 
-def test_review_recommendation_is_saved___cache_is_cleared(make_review_recommendation):
-    cache.set("foo", "bar")
-
-    make_review_recommendation()
+def test_review_recommendation_is_saved___cache_is_invalidated(
+    make_review_recommendation,
+    invalidated_cache_tags,
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        review_recommendation = make_review_recommendation()
 
-    assert cache.get("foo") is None
+    assert invalidated_cache_tags == {
+        *review_recommendation.review.get_cache_tags(),
+        *review_recommendation.policy.get_cache_tags(),
+    }
 
 
-def test_review_recommendation_is_deleted___cache_is_cleared(
+def test_review_recommendation_is_deleted___cache_is_invalidated(
     make_review_recommendation,
+    invalidated_cache_tags,
+    django_capture_on_commit_callbacks,
 ):
     review_recommendation = make_review_recommendation()
+    expected = set(review_recommendation.get_cache_tags())
 
-    cache.set("foo", "bar")
-
-    review_recommendation.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        review_recommendation.delete()
 
-    assert cache.get("foo") is None
+    assert invalidated_cache_tags == expected
@@ -1,5 +1,6 @@
 # All tests require the database
 from datetime import timedelta
+from unittest.mock import patch
 from urllib.parse import urljoin
 
 from django.conf import settings
@@ -52,7 +53,9 @@ def test_no_reviews_have_confirmed_dates_emails_are_not_created(make_review):
     PHE_COMMUNICATIONS_EMAIL="comms@example.com",
     NOTIFY_TEMPLATE_CONSULTATION_OPEN="open template",
 )
-def test_reviews_have_confirmed_dates_in_the_past_emails_are_created(make_review):
+def test_reviews_have_confirmed_dates_in_the_past_emails_are_created(
+    keep_db_connection, make_review
+):
     target = make_review(
         consultation_start=get_today() - timedelta(days=1),
         dates_confirmed=True,
@@ -74,15 +77,15 @@ def test_reviews_have_confirmed_dates_in_the_past_emails_are_created(make_review
     assert Email.objects.filter(
         address=target_contacts[0].email,
         status=Email.STATUS.pending,
-        context=target.get_email_context(**{"recipient name": target_contacts[0].name}),
+        context={"recipient name": target_contacts[0].name},
+        batch__context=target.get_email_context(),
         template_id=settings.NOTIFY_TEMPLATE_CONSULTATION_OPEN,
     ).count() == len(target_contacts)
     assert Email.objects.filter(
         address=settings.PHE_COMMUNICATIONS_EMAIL,
         status=Email.STATUS.pending,
-        context=target.get_email_context(
-            **{"recipient name": settings.PHE_COMMUNICATIONS_NAME}
-        ),
+        context={"recipient name": settings.PHE_COMMUNICATIONS_NAME},
+        batch__context=target.get_email_context(),
         template_id=settings.NOTIFY_TEMPLATE_CONSULTATION_OPEN,
     ).exists()
 
@@ -92,7 +95,7 @@ def test_reviews_have_confirmed_dates_in_the_past_emails_are_created(make_review
     NOTIFY_TEMPLATE_SUBSCRIBER_CONSULTATION_OPEN="sub open template",
 )
 def test_open_review_conditions_have_subscribers_subs_receive_emails(
-    make_review, make_policy, make_subscription
+    keep_db_connection, make_review, make_policy, make_subscription
 ):
     open_policy, closed_policy = make_policy(_quantity=2)
     expected = make_subscription(policies=[open_policy])
@@ -116,11 +119,13 @@ def test_open_review_conditions_have_subscribers_subs_receive_emails(
     assert Email.objects.filter(
         address=expected.email,
         status=Email.STATUS.pending,
-        context=open_policy.get_email_context(
+        context={
+            "manage subscription url": urljoin(
+                settings.EMAIL_ROOT_DOMAIN, expected.management_url
+            )
+        },
+        batch__context=open_policy.get_email_context(
             **{
-                "manage subscription url": urljoin(
-                    settings.EMAIL_ROOT_DOMAIN, expected.management_url
-                ),
                 "subscribe url": urljoin(
                     settings.EMAIL_ROOT_DOMAIN, reverse("subscription:public-start")
                 ),
@@ -147,7 +152,7 @@ def test_no_reviews_have_been_published_no_emails_are_not_created(
     PHE_COMMUNICATIONS_EMAIL="comms@example.com",
     NOTIFY_TEMPLATE_DECISION_PUBLISHED="decision template",
 )
-def test_reviews_published_emails_are_created(make_review):
+def test_reviews_published_emails_are_created(keep_db_connection, make_review):
     target = make_review(published=True, add_stakeholders=True)
     make_review(published=False, add_stakeholders=True)
 
@@ -161,15 +166,15 @@ def test_reviews_published_emails_are_created(make_review):
     assert Email.objects.filter(
         address=target_contacts[0].email,
         status=Email.STATUS.pending,
-        context=target.get_email_context(**{"recipient name": target_contacts[0].name}),
+        context={"recipient name": target_contacts[0].name},
+        batch__context=target.get_email_context(),
         template_id=settings.NOTIFY_TEMPLATE_DECISION_PUBLISHED,
     ).count() == len(target_contacts)
     assert Email.objects.filter(
         address=settings.PHE_COMMUNICATIONS_EMAIL,
         status=Email.STATUS.pending,
-        context=target.get_email_context(
-            **{"recipient name": settings.PHE_COMMUNICATIONS_NAME}
-        ),
+        context={"recipient name": settings.PHE_COMMUNICATIONS_NAME},
+        batch__context=target.get_email_context(),
         template_id=settings.NOTIFY_TEMPLATE_DECISION_PUBLISHED,
     ).exists()
 
@@ -179,7 +184,7 @@ def test_reviews_published_emails_are_created(make_review):
     NOTIFY_TEMPLATE_SUBSCRIBER_DECISION_PUBLISHED="sub decision template",
 )
 def test_decided_review_conditions_have_subscribers_subs_receive_emails(
-    make_review, make_policy, make_subscription
+    keep_db_connection, make_review, make_policy, make_subscription
 ):
     published_policy, unpublished_policy = make_policy(_quantity=2)
     expected = make_subscription(policies=[published_policy])
@@ -196,13 +201,15 @@ def test_decided_review_conditions_have_subscribers_subs_receive_emails(
     assert Email.objects.filter(
         address=expected.email,
         status=Email.STATUS.pending,
-        context=published_policy.get_email_context(
+        context={
+            "manage subscription url": urljoin(
+                settings.EMAIL_ROOT_DOMAIN, expected.management_url
+            )
+        },
+        batch__context=published_policy.get_email_context(
             **{
                 "review manager full name": target_review.user.get_full_name(),
                 "consultation end date": "",
-                "manage subscription url": urljoin(
-                    settings.EMAIL_ROOT_DOMAIN, expected.management_url
-                ),
                 "subscribe url": urljoin(
                     settings.EMAIL_ROOT_DOMAIN, reverse("subscription:public-start")
                 ),
@@ -210,3 +217,75 @@ def test_decided_review_conditions_have_subscribers_subs_receive_emails(
         ),
         template_id=settings.NOTIFY_TEMPLATE_SUBSCRIBER_DECISION_PUBLISHED,
     ).exists()
+
+
+@override_settings(NOTIFY_FAN_OUT_CHUNK_SIZE=2)
+def test_subscriber_notifications_are_created_in_chunks_once_per_subscriber(
+    make_review, make_policy, make_subscription
+):
+    policy = make_policy()
+    review = make_review(policies=[policy])
+    subscriptions = [make_subscription(policies=[policy]) for _ in range(5)]
+
+    review.send_open_consultation_notifications()
+    review.send_open_consultation_notifications()
+
+    emails = review.open_consultation_notifications.filter(
+        template_id=settings.NOTIFY_TEMPLATE_SUBSCRIBER_CONSULTATION_OPEN
+    )
+    assert sorted(email.address for email in emails) == sorted(
+        sub.email for sub in subscriptions
+    )
+    for sub in subscriptions:
+        assert emails.get(address=sub.email).context[
+            "manage subscription url"
+        ] == urljoin(settings.EMAIL_ROOT_DOMAIN, sub.management_url)
+
+
+def test_subscriber_to_several_review_conditions_receives_one_email(
+    make_review, make_policy, make_subscription
+):
+    first_policy, second_policy = make_policy(_quantity=2)
+    subscription = make_subscription(policies=[first_policy, second_policy])
+    review = make_review(published=True, policies=[first_policy, second_policy])
+
+    review.send_decision_notifications()
+
+    assert (
+        review.decision_published_notifications.filter(
+            address=subscription.email
+        ).count()
+        == 1
+    )
+
+
+def test_stakeholder_contact_who_is_subscribed_receives_one_email(
+    make_review, make_subscription
+):
+    review = make_review(published=True, add_stakeholders=True)
+    contact = Contact.objects.get(stakeholder__reviews=review)
+    make_subscription(email=contact.email, policies=review.policies.all())
+
+    review.send_decision_notifications()
+
+    assert (
+        review.decision_published_notifications.filter(address=contact.email).count()
+        == 1
+    )
+
+
+def test_review_is_published___pages_are_warmed_before_notifications_are_created(
+    make_review, make_policy
+):
+    policy = make_policy()
+    make_review(published=True, policies=[policy], add_stakeholders=True)
+
+    def warm(policy_pks):
+        assert policy_pks == [policy.pk]
+        assert not Email.objects.exists()
+
+    with patch("nsc.review.tasks.warm_condition_pages", side_effect=warm) as warm_mock:
+        send_published_notifications()
+
+    warm_mock.assert_called_once()
+    assert Email.objects.exists()
@@ -0,0 +1,88 @@
+from django.utils.timezone import now
+
+import pytest
+from dateutil.relativedelta import relativedelta
+from freezegun import freeze_time
+
+from nsc.review.models import Review
+from nsc.review.tasks import update_review_statuses
+from nsc.utils.datetime import from_today
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def review(make_review):
+    return make_review(
+        dates_confirmed=True,
+        consultation_start=from_today(1),
+        consultation_end=from_today(30),
+    )
+
+
+def test_status_is_saved_with_the_review(review):
+    """
+    Test the status is calculated when the review is saved.
+    """
+    assert review.status == Review.STATUS.development
+
+    review.consultation_start = from_today(0)
+    review.save()
+    review.refresh_from_db()
+
+    assert review.status == Review.STATUS.in_consultation
+
+
+def test_consultation_starts__review_is_in_consultation(review):
+    """
+    Test reviews are moved into consultation on the consultation start date.
+    """
+    with freeze_time(now() + relativedelta(days=1)):
+        update_review_statuses()
+
+    review.refresh_from_db()
+    assert review.status == Review.STATUS.in_consultation
+
+
+def test_consultation_ends__review_is_post_consultation(review):
+    """
+    Test reviews are moved out of consultation after the consultation end date.
+    """
+    with freeze_time(now() + relativedelta(days=31)):
+        update_review_statuses()
+
+    review.refresh_from_db()
+    assert review.status == Review.STATUS.post_consultation
+
+
+def test_status_is_up_to_date__review_is_not_saved(review, django_assert_num_queries):
+    """
+    Test only the reviews whose consultation dates have passed are updated.
+    """
+    with django_assert_num_queries(1):
+        update_review_statuses()
+
+
+def test_documents_and_summaries_are_added__review_is_completed(
+    review_published, make_summary_draft
+):
+    """
+    Test the status is updated when the review's documents or summaries change.
+    """
+    review_published.review_type = [Review.TYPE.evidence]
+    review_published.save()
+    summary = make_summary_draft(
+        review=review_published, policy=review_published.policies.first()
+    )
+    review_published.refresh_from_db()
+    assert review_published.status != Review.STATUS.completed
+
+    summary.updated = True
+    summary.save()
+    review_published.refresh_from_db()
+    assert review_published.status == Review.STATUS.completed
+
+    review_published.cover_sheet.delete()
+    review_published.refresh_from_db()
+    assert review_published.status != Review.STATUS.completed
@@ -52,7 +52,8 @@ def test_review_is_created(erm_user, django_app):
     form["name"] = "Review"
     form["review_type"] = [Review.TYPE.evidence]
     form["policies-TOTAL_FORMS"] = 1
-    form["policies-0-policy"] = policy.pk
+    # only the selected option is rendered, the autocomplete adds the others
+    form["policies-0-policy"].force_value(policy.pk)
     response = form.submit().follow()
     review = response.context["object"]
 
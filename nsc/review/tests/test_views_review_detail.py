@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 import pytest
@@ -31,6 +33,17 @@ def test_view(response):
     assert response.status == "200 OK"
 
 
+def test_view__documents_are_fetched_once(url, erm_user, django_app):
+    """
+    Test the review's documents are fetched with a single query.
+    """
+    with CaptureQueriesContext(connection) as context:
+        django_app.get(url, user=erm_user)
+
+    queries = [q for q in context.captured_queries if "document_document" in q["sql"]]
+    assert len(queries) == 1
+
+
 def test_view__no_user(url, test_access_no_user):
     test_access_no_user(url=url)
 
@@ -8,6 +8,8 @@ import pytest
 
 # All tests require the database
 from nsc.document.models import Document
+from nsc.review.bundles import get_bundle_path
+from nsc.review.tasks import build_document_bundle
 
 
 pytestmark = pytest.mark.django_db
@@ -85,6 +87,11 @@ def test_multiple_files_for_type___response_is_zip_file(
     )
 
     assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/zip"
+    assert (
+        response.headers["Content-Disposition"]
+        == f'attachment; filename="{requested_type}.zip"'
+    )
 
     with TemporaryDirectory() as d:
         zip_path = path.join(d, "arch.zip")
@@ -97,3 +104,53 @@ def test_multiple_files_for_type___response_is_zip_file(
 
             with z.open(doc2.name) as second:
                 assert second.read() == doc2.upload.read()
+
+
+def test_bundle_is_built___response_is_bundle(
+    make_document, make_review, django_app, settings, tmp_path
+):
+    """
+    Test the bundle built for the documents is downloaded.
+    """
+    settings.MEDIA_ROOT = tmp_path
+    review = make_review()
+    documents = [
+        make_document(review=review, document_type=Document.TYPE.other)
+        for _ in range(2)
+    ]
+    build_document_bundle(review.pk, Document.TYPE.other)
+    bundle = get_bundle_path(review.pk, Document.TYPE.other, documents)
+    settings.DOCUMENT_DOWNLOAD_MODE = "accel"
+
+    response = django_app.get(
+        reverse(
+            "review:review-document-download",
+            kwargs={"slug": review.slug, "doc_type": Document.TYPE.other},
+        ),
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Accel-Redirect"] == f"/protected-media/media/{bundle}"
+    assert response.headers["Content-Disposition"] == 'attachment; filename="other.zip"'
+
+
+def test_multiple_files_not_modified___zip_is_not_sent(
+    make_document, make_review, django_app
+):
+    """
+    Test the zip is not sent again if the documents haven't changed since the
+    client downloaded it.
+    """
+    review = make_review()
+    make_document(review=review, document_type=Document.TYPE.other)
+    make_document(review=review, document_type=Document.TYPE.other)
+    url = reverse(
+        "review:review-document-download",
+        kwargs={"slug": review.slug, "doc_type": Document.TYPE.other},
+    )
+    etag = django_app.get(url).headers["ETag"]
+
+    response = django_app.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.body == b""
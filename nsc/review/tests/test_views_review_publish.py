@@ -1,3 +1,5 @@
+from unittest.mock import Mock, patch
+
 from django.urls import reverse
 
 import pytest
@@ -255,3 +257,48 @@ def test_response_is_yes_non_supporting_documents_arent_updated(
 
     doc.refresh_from_db()
     assert not doc.policies.exists()
+
+
+def test_response_is_yes_pages_are_warmed_once_committed(
+    erm_user, make_review, make_policy, client, django_capture_on_commit_callbacks
+):
+    first_policy = make_policy(name="first")
+    second_policy = make_policy(name="second")
+    review = make_review(policies=[first_policy, second_policy])
+
+    client.force_login(erm_user)
+    url = reverse("review:publish", kwargs={"slug": review.slug})
+    with patch("nsc.review.forms.warm_condition_pages") as warm_mock:
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(url, data={"published": True}, follow=True)
+
+    warm_mock.delay.assert_called_once()
+    assert sorted(warm_mock.delay.call_args.args[0]) == sorted(
+        [first_policy.pk, second_policy.pk]
+    )
+
+
+def test_response_is_yes_pages_are_warmed_after_they_are_invalidated(
+    erm_user, make_review, make_policy, client, django_capture_on_commit_callbacks
+):
+    """
+    Test the pages are warmed after the cached pages are marked as stale, so the
+    warmed pages aren't invalidated straight away.
+    """
+    review = make_review(policies=[make_policy()])
+    calls = Mock()
+
+    client.force_login(erm_user)
+    url = reverse("review:publish", kwargs={"slug": review.slug})
+    with patch("nsc.review.forms.warm_condition_pages") as warm_mock, patch(
+        "nsc.signals.invalidate_cache_tags"
+    ) as invalidate_mock:
+        calls.attach_mock(warm_mock.delay, "warm")
+        calls.attach_mock(invalidate_mock, "invalidate")
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(url, data={"published": True}, follow=True)
+
+    names = [name for name, args, kwargs in calls.mock_calls]
+    assert "warm" in names
+    assert "invalidate" in names[: names.index("warm")]
+    assert "invalidate" not in names[names.index("warm") :]
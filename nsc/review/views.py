@@ -1,17 +1,23 @@
-from os import path
-from tempfile import TemporaryDirectory
-from zipfile import ZipFile
-
-from django.http import FileResponse, Http404
+from django.core.files.storage import default_storage
+from django.http import Http404, StreamingHttpResponse
 from django.urls import reverse, reverse_lazy
+from django.utils.http import content_disposition_header, quote_etag
 from django.utils.translation import gettext_lazy as _
 from django.views import generic
 
 from nsc.permissions import ReviewManagerRequiredMixin
 from nsc.policy.models import Policy
 from nsc.utils.datetime import get_today
+from nsc.utils.files import (
+    conditional_response,
+    download_response,
+    iter_file_chunks,
+    set_validators,
+    stream_zip,
+)
 
 from ..document.models import Document
+from .bundles import get_bundle_hash, get_bundle_path
 from .forms import (
     ReviewDateConfirmationForm,
     ReviewDatesForm,
@@ -32,6 +38,7 @@ class ReviewDashboardView(ReviewManagerRequiredMixin, generic.TemplateView):
         reviews = (
             Review.objects.in_progress()
             .select_related("user")
+            .with_documents()
             .filter(user=self.request.user)
         )
         return super().get_context_data(reviews=reviews)
@@ -41,7 +48,7 @@ class ReviewList(ReviewManagerRequiredMixin, generic.TemplateView):
     template_name = "review/review_list.html"
 
     def get_context_data(self, **kwargs):
-        reviews = Review.objects.in_progress().select_related("user")
+        reviews = Review.objects.in_progress().select_related("user").with_documents()
         return super().get_context_data(reviews=reviews)
 
 
@@ -176,21 +183,54 @@ class ReviewDocumentDownload(generic.DetailView):
     model = Review
     lookup_field = "slug"
 
-    def get(self, *args, doc_type=None, **kwargs):
-        documents = Document.objects.for_review(self.get_object()).filter(
-            document_type=doc_type
+    def get(self, request, *args, doc_type=None, **kwargs):
+        review = self.get_object()
+        documents = list(
+            Document.objects.for_review(review)
+            .downloadable()
+            .filter(document_type=doc_type)
         )
 
         if len(documents) == 0:
             raise Http404()
         elif len(documents) == 1:
-            return FileResponse(documents[0].upload, as_attachment=True)
-        else:
-            with TemporaryDirectory() as d:
-                zipfile_path = path.join(d, f"{doc_type}.zip")
-
-                with ZipFile(zipfile_path, mode="w") as z:
-                    for doc in documents:
-                        z.writestr(doc.name, doc.upload.read())
-
-                return FileResponse(open(zipfile_path, "rb"), as_attachment=True)
+            document = documents[0]
+            return download_response(
+                request,
+                document.upload.storage,
+                document.upload.name,
+                etag=document.etag,
+                last_modified=document.last_modified,
+            )
+
+        etag = quote_etag(get_bundle_hash(documents))
+        last_modified = max(doc.last_modified for doc in documents)
+
+        # the bundle is built when the documents change, if it hasn't been
+        # built yet the zip is sent as each document is read from storage
+        bundle = get_bundle_path(review.pk, doc_type, documents)
+        if default_storage.exists(bundle):
+            return download_response(
+                request,
+                default_storage,
+                bundle,
+                f"{doc_type}.zip",
+                etag=etag,
+                last_modified=last_modified,
+            )
+
+        response = conditional_response(request, etag, last_modified)
+        if response is None:
+            response = StreamingHttpResponse(
+                stream_zip(
+                    (doc.name, iter_file_chunks(doc.upload)) for doc in documents
+                ),
+                content_type="application/zip",
+                headers={
+                    "Content-Disposition": content_disposition_header(
+                        True, f"{doc_type}.zip"
+                    )
+                },
+            )
+            set_validators(response, etag, last_modified)
+        return response
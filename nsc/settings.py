@@ -151,6 +151,7 @@ class Common(Configuration):
         "django_auth_adfs",
         "whitenoise.runserver_nostatic",
         "django.contrib.staticfiles",
+        "django.contrib.postgres",
         "django_extensions",
         "clear_cache",
         "simple_history",
@@ -172,9 +173,9 @@ class Common(Configuration):
         "django.middleware.security.SecurityMiddleware",
         "whitenoise.middleware.WhiteNoiseMiddleware",
         "django.contrib.sessions.middleware.SessionMiddleware",
-        "django.middleware.cache.UpdateCacheMiddleware",
+        "nsc.utils.cache.TaggedUpdateCacheMiddleware",
         "django.middleware.common.CommonMiddleware",
-        "django.middleware.cache.FetchFromCacheMiddleware",
+        "nsc.utils.cache.TaggedFetchFromCacheMiddleware",
         "django.middleware.csrf.CsrfViewMiddleware",
         "django.contrib.auth.middleware.AuthenticationMiddleware",
         "django.contrib.messages.middleware.MessageMiddleware",
@@ -221,6 +222,9 @@ class Common(Configuration):
     CLAMAV_PORT = get_env("CLAMAV_PORT", default=3310, cast=int)
     CLAMAV_TIMEOUT = get_env("CLAMAV_TIMEOUT", default=10, cast=int)
 
+    # Uploads still waiting to be scanned after this many minutes are queued again
+    VIRUS_SCAN_RETRY_MINUTES = 10
+
     @property
     def DATABASES(self):
         """
@@ -243,9 +247,34 @@ class Common(Configuration):
             "default": {
                 "BACKEND": "django_redis.cache.RedisCache",
                 "LOCATION": f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0",  # noqa: E231
-            }
+            },
+            "ratelimit": {
+                "BACKEND": "django_redis.cache.RedisCache",
+                "LOCATION": f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/3",  # noqa: E231
+            },
         }
 
+    # Rate limit counters are kept apart from the page cache so clearing or
+    # evicting pages never resets them
+    RATE_LIMIT_CACHE_ALIAS = "ratelimit"
+
+    # Pages are fresh for CACHE_MIDDLEWARE_SECONDS then kept for a further
+    # PAGE_CACHE_STALE_SECONDS so they can be served while a single request,
+    # holding the lock for up to PAGE_CACHE_LOCK_SECONDS, renders them again.
+    # Requests for a page which isn't cached wait up to
+    # PAGE_CACHE_LOCK_WAIT_SECONDS for it to be rendered.
+    CACHE_MIDDLEWARE_SECONDS = 600
+    PAGE_CACHE_STALE_SECONDS = 60 * 60 * 24
+    PAGE_CACHE_LOCK_SECONDS = 30
+    PAGE_CACHE_LOCK_WAIT_SECONDS = 5
+
+    # The number of pages of the condition list rendered when the cache is
+    # warmed after a review is published
+    CACHE_WARM_LIST_PAGES = 3
+
+    # The maximum number of matches returned by the autocomplete endpoints
+    AUTOCOMPLETE_LIMIT = 10
+
     # Password validation
     # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
     AUTH_PASSWORD_VALIDATORS = [
@@ -274,6 +303,25 @@ class Common(Configuration):
     MEDIA_URL = "/media/"
     MEDIA_ROOT = BASE_DIR / "media"
 
+    # How uploaded documents are downloaded: "proxy" sends the file from django,
+    # "presigned" redirects to a signed storage url which expires after
+    # DOCUMENT_DOWNLOAD_URL_EXPIRY seconds and "accel" tells nginx to send the
+    # file from DOCUMENT_DOWNLOAD_ACCEL_LOCATION with X-Accel-Redirect.
+    DOCUMENT_DOWNLOAD_MODE = get_env("DOCUMENT_DOWNLOAD_MODE", default="proxy")
+    DOCUMENT_DOWNLOAD_URL_EXPIRY = get_env(
+        "DOCUMENT_DOWNLOAD_URL_EXPIRY", default=60, cast=int
+    )
+    DOCUMENT_DOWNLOAD_ACCEL_LOCATION = get_env(
+        "DOCUMENT_DOWNLOAD_ACCEL_LOCATION", default="/protected-media/"
+    )
+
+    # Only one task at a time builds the bundles of a review's documents of a
+    # type. The lock expires after DOCUMENT_BUNDLE_LOCK_SECONDS in case a worker
+    # dies, a task which can't take it runs again after
+    # DOCUMENT_BUNDLE_RETRY_SECONDS.
+    DOCUMENT_BUNDLE_LOCK_SECONDS = 30 * 60
+    DOCUMENT_BUNDLE_RETRY_SECONDS = 60
+
     # Additional locations of static files
     STATICFILES_DIRS = [BASE_DIR / "frontend" / "dist"]
 
@@ -393,6 +441,27 @@ class Common(Configuration):
         "NOTIFY_TEMPLATE_HELP_DESK_CONFIRMATION", default=None
     )
     NOTIFY_STALE_MINUTES = 5
+    # Notify allows 3000 messages a minute, these are sent in batches with each
+    # batch spread over a pool of worker threads
+    NOTIFY_SEND_LIMIT = 3000
+    NOTIFY_SEND_BATCH_SIZE = 100
+    NOTIFY_SEND_WORKERS = get_env("NOTIFY_SEND_WORKERS", default=10, cast=int)
+    # How long a worker holds the claim on a batch of emails before they can be
+    # picked up by another worker
+    NOTIFY_CLAIM_LEASE_SECONDS = 300
+    # Requests to notify (sending emails and checking their status) from every
+    # worker are limited to NOTIFY_RATE_LIMIT per NOTIFY_RATE_LIMIT_PERIOD seconds
+    NOTIFY_RATE_LIMIT = get_env("NOTIFY_RATE_LIMIT", default=3000, cast=int)
+    NOTIFY_RATE_LIMIT_PERIOD = 60
+    # Emails which fail to send are retried after an exponential backoff, starting
+    # at NOTIFY_RETRY_BASE_SECONDS up to a maximum of NOTIFY_RETRY_MAX_SECONDS
+    NOTIFY_RETRY_BASE_SECONDS = 60
+    NOTIFY_RETRY_MAX_SECONDS = 6 * 60 * 60
+    # Emails which are done are moved to the archive after NOTIFY_ARCHIVE_DAYS
+    NOTIFY_ARCHIVE_DAYS = get_env("NOTIFY_ARCHIVE_DAYS", default=90, cast=int)
+    NOTIFY_ARCHIVE_BATCH_SIZE = 1000
+    # Notifications for subscribers are created in chunks of this size
+    NOTIFY_FAN_OUT_CHUNK_SIZE = 1000
 
     # Tracking
     GTM_PROPERTY_ID = get_secret(
@@ -421,6 +490,10 @@ class Common(Configuration):
             "task": "nsc.notify.tasks.update_stale_email_statuses",
             "schedule": crontab(minute=f"*/{NOTIFY_STALE_MINUTES}"),
         },
+        "archive-emails": {
+            "task": "nsc.notify.tasks.archive_emails",
+            "schedule": crontab(hour=2, minute=0),
+        },
         "send-open-review-notifications": {
             "task": "nsc.review.tasks.send_open_review_notifications",
             "schedule": crontab(minute="*"),
@@ -429,6 +502,18 @@ class Common(Configuration):
             "task": "nsc.review.tasks.send_published_notifications",
             "schedule": crontab(minute="*"),
         },
+        "update-review-statuses": {
+            "task": "nsc.review.tasks.update_review_statuses",
+            "schedule": crontab(hour=0, minute=5),
+        },
+        "refresh-condition-listing": {
+            "task": "nsc.condition.tasks.refresh_condition_listing",
+            "schedule": crontab(hour=0, minute=10),
+        },
+        "scan-pending-documents": {
+            "task": "nsc.document.tasks.scan_pending_documents",
+            "schedule": crontab(minute=f"*/{VIRUS_SCAN_RETRY_MINUTES}"),
+        },
     }
 
     # This is the URL for the National Screening Committee where members of
@@ -595,7 +680,10 @@ class Test(Dev):
     CACHES = {
         "default": {
             "BACKEND": "django.core.cache.backends.dummy.DummyCache",
-        }
+        },
+        "ratelimit": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
     }
 
 
@@ -723,6 +811,15 @@ class Deployed(Build):
                     "PARSER_CLASS": "redis.connection.HiredisParser",
                 },
             },
+            "ratelimit": {
+                "BACKEND": "django_redis.cache.RedisCache",
+                "LOCATION": f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/3",  # noqa
+                "KEY_PREFIX": "{}_".format(self.PROJECT_ENVIRONMENT_SLUG),
+                "OPTIONS": {
+                    "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                    "PARSER_CLASS": "redis.connection.HiredisParser",
+                },
+            },
         }
 
     SESSION_ENGINE = "django.contrib.sessions.backends.cache"
@@ -819,10 +916,28 @@ class Demo(Build):
                     # See https://niwinz.github.io/django-redis/latest/#_memcached_exceptions_behavior
                     # 'IGNORE_EXCEPTIONS': True,
                 },
-            }
+            },
+            "session": {
+                "BACKEND": "django_redis.cache.RedisCache",
+                "LOCATION": f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/2",  # noqa
+                "KEY_PREFIX": "{}_".format(self.PROJECT_ENVIRONMENT_SLUG),
+                "OPTIONS": {
+                    "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                    "PARSER_CLASS": "redis.connection.HiredisParser",
+                },
+            },
+            "ratelimit": {
+                "BACKEND": "django_redis.cache.RedisCache",
+                "LOCATION": f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/3",  # noqa
+                "KEY_PREFIX": "{}_".format(self.PROJECT_ENVIRONMENT_SLUG),
+                "OPTIONS": {
+                    "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                    "PARSER_CLASS": "redis.connection.HiredisParser",
+                },
+            },
         }
 
     SESSION_ENGINE = "django.contrib.sessions.backends.cache"
-    SESSION_CACHE_ALIAS = "default"
+    SESSION_CACHE_ALIAS = "session"
 
     COMPRESS_OUTPUT_DIR = ""
@@ -1,5 +1,50 @@
-from django.core.cache import cache
+from django.db import transaction
 
+from nsc.utils.cache import invalidate_cache_tags
 
-def clear_cache(*args, **kwargs):
-    cache.clear()
+
+def invalidate_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached pages showing the instance once the change has been
+    committed. The tags are collected again after the commit to include any
+    relations added after the instance was saved, e.g. a new review's policies.
+    """
+    if kwargs.get("action", "post_").startswith("pre_"):
+        return
+
+    tags = instance.get_cache_tags()
+    transaction.on_commit(
+        lambda: invalidate_cache_tags(*tags, *instance.get_cache_tags())
+    )
+
+
+def invalidate_deleted_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached pages showing the instance once it has been deleted,
+    the tags are collected before the delete while its relations still exist.
+    """
+    tags = instance.get_cache_tags()
+    transaction.on_commit(lambda: invalidate_cache_tags(*tags))
+
+
+def schedule_document_bundle(sender, instance, **kwargs):
+    """
+    Rebuild the zip of the review's documents of the same type as the document
+    once the change has been committed.
+    """
+    from nsc.review.tasks import build_document_bundle
+
+    if instance.review_id:
+        review_pk, doc_type = instance.review_id, instance.document_type
+        transaction.on_commit(lambda: build_document_bundle.delay(review_pk, doc_type))
+
+
+def schedule_virus_scan(sender, instance, **kwargs):
+    """
+    Scan a new upload for viruses once it has been committed.
+    """
+    from nsc.document.tasks import scan_document
+
+    if instance.scan_status == instance.SCAN_STATUS.pending_scan:
+        pk = instance.pk
+        transaction.on_commit(lambda: scan_document.delay(pk))
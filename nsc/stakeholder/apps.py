@@ -1,8 +1,8 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
 
-from nsc.signals import clear_cache
+from nsc.signals import invalidate_cache, invalidate_deleted_cache
 
 
 class StakeholderConfig(AppConfig):
@@ -11,5 +11,6 @@ class StakeholderConfig(AppConfig):
     def ready(self):
         from nsc.stakeholder.models import Stakeholder
 
-        receiver(post_save, sender=Stakeholder)(clear_cache)
-        receiver(post_delete, sender=Stakeholder)(clear_cache)
+        receiver(post_save, sender=Stakeholder)(invalidate_cache)
+        receiver(pre_delete, sender=Stakeholder)(invalidate_deleted_cache)
+        receiver(m2m_changed, sender=Stakeholder.policies.through)(invalidate_cache)
@@ -5,7 +5,7 @@ from django.utils.translation import gettext_lazy as _
 
 from ..contact.formsets import ContactFormSet
 from ..policy.formsets import PolicySelectionFormset
-from ..policy.models import Policy
+from ..utils.forms import AutocompleteSelect
 from .models import Stakeholder
 
 
@@ -33,13 +33,6 @@ class SearchForm(forms.Form):
         choices=(("", ""),) + Stakeholder.COUNTRY_CHOICES,
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        self["condition"].choices = list(
-            Policy.objects.values_list("name", flat=True).distinct()
-        )
-
 
 class StakeholderForm(forms.ModelForm):
     """Form for adding and editing a Stakeholder.
@@ -135,7 +128,10 @@ class StakeholderForm(forms.ModelForm):
 
 
 class StakeholderSelectionForm(forms.Form):
-    stakeholder = forms.ModelChoiceField(Stakeholder.objects.none())
+    stakeholder = forms.ModelChoiceField(
+        Stakeholder.objects.none(),
+        widget=AutocompleteSelect("stakeholder:autocomplete"),
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
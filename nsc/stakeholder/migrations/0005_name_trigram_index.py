@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:41
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("policy", "0008_name_trigram_index"),
+        ("stakeholder", "0004_auto_20210511_1311"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="stakeholder",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="stakeholder_name_trgm_idx",
+            ),
+        ),
+    ]
@@ -1,5 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
 from django.db.models import QuerySet
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
@@ -8,6 +10,7 @@ from django_extensions.db.models import TimeStampedModel
 from simple_history.models import HistoricalRecords
 
 from nsc.utils.forms import ChoiceArrayField
+from nsc.utils.search import autocomplete
 
 
 class StakeholderQuerySet(QuerySet):
@@ -17,6 +20,9 @@ class StakeholderQuerySet(QuerySet):
             qs = qs.filter(policies=policy)
         return qs
 
+    def autocomplete(self, term):
+        return autocomplete(self, term)
+
 
 class Stakeholder(TimeStampedModel):
     TYPE_PROFESSIONAL = "PROFESSIONAL"
@@ -92,10 +98,22 @@ class Stakeholder(TimeStampedModel):
     class Meta:
         ordering = ("name", "pk")
         verbose_name_plural = _("stakeholders")
+        indexes = [
+            # see nsc.utils.search.autocomplete
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="stakeholder_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def get_cache_tags(self):
+        return [
+            tag for policy in self.policies.all() for tag in policy.get_cache_tags()
+        ]
+
     def get_detail_url(self):
         return reverse("stakeholder:detail", kwargs={"pk": self.pk})
 
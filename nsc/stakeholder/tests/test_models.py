@@ -1,5 +1,3 @@
-from django.core.cache import cache
-
 import pytest
 from model_bakery import baker
 
@@ -43,19 +41,24 @@ def test_public_stakeholders_for_policy(make_stakeholder):
     assert expected == actual
 
 
-def test_stakeholder_is_saved___cache_is_cleared(make_stakeholder):
-    cache.set("foo", "bar")
-
-    make_stakeholder()
+def test_stakeholder_is_saved___cache_is_invalidated(
+    make_stakeholder, invalidated_cache_tags, django_capture_on_commit_callbacks
+):
+    policy = baker.make(Policy)
 
-    assert cache.get("foo") is None
+    with django_capture_on_commit_callbacks(execute=True):
+        make_stakeholder(policies=[policy])
 
+    assert invalidated_cache_tags == set(policy.get_cache_tags())
 
-def test_stakeholder_is_deleted___cache_is_cleared(make_stakeholder):
-    stakeholder = make_stakeholder()
 
-    cache.set("foo", "bar")
+def test_stakeholder_is_deleted___cache_is_invalidated(
+    make_stakeholder, invalidated_cache_tags, django_capture_on_commit_callbacks
+):
+    policy = baker.make(Policy)
+    stakeholder = make_stakeholder(policies=[policy])
 
-    stakeholder.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        stakeholder.delete()
 
-    assert cache.get("foo") is None
+    assert invalidated_cache_tags == set(policy.get_cache_tags())
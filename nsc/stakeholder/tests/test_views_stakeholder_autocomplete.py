@@ -0,0 +1,39 @@
+from django.urls import reverse
+
+import pytest
+from model_bakery import baker
+
+from ..models import Stakeholder
+
+
+# All tests require the database
+pytestmark = pytest.mark.django_db
+
+autocomplete_url = reverse("stakeholder:autocomplete")
+
+
+def test_autocomplete__no_user(test_access_no_user):
+    test_access_no_user(url=autocomplete_url)
+
+
+def test_autocomplete__incorrect_permission(test_access_forbidden):
+    test_access_forbidden(url=autocomplete_url)
+
+
+def test_autocomplete(erm_user, django_app):
+    """
+    Test the stakeholders starting with the term are listed before the
+    similar matches.
+    """
+    society = baker.make(Stakeholder, name="British Cardiac Society")
+    charity = baker.make(Stakeholder, name="Cardiomyopathy UK")
+    baker.make(Stakeholder, name="Patient Group")
+
+    response = django_app.get(autocomplete_url, {"q": "cardi"}, user=erm_user)
+
+    assert response.json == {
+        "results": [
+            {"id": charity.pk, "name": charity.name},
+            {"id": society.pk, "name": society.name},
+        ]
+    }
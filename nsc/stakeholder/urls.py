@@ -2,6 +2,7 @@ from django.urls import path
 
 from .views import (
     StakeholderAdd,
+    StakeholderAutocomplete,
     StakeholderDelete,
     StakeholderDetail,
     StakeholderEdit,
@@ -13,6 +14,7 @@ from .views import (
 urlpatterns = [
     path(r"", StakeholderList.as_view(), name="list"),
     path(r"export/", StakeholderExport.as_view(), name="export"),
+    path(r"autocomplete/", StakeholderAutocomplete.as_view(), name="autocomplete"),
     path(r"add/", StakeholderAdd.as_view(), name="add"),
     path(r"<int:pk>/", StakeholderDetail.as_view(), name="detail"),
     path(r"<int:pk>/delete/", StakeholderDelete.as_view(), name="delete"),
@@ -8,6 +8,7 @@ from django.utils.translation import gettext_lazy as _
 from django.views import generic
 from django.views.generic import FormView
 
+from nsc.mixins.autocompletemixin import AutocompleteMixin
 from nsc.permissions import ReviewManagerRequiredMixin
 from nsc.utils.datetime import get_today
 
@@ -30,6 +31,12 @@ class StakeholderFilterMixin:
         return SearchFilter(self.request.GET, queryset=self.queryset).qs
 
 
+class StakeholderAutocomplete(
+    ReviewManagerRequiredMixin, AutocompleteMixin, generic.View
+):
+    model = Stakeholder
+
+
 class StakeholderList(
     ReviewManagerRequiredMixin, StakeholderFilterMixin, generic.ListView
 ):
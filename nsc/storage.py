@@ -1,4 +1,7 @@
+from django.utils.http import content_disposition_header
+
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 
 
 class MediaStorage(S3Boto3Storage):
@@ -12,3 +15,33 @@ class MediaStorage(S3Boto3Storage):
 
     location = "media"
     file_overwrite = False
+
+    def iter_chunks(self, name, chunk_size, start=0, end=None):
+        """
+        Read a file from the bucket in chunks as it is downloaded, opening the
+        file downloads all of it before the first read returns. A part of the
+        file, from ``start`` to ``end`` inclusive, is fetched with a ranged get.
+        """
+        obj = self.bucket.Object(self._normalize_name(clean_name(name)))
+        params = {}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        yield from obj.get(**params)["Body"].iter_chunks(chunk_size)
+
+    def get_presigned_url(self, name, filename, expire):
+        """
+        Get a url to download a file from the bucket which expires after
+        ``expire`` seconds, files are otherwise served through the bucket proxy
+        without a signature (AWS_QUERYSTRING_AUTH is off).
+        """
+        return self.bucket.meta.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket.name,
+                "Key": self._normalize_name(clean_name(name)),
+                "ResponseContentDisposition": content_disposition_header(
+                    True, filename
+                ),
+            },
+            ExpiresIn=expire,
+        )
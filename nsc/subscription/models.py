@@ -16,9 +16,16 @@ class Subscription(TimeStampedModel):
 
     @property
     def management_url(self):
+        return self.get_management_url()
+
+    def get_management_url(self, signer=None):
+        """
+        Get the url for managing the subscription, pass a ``signer`` to reuse it
+        when building the urls for many subscriptions.
+        """
         return reverse(
             "subscription:public-manage",
-            kwargs={"pk": self.pk, "token": get_object_signature(self)},
+            kwargs={"pk": self.pk, "token": get_object_signature(self, signer)},
         )
 
 
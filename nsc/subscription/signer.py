@@ -5,8 +5,8 @@ def get_value_to_sign(obj):
     return str(obj.id)
 
 
-def get_object_signature(obj):
-    signer = Signer()
+def get_object_signature(obj, signer=None):
+    signer = signer or Signer()
     return signer.signature(get_value_to_sign(obj))
 
 
@@ -1,8 +1,12 @@
+from unittest.mock import Mock, patch
+
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 
 import pytest
 
+from nsc.mixins.ratelimitmixin import increment_hit_count
 from nsc.notify.models import Email
 
 
@@ -116,3 +120,37 @@ def test_data_is_valid_email_is_created(form, valid_data):
         context=valid_data,
     )
     assert res.location == reverse("support:complete") + "#"
+
+
+@patch("nsc.mixins.ratelimitmixin.RATE_LIMIT_THRESHOLD", 1)
+def test_form_is_submitted_too_many_times___rate_limit_is_exceeded(django_app):
+    first = django_app.get(reverse("support:contact")).forms[1].submit()
+    second = django_app.get(reverse("support:contact")).forms[1].submit(status=429)
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+
+
+@patch("nsc.mixins.ratelimitmixin.RATE_LIMIT_THRESHOLD", 1)
+def test_page_cache_is_cleared___hit_count_is_kept(django_app):
+    django_app.get(reverse("support:contact")).forms[1].submit()
+    cache.clear()
+    res = django_app.get(reverse("support:contact")).forms[1].submit(status=429)
+
+    assert res.status_code == 429
+
+
+def test_cache_is_redis___counter_is_created_and_incremented_in_one_transaction():
+    connection = Mock()
+    connection.pipeline.return_value.execute.return_value = [None, 3]
+
+    with patch(
+        "nsc.mixins.ratelimitmixin.get_redis_connection", return_value=connection
+    ):
+        assert increment_hit_count("key") == 3
+
+    pipeline = connection.pipeline.return_value
+    pipeline.set.assert_called_once_with(
+        ":1:key", 0, ex=settings.RATE_LIMIT_HIT_COUNT_TTL, nx=True
+    )
+    pipeline.incr.assert_called_once_with(":1:key")
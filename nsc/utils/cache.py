@@ -0,0 +1,194 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.middleware.cache import FetchFromCacheMiddleware, UpdateCacheMiddleware
+from django.utils.cache import get_cache_key, get_max_age, has_vary_header
+
+
+# Pages which don't record what they depend on are invalidated by every change.
+DEFAULT_CACHE_TAG = "site"
+
+
+def get_cache_tag(obj):
+    """
+    Get the tag for a model instance, or for a model class to tag pages which
+    list its instances.
+    """
+    if isinstance(obj, type):
+        return obj._meta.label_lower
+    return f"{obj._meta.label_lower}:{obj.pk}"
+
+
+def get_tag_key(tag):
+    return f"cache-tag:{tag}"
+
+
+def add_cache_tags(request, *tags):
+    """
+    Record that the page being rendered for the request depends on the tagged
+    objects, the cached page is only invalidated when one of them changes.
+    """
+    request.cache_tags = getattr(request, "cache_tags", set()) | set(tags)
+
+
+def invalidate_cache_tags(*tags):
+    """
+    Mark every cached page which depends on one of the tags as stale. The time
+    of the change is stored against each tag, rather than deleting the pages,
+    so a page which was being rendered while the change was made is also stale.
+    """
+    timestamp = time.time()
+    caches[settings.CACHE_MIDDLEWARE_ALIAS].set_many(
+        {get_tag_key(tag): timestamp for tag in {DEFAULT_CACHE_TAG, *tags}},
+        timeout=None,
+    )
+
+
+def get_lock_key(cache_key):
+    return f"cache-lock:{cache_key}"
+
+
+def get_uncacheable_key(cache_key):
+    return f"cache-uncacheable:{cache_key}"
+
+
+class StaleCache:
+    """
+    Wraps the page cache so pages are kept for PAGE_CACHE_STALE_SECONDS after
+    they expire, they can then be served while the page is rendered again.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+    def set(self, key, value, timeout=None):
+        self._cache.set(key, value, timeout + settings.PAGE_CACHE_STALE_SECONDS)
+
+
+class TaggedUpdateCacheMiddleware(UpdateCacheMiddleware):
+    """
+    Store the tags a page depends on and when it was rendered with the cached
+    response, see ``TaggedFetchFromCacheMiddleware``.
+    """
+
+    @property
+    def cache(self):
+        return StaleCache(super().cache)
+
+    def process_response(self, request, response):
+        lock_key = getattr(request, "cache_lock", None)
+        if lock_key and not self.is_cacheable(request, response):
+            # let requests waiting for the page know it won't be cached, so
+            # they render it rather than waiting for the lock
+            super().cache.set(
+                get_uncacheable_key(request.cache_key), 1, timeout=self.cache_timeout
+            )
+
+        if self._should_update_cache(request, response):
+            response.cache_tags = getattr(request, "cache_tags", None) or {
+                DEFAULT_CACHE_TAG
+            }
+            response.cache_created = request.cache_started
+
+        try:
+            return super().process_response(request, response)
+        finally:
+            if lock_key:
+                super().cache.delete(lock_key)
+
+    def is_cacheable(self, request, response):
+        """
+        Whether ``UpdateCacheMiddleware`` will store the response, the checks
+        made by ``process_response``.
+        """
+        return (
+            self._should_update_cache(request, response)
+            and not response.streaming
+            and response.status_code == 200
+            and not (
+                not request.COOKIES
+                and response.cookies
+                and has_vary_header(response, "Cookie")
+            )
+            and "private" not in response.get("Cache-Control", ())
+            and get_max_age(response) != 0
+        )
+
+
+class TaggedFetchFromCacheMiddleware(FetchFromCacheMiddleware):
+    """
+    Fetch pages from the cache, a page is stale if it has expired or any of the
+    tags it depends on have been invalidated since it was rendered.
+
+    Only one request renders a page, for each cache key, at a time. While a
+    stale page is being rendered other requests are given the stale page, if
+    there is no page they wait up to PAGE_CACHE_LOCK_WAIT_SECONDS for it to be
+    rendered rather than all rendering it at once. Requests don't wait for a page
+    which has never been cached, or which the last render found can't be cached.
+    """
+
+    def process_request(self, request):
+        request.cache_started = time.time()
+
+        response = super().process_request(request)
+        if response is None and request._cache_update_cache:
+            response = self.wait_for_page(request)
+        if response is None or not self.is_stale(response):
+            return response
+
+        if not self.lock(request):
+            return response
+
+        # the page will be rendered so let UpdateCacheMiddleware replace it
+        request._cache_update_cache = True
+        return None
+
+    def lock(self, request):
+        """
+        Take the lock to render the page, returns whether the page should be
+        rendered. The lock is per cache key, pages which can't be cached, or
+        whose headers haven't been learnt yet, are rendered without the lock.
+        """
+        request.cache_lock = None
+        request.cache_key = get_cache_key(
+            request, self.key_prefix, "GET", cache=self.cache
+        )
+        if request.cache_key is None or self.cache.get(
+            get_uncacheable_key(request.cache_key)
+        ):
+            return True
+
+        lock_key = get_lock_key(request.cache_key)
+        if self.cache.add(lock_key, 1, timeout=settings.PAGE_CACHE_LOCK_SECONDS):
+            request.cache_lock = lock_key
+            return True
+        return False
+
+    def wait_for_page(self, request):
+        """
+        Take the lock to render a page which isn't cached, or wait for it to be
+        rendered by the request holding the lock.
+        """
+        deadline = time.monotonic() + settings.PAGE_CACHE_LOCK_WAIT_SECONDS
+        while not self.lock(request) and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+            response = super().process_request(request)
+            if response is not None:
+                return response
+
+        request._cache_update_cache = True
+        return None
+
+    def is_stale(self, response):
+        created = getattr(response, "cache_created", 0)
+        if created + (get_max_age(response) or 0) <= time.time():
+            return True
+
+        tags = getattr(response, "cache_tags", {DEFAULT_CACHE_TAG})
+        invalidated = self.cache.get_many([get_tag_key(tag) for tag in tags])
+        return any(timestamp >= created for timestamp in invalidated.values())
@@ -0,0 +1,214 @@
+import mimetypes
+import posixpath
+import re
+from urllib.parse import urlparse
+from zipfile import ZipFile
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+)
+
+
+# Files are sent in blocks of this size so the memory used by a download does
+# not depend on the size of the files.
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def iter_stored_chunks(storage, name, chunk_size=CHUNK_SIZE, start=0, end=None):
+    """
+    Read a stored file, or the bytes from ``start`` to ``end`` inclusive, in
+    chunks. The storage reads the file directly if it can stream it (see
+    ``nsc.storage.MediaStorage``).
+    """
+    if hasattr(storage, "iter_chunks"):
+        yield from storage.iter_chunks(name, chunk_size, start, end)
+        return
+
+    remaining = None if end is None else end - start + 1
+    with storage.open(name, "rb") as file:
+        file.seek(start)
+        while remaining is None or remaining > 0:
+            chunk = file.read(
+                chunk_size if remaining is None else min(chunk_size, remaining)
+            )
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def iter_file_chunks(file, chunk_size=CHUNK_SIZE):
+    return iter_stored_chunks(file.storage, file.name, chunk_size)
+
+
+class ZipStream:
+    """
+    The file written to by ``stream_zip``. It can't seek so the zip is written
+    in order, with the size of each entry after its data, and the bytes written
+    are kept until they are sent.
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        parts, self.parts = self.parts, []
+        return parts
+
+
+def stream_zip(files):
+    """
+    Generate a zip of ``files``, pairs of the name and an iterable of the
+    contents in chunks, a chunk at a time. Nothing is buffered beyond the
+    chunk being written so a response can start before the files are read.
+    """
+    stream = ZipStream()
+    with ZipFile(stream, mode="w") as archive:
+        for name, chunks in files:
+            with archive.open(name, mode="w") as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    yield from stream.pop()
+            yield from stream.pop()
+    yield from stream.pop()
+
+
+def get_byte_range(header, size):
+    """
+    Get the first and last byte requested by a Range header, or None to send the
+    whole file. Only a single range is supported, any other header is ignored.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if not first:
+        if int(last) == 0:
+            raise RangeNotSatisfiable
+        return max(size - int(last), 0), size - 1
+
+    if last and int(last) < int(first):
+        return None
+    if int(first) >= size:
+        raise RangeNotSatisfiable
+    return int(first), min(int(last), size - 1) if last else size - 1
+
+
+def if_range_passes(request, etag, last_modified):
+    """
+    Check the If-Range header, a range is only sent if the file has not changed
+    since the part the client has was downloaded.
+    """
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/"')):
+        return if_range == etag
+    return last_modified is not None and parse_http_date_safe(if_range) == last_modified
+
+
+def conditional_response(request, etag=None, last_modified=None):
+    """
+    Get the 304, or 412, response if the client's copy is up to date, or None
+    if the response should be sent. ``last_modified`` is a timestamp.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def download_response(
+    request, storage, name, filename=None, etag=None, last_modified=None
+):
+    """
+    Get the response to download a stored file, as set by
+    DOCUMENT_DOWNLOAD_MODE. Only "proxy" sends the file through django, the
+    other modes leave it to the storage or nginx so no worker is kept busy.
+
+    The ``etag`` and ``last_modified`` timestamp of the file are used to answer
+    conditional requests before the storage is touched. Files sent from django
+    can be downloaded in part with a Range header.
+    """
+    response = conditional_response(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    filename = filename or posixpath.basename(name)
+    content_type, _ = mimetypes.guess_type(filename)
+    headers = {
+        "Content-Type": content_type or "application/octet-stream",
+        "Content-Disposition": content_disposition_header(True, filename),
+    }
+
+    if settings.DOCUMENT_DOWNLOAD_MODE == "presigned":
+        if hasattr(storage, "get_presigned_url"):
+            url = storage.get_presigned_url(
+                name, filename, settings.DOCUMENT_DOWNLOAD_URL_EXPIRY
+            )
+        else:
+            url = storage.url(name)
+        return HttpResponseRedirect(url)
+
+    if settings.DOCUMENT_DOWNLOAD_MODE == "accel":
+        path = urlparse(storage.url(name)).path.lstrip("/")
+        headers["X-Accel-Redirect"] = settings.DOCUMENT_DOWNLOAD_ACCEL_LOCATION + path
+        response = HttpResponse(headers=headers)
+        set_validators(response, etag, last_modified)
+        return response
+
+    size = storage.size(name)
+    try:
+        byte_range = None
+        if if_range_passes(request, etag, last_modified):
+            byte_range = get_byte_range(request.headers.get("Range"), size)
+    except RangeNotSatisfiable:
+        return HttpResponse(status=416, headers={"Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        response = StreamingHttpResponse(
+            iter_stored_chunks(storage, name),
+            headers={**headers, "Content-Length": size},
+        )
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_stored_chunks(storage, name, start=start, end=end),
+            status=206,
+            headers={
+                **headers,
+                "Content-Length": end - start + 1,
+                "Content-Range": f"bytes {start}-{end}/{size}",
+            },
+        )
+
+    response.headers["Accept-Ranges"] = "bytes"
+    set_validators(response, etag, last_modified)
+    return response
@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib.postgres.fields import ArrayField
-from django.forms import SelectMultiple
+from django.core.exceptions import ValidationError
+from django.forms import Select, SelectMultiple
+from django.urls import reverse
 
 
 class ArraySelectMultiple(SelectMultiple):
@@ -23,3 +25,34 @@ class ChoiceArrayField(ArrayField):
         }
         defaults.update(kwargs)
         return super(ArrayField, self).formfield(**defaults)
+
+
+class AutocompleteSelect(Select):
+    """
+    A select for a ``ModelChoiceField`` which only renders the selected option,
+    rather than every object, the other options are fetched from the autocomplete
+    endpoint ``url_name`` as the user types (see frontend/src/autocomplete).
+    """
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocomplete-url"] = reverse(self.url_name)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [v for v in value if v]
+        try:
+            objects = list(self.choices.queryset.filter(pk__in=selected))
+        except (ValueError, ValidationError):
+            objects = []
+
+        options = [self.create_option(name, "", "", not objects, 0)]
+        for index, obj in enumerate(objects, start=1):
+            options.append(
+                self.create_option(name, obj.pk, str(obj), True, index, attrs=attrs)
+            )
+        return [(None, [option], option["index"]) for option in options]
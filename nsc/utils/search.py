@@ -0,0 +1,65 @@
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, Q
+from django.db.models.functions import Upper
+
+
+def get_search_query(keywords):
+    """
+    Get the full text query for the keywords entered by a user. Whole words are
+    matched after english stemming, e.g. "screening" matches "screened", and
+    each word also matches the start of a word so partly typed words are found.
+    """
+    query = SearchQuery(keywords, search_type="websearch", config="english")
+
+    words = re.findall(r"\w+", keywords)
+    if words:
+        prefixes = " & ".join(f"{word}:*" for word in words)
+        query |= SearchQuery(prefixes, search_type="raw", config="simple")
+
+    return query
+
+
+def search(queryset, keywords, field="search_vector"):
+    """
+    Filter the queryset to the rows whose search vector matches the keywords,
+    ordered by relevance and then the model's default ordering.
+    """
+    query = get_search_query(keywords)
+    return (
+        queryset.filter(**{field: query})
+        .annotate(search_rank=SearchRank(F(field), query))
+        .order_by("-search_rank", *queryset.model._meta.ordering)
+    )
+
+
+def autocomplete(queryset, term, field="name", limit=None):
+    """
+    Get the rows where a word in ``field`` starts with, or is close to, the
+    term. Matches at the start of the field come first, then the closest
+    matches. Both filters use a trigram index on the upper case field, e.g.
+    ``GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), ...)``.
+    """
+    term = term.strip().upper()
+    return (
+        queryset.annotate(autocomplete_value=Upper(field))
+        .filter(
+            Q(autocomplete_value__startswith=term)
+            | Q(autocomplete_value__trigram_word_similar=term)
+        )
+        .annotate(
+            autocomplete_prefix=Q(autocomplete_value__startswith=term),
+            autocomplete_rank=TrigramWordSimilarity(term, "autocomplete_value"),
+        )
+        .order_by(
+            "-autocomplete_prefix",
+            "-autocomplete_rank",
+            *queryset.model._meta.ordering,
+        )[: limit or settings.AUTOCOMPLETE_LIMIT]
+    )
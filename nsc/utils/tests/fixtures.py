@@ -1,9 +1,10 @@
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
-from django.core.cache import cache
+from django.core.cache import caches
 from django.test import override_settings
 
 import freezegun
@@ -109,4 +110,18 @@ def email_settings():
 
 @pytest.fixture(autouse=True)
 def clear_cache():
-    cache.clear()
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+@pytest.fixture()
+def invalidated_cache_tags():
+    """
+    Collect the cache tags invalidated when changes are committed, use with the
+    django_capture_on_commit_callbacks fixture to commit the changes.
+    """
+    tags = set()
+    with patch(
+        "nsc.signals.invalidate_cache_tags", side_effect=lambda *t: tags.update(t)
+    ):
+        yield tags
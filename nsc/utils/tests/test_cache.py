@@ -0,0 +1,233 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from django.utils.cache import get_cache_key
+
+import pytest
+
+from nsc.condition.models import ConditionListing
+from nsc.policy.models import Policy
+
+from ..cache import (
+    get_cache_tag,
+    get_lock_key,
+    get_uncacheable_key,
+    invalidate_cache_tags,
+)
+
+
+# All tests require the database
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def page_cache():
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    ):
+        yield
+
+
+def get_page_key(url):
+    return get_cache_key(RequestFactory().get(url))
+
+
+def lock(url):
+    # hold the lock as if another request was rendering the page
+    cache.add(get_lock_key(get_page_key(url)), 1)
+
+
+def expire(url):
+    # remove the page but keep the headers the cache key depends on
+    cache.delete(get_page_key(url))
+
+
+def rename(policy, name):
+    # update the database without sending any signals so the cache is kept
+    Policy.objects.filter(pk=policy.pk).update(name=name)
+    ConditionListing.objects.refresh([policy.pk])
+
+
+def test_page_is_cached(client, make_policy):
+    policy = make_policy(name="Old name")
+    client.get(policy.get_public_url())
+
+    rename(policy, "New name")
+
+    assert "Old name" in client.get(policy.get_public_url()).content.decode()
+
+
+def test_tag_for_page_is_invalidated___page_is_rendered_again(
+    client, make_policy, freeze_time
+):
+    policy = make_policy(name="Old name")
+    client.get(policy.get_public_url())
+
+    freeze_time.tick()
+    rename(policy, "New name")
+    invalidate_cache_tags(get_cache_tag(policy))
+
+    assert "New name" in client.get(policy.get_public_url()).content.decode()
+
+
+def test_tag_for_other_page_is_invalidated___page_is_not_rendered_again(
+    client, make_policy, freeze_time
+):
+    policy, other = make_policy(name="Old name"), make_policy()
+    client.get(policy.get_public_url())
+
+    freeze_time.tick()
+    rename(policy, "New name")
+    invalidate_cache_tags(get_cache_tag(other))
+
+    assert "Old name" in client.get(policy.get_public_url()).content.decode()
+
+
+def test_policy_tag_is_invalidated___list_is_rendered_again(
+    client, make_policy, freeze_time
+):
+    policy = make_policy(name="Old name")
+    client.get(reverse("condition:list"))
+
+    freeze_time.tick()
+    rename(policy, "New name")
+    invalidate_cache_tags(*policy.get_cache_tags())
+
+    assert "New name" in client.get(reverse("condition:list")).content.decode()
+
+
+def test_page_is_changed_while_it_is_rendered___page_is_rendered_again(
+    client, make_policy, freeze_time
+):
+    policy = make_policy(name="Old name")
+
+    # the change is committed after the request starts but before the page is
+    # stored, the page is stale so must not be used
+    invalidate_cache_tags(get_cache_tag(policy))
+    client.get(policy.get_public_url())
+    freeze_time.tick()
+    rename(policy, "New name")
+
+    assert "New name" in client.get(policy.get_public_url()).content.decode()
+
+
+def test_untagged_page_is_invalidated_by_any_change(client, make_policy, freeze_time):
+    client.get(reverse("cookies"))
+    assert not client.get(reverse("cookies")).templates
+
+    freeze_time.tick()
+    invalidate_cache_tags(get_cache_tag(make_policy()))
+
+    assert client.get(reverse("cookies")).templates
+
+
+def test_page_has_expired___page_is_rendered_again(client, make_policy, freeze_time):
+    policy = make_policy(name="Old name")
+    client.get(policy.get_public_url())
+
+    freeze_time.tick(601)
+    rename(policy, "New name")
+
+    assert "New name" in client.get(policy.get_public_url()).content.decode()
+
+
+def test_page_is_rendered___lock_is_released(client, make_policy):
+    policy = make_policy()
+
+    client.get(policy.get_public_url())
+    expire(policy.get_public_url())
+
+    lock_key = get_lock_key(get_page_key(policy.get_public_url()))
+
+    with patch.object(cache, "add", wraps=cache.add) as add_mock:
+        client.get(policy.get_public_url())
+
+    add_mock.assert_called_once_with(lock_key, 1, timeout=30)
+    assert cache.get(lock_key) is None
+
+
+def test_page_is_stale_and_being_rendered___stale_page_is_served(
+    client, make_policy, freeze_time
+):
+    policy = make_policy(name="Old name")
+    client.get(policy.get_public_url())
+
+    freeze_time.tick()
+    rename(policy, "New name")
+    invalidate_cache_tags(get_cache_tag(policy))
+    lock(policy.get_public_url())
+
+    assert "Old name" in client.get(policy.get_public_url()).content.decode()
+
+
+@override_settings(PAGE_CACHE_LOCK_WAIT_SECONDS=5)
+def test_page_is_not_cached_and_being_rendered___waits_then_renders_page(
+    client, make_policy, freeze_time
+):
+    policy = make_policy()
+    client.get(policy.get_public_url())
+    expire(policy.get_public_url())
+    lock(policy.get_public_url())
+
+    with patch("nsc.utils.cache.time.sleep", side_effect=freeze_time.tick) as sleep:
+        response = client.get(policy.get_public_url())
+
+    assert response.status_code == 200
+    assert sleep.call_count == 50
+
+
+def test_page_has_never_been_cached___renders_without_waiting(
+    client, make_policy, freeze_time
+):
+    """
+    Test there is no lock for a page whose cache key isn't known, e.g. pages
+    which are never cached such as forms and downloads.
+    """
+    policy = make_policy()
+
+    with patch("nsc.utils.cache.time.sleep") as sleep:
+        response = client.get(policy.get_public_url())
+
+    assert response.status_code == 200
+    sleep.assert_not_called()
+
+
+def test_page_was_not_cacheable___renders_without_waiting(client, make_policy):
+    """
+    Test requests stop waiting for the lock once the request holding it has
+    found the page can't be cached.
+    """
+    policy = make_policy()
+    client.get(policy.get_public_url())
+    expire(policy.get_public_url())
+    lock(policy.get_public_url())
+
+    def release(seconds):
+        cache.set(get_uncacheable_key(get_page_key(policy.get_public_url())), 1)
+
+    with patch("nsc.utils.cache.time.sleep", side_effect=release) as sleep:
+        response = client.get(policy.get_public_url())
+
+    assert response.status_code == 200
+    assert sleep.call_count == 1
+
+
+def test_rendered_page_is_not_cacheable___waiting_requests_are_told(
+    client, make_policy
+):
+    """
+    Test the request holding the lock marks the page as not cacheable when the
+    response won't be stored.
+    """
+    policy = make_policy()
+    client.get(policy.get_public_url())
+    expire(policy.get_public_url())
+
+    private = HttpResponse(headers={"Cache-Control": "private"})
+    with patch("nsc.condition.views.ConditionDetail.get", return_value=private):
+        client.get(policy.get_public_url())
+
+    assert cache.get(get_uncacheable_key(get_page_key(policy.get_public_url())))
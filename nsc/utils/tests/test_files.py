@@ -0,0 +1,60 @@
+from io import BytesIO
+from zipfile import ZipFile
+
+import pytest
+
+from nsc.utils.files import RangeNotSatisfiable, get_byte_range, stream_zip
+
+
+def test_stream_zip():
+    """
+    Test the zip contains each file.
+    """
+    files = [("first.pdf", [b"one", b"two"]), ("second.pdf", [b"three"])]
+
+    with ZipFile(BytesIO(b"".join(stream_zip(files)))) as archive:
+        assert archive.namelist() == ["first.pdf", "second.pdf"]
+        assert archive.read("first.pdf") == b"onetwo"
+        assert archive.read("second.pdf") == b"three"
+
+
+def test_stream_zip__is_sent_as_files_are_read():
+    """
+    Test the zip is generated as the files are read rather than after all of
+    them have been read.
+    """
+    read = []
+
+    def chunks(name):
+        read.append(name)
+        yield name.encode()
+
+    files = ((name, chunks(name)) for name in ["first.pdf", "second.pdf"])
+    stream = stream_zip(files)
+
+    assert next(stream)
+    assert read == ["first.pdf"]
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=10-", (10, 999)),
+        ("bytes=900-2000", (900, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-2000", (0, 999)),
+        ("bytes=-", None),
+        ("bytes=20-10", None),
+        ("bytes=0-1,5-6", None),
+    ],
+)
+def test_get_byte_range(header, expected):
+    assert get_byte_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+def test_get_byte_range__not_satisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        get_byte_range(header, 1000)
@@ -1,8 +1,9 @@
 import io
+from unittest.mock import patch
 
 import pytest
 
-from nsc.utils.virus_scanner import is_file_clean
+from nsc.utils.virus_scanner import VirusScanError, scan_file
 
 
 @pytest.fixture
@@ -11,18 +12,37 @@ def clean_file():
 
 
 @pytest.fixture
-def malware_file():
-    # EICAR test virus string (not real malware, safe to use for testing)
-    eicar = b"X5O!P%@AP[4\\PZX54(P^)7CC)7}$" b"EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
-    return io.BytesIO(eicar)
+def clamd_mock():
+    with patch("nsc.utils.virus_scanner.clamd.ClamdNetworkSocket") as socket_mock:
+        yield socket_mock.return_value
 
 
-def test_clean_file(clean_file):
-    result = is_file_clean(clean_file)
-    assert result is True, "Expected clean file to be marked as clean"
+def test_clean_file(clean_file, clamd_mock):
+    clamd_mock.instream.return_value = {"stream": ("OK", None)}
 
+    assert scan_file(clean_file) is True
 
-@pytest.mark.skip(reason="Skipping malware test temporarily")
-def test_malware_file(malware_file):
-    result = is_file_clean(malware_file)
-    assert result is False, "Expected malware file to be detected"
+
+def test_malware_file(clean_file, clamd_mock):
+    clamd_mock.instream.return_value = {"stream": ("FOUND", "Eicar-Signature")}
+
+    assert scan_file(clean_file) is False
+
+
+def test_clamd_error___scan_fails(clean_file, clamd_mock):
+    """
+    Test an error reply, e.g. the file is over the size limit, isn't taken to
+    mean the file is infected.
+    """
+    clamd_mock.instream.return_value = {"stream": ("ERROR", "INSTREAM size limit")}
+
+    with pytest.raises(VirusScanError):
+        scan_file(clean_file)
+
+
+def test_clamd_unavailable___scan_fails(clean_file, clamd_mock):
+    clamd_mock.instream.side_effect = ConnectionRefusedError
+
+    with pytest.raises(VirusScanError):
+        scan_file(clean_file)
+    assert clean_file.tell() == 0
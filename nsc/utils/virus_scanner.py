@@ -10,13 +10,18 @@ logger = logging.getLogger("nsc.utils.virus_scanner")
 logger.debug("Virus scanner module imported")
 
 
-def is_file_clean(file: BinaryIO) -> bool:
+class VirusScanError(Exception):
     """
-    Scan *file* with ClamAV. Return True iff the status is “OK”.
-    On any connection/streaming error we **fail‑open** and return True.
+    The file could not be scanned, clamd couldn't be reached or replied with an
+    error, e.g. the file is over its size limit.
     """
-    logger.debug("Entered is_file_clean")
 
+
+def scan_file(file: BinaryIO) -> bool:
+    """
+    Scan *file* with ClamAV. Return True if the status is “OK” and False if
+    malware was “FOUND”, any other outcome raises ``VirusScanError``.
+    """
     file.seek(0)  # rewind before streaming
 
     try:
@@ -25,17 +30,15 @@ def is_file_clean(file: BinaryIO) -> bool:
             port=settings.CLAMAV_PORT,
             timeout=settings.CLAMAV_TIMEOUT,
         )
-    except Exception as exc:
-        logger.warning("Could not connect to clamd: %s – allowing upload", exc)
-        return True  # fail‑open on connection error
-
-    try:
         result = cd.instream(file)
     except Exception as exc:
-        logger.warning("Error while streaming file to clamd: %s – allowing upload", exc)
-        return True  # fail‑open on streaming error
+        raise VirusScanError(f"Error while streaming file to clamd: {exc}") from exc
     finally:
         file.seek(0)  # let callers read again
 
-    status, _sig = result.get("stream", ("ERROR", None))
-    return status == "OK"
+    status, signature = result.get("stream", ("ERROR", None))
+    if status == "OK":
+        return True
+    if status == "FOUND":
+        return False
+    raise VirusScanError(f"clamd replied {status}: {signature}")